@@ -0,0 +1,83 @@
+"""
+Benchmarks for solve_linear_equations, solve_many and solve_batch
+
+Run from the repository root with:
+    python -m benchmarks.bench_linear_systems
+"""
+
+import random
+from time import perf_counter
+
+from mttools.linear_algebra_tools import (
+    solve_batch,
+    solve_linear_equations,
+    solve_many,
+)
+
+BATCH_SIZES = (1, 10, 100, 1000, 10 ** 4, 10 ** 5)
+
+# Largest batch timed for the one system at a time methods
+SLOW_LIMIT = 10 ** 4
+
+
+def _random_system(n, rng):
+    # Diagonally dominant, so never singular
+    a = [[rng.uniform(-1, 1) for _ in range(n)] for _ in range(n)]
+    for i in range(n):
+        a[i][i] += n
+    return a, [rng.uniform(-1, 1) for _ in range(n)]
+
+
+def _seconds(func, *args):
+    start = perf_counter()
+    func(*args)
+    return perf_counter() - start
+
+
+def bench_solve_many():
+    rng = random.Random(0)
+    n, count = 100, 1000
+    a, _ = _random_system(n, rng)
+    loads = [[rng.uniform(-1, 1) for _ in range(count)] for _ in range(n)]
+
+    print(f"{count} right hand sides against one {n}x{n} matrix")
+    repeats = 10
+    seconds = _seconds(
+        lambda: [
+            solve_linear_equations(*[row + [load[j]] for row, load in zip(a, loads)])
+            for j in range(repeats)
+        ]
+    )
+    print(f"  solve_linear_equations each: {seconds / repeats * 1000:.2f}ms per load")
+    seconds = _seconds(solve_many, a, loads)
+    print(f"  solve_many: {seconds / count * 1000:.3f}ms per load")
+
+
+def bench_solve_batch():
+    rng = random.Random(0)
+    systems = [_random_system(3, rng) for _ in range(max(BATCH_SIZES))]
+
+    print("Per system latency of batches of 3x3 float systems")
+    for size in BATCH_SIZES:
+        batch = systems[:size]
+        timings = {}
+        if size <= SLOW_LIMIT:
+            timings["solve_linear_equations"] = _seconds(
+                lambda: [
+                    solve_linear_equations(*[row + [v] for row, v in zip(a, b)])
+                    for a, b in batch
+                ]
+            )
+            timings["process"] = _seconds(solve_batch, batch, "process")
+        timings["python"] = _seconds(solve_batch, batch, "python")
+        timings["numpy"] = _seconds(solve_batch, batch, "numpy")
+        results = ", ".join(
+            f"{name} {seconds / size * 10 ** 6:.1f}us"
+            for name, seconds in timings.items()
+        )
+        print(f"  {size}: {results}")
+
+
+if __name__ == "__main__":
+    bench_solve_many()
+    bench_solve_batch()
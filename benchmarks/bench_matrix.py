@@ -0,0 +1,250 @@
+"""
+Benchmarks for mttools.linear_algebra_tools.matrix
+
+Run from the repository root with:
+    python -m benchmarks.bench_matrix
+"""
+
+import random
+import tracemalloc
+from fractions import Fraction
+from time import perf_counter
+
+from mttools.linear_algebra_tools import LUDecomposition
+from mttools.linear_algebra_tools.elimination import exact_rref
+from mttools.linear_algebra_tools.matrix import Matrix, SquareMatrix
+from mttools.utils.profilers import Timer
+
+MULTIPLY_SIZES = (16, 32, 64, 128, 256, 512)
+
+STORAGE_SIZES = (100, 500, 1000)
+
+STRASSEN_SIZES = (64, 128, 256, 512)
+
+STRASSEN_CROSSOVERS = (16, 32, 64, 128, 256)
+
+
+def _random_array(num_rows, num_columns, rng):
+    return [[rng.random() for _ in range(num_columns)] for _ in range(num_rows)]
+
+
+def reference_multiply(a, b):
+    """
+    The original column-indexing multiply, kept for comparison
+    """
+    new_array = [[0 for _ in range(len(b[0]))] for _ in range(len(a))]
+    for r, row in enumerate(new_array):
+        for c, _ in enumerate(row):
+            new_array[r][c] = sum([a[r][k] * b[k][c] for k in range(len(b))])
+    return new_array
+
+
+def _seconds(func, *args):
+    start = perf_counter()
+    func(*args)
+    return perf_counter() - start
+
+
+def bench_python_multiply():
+    rng = random.Random(0)
+    print(f"{'n':>5} {'reference':>12} {'Matrix.__mul__':>15} {'speedup':>8}")
+    for n in MULTIPLY_SIZES:
+        a, b = _random_array(n, n, rng), _random_array(n, n, rng)
+        m, other = Matrix(a, "python"), Matrix(b, "python")
+        reference = _seconds(reference_multiply, a, b)
+        blocked = _seconds(m.__mul__, other)
+        print(
+            f"{n:>5} {reference:>11.4f}s {blocked:>14.4f}s {reference / blocked:>7.2f}x"
+        )
+
+
+def reference_determinate(array):
+    """
+    The original cofactor expansion, O(n!), kept for comparison
+    """
+    if len(array) == 1:
+        return array[0][0]
+    total = 0
+    for c, value in enumerate(array[0]):
+        minor = [row[:c] + row[c + 1 :] for row in array[1:]]
+        total += (-1) ** c * value * reference_determinate(minor)
+    return total
+
+
+def bench_lu():
+    rng = random.Random(0)
+    array = _random_array(8, 8, rng)
+    Timer(unit="ms", message="cofactor determinate, 8x8")(reference_determinate)(array)
+
+    n = 200
+    array, b = _random_array(n, n, rng), [rng.random() for _ in range(n)]
+    for backend in ("python", "numpy"):
+        m = SquareMatrix(array, backend)
+        message = f"{backend} LUDecomposition, {n}x{n}"
+        Timer(unit="ms", message=message)(LUDecomposition)(m)
+        Timer(unit="ms", message=f"{backend} determinate, {n}x{n}")(m.determinate)()
+        Timer(unit="ms", message=f"{backend} solve, reusing LU")(m.solve)(b)
+        Timer(unit="ms", message=f"{backend} inverse, reusing LU")(m.inverse)()
+
+
+def reference_fraction_rref(array):
+    """
+    Naive Gauss-Jordan elimination in Fractions, kept for comparison
+    """
+    a = [[Fraction(value) for value in row] for row in array]
+    r = 0
+    for c in range(len(a[0])):
+        p = next((i for i in range(r, len(a)) if a[i][c]), None)
+        if p is None:
+            continue
+        a[p], a[r] = a[r], a[p]
+        pivot = a[r][c]
+        a[r] = [value / pivot for value in a[r]]
+        for i, row in enumerate(a):
+            if i != r and row[c]:
+                factor = row[c]
+                a[i] = [x - factor * y for x, y in zip(row, a[r])]
+        r += 1
+        if r == len(a):
+            break
+    return a
+
+
+def reference_rref(array):
+    """
+    The original rref, first nonzero pivot and a new list per row update,
+    kept for comparison
+    """
+    a = [list(row) for row in array]
+    num_rows, num_columns = len(a), len(a[0])
+    lead = 0
+    for r in range(num_rows):
+        if lead >= num_columns:
+            return a
+        i = r
+        while a[i][lead] == 0:
+            i += 1
+            if i == num_rows:
+                i = r
+                lead += 1
+                if num_columns == lead:
+                    return a
+        a[i], a[r] = a[r], a[i]
+        scalar = 1 / a[r][lead]
+        a[r] = [scalar * x for x in a[r]]
+        for i in range(num_rows):
+            if i != r:
+                scalar = -a[i][lead]
+                a[i] = [scalar * y + x for x, y in zip(a[i], a[r])]
+        lead += 1
+    return a
+
+
+def bench_rref():
+    rng = random.Random(0)
+    n = 200
+    array = _random_array(n, n, rng)
+    Timer(unit="ms", message=f"reference rref, {n}x{n}")(reference_rref)(array)
+    for backend in ("python", "numpy"):
+        for pivoting in ("partial", "complete"):
+            m = Matrix(array, backend)
+            message = f"{backend} rref, {pivoting} pivoting, {n}x{n}"
+            Timer(unit="ms", message=message)(m.rref)(pivoting=pivoting)
+
+
+def bench_exact():
+    rng = random.Random(0)
+    print("Exact elimination of random integer matrices, entries in [-9, 9]")
+    for n in (10, 20, 40, 80):
+        array = [[rng.randint(-9, 9) for _ in range(n)] for _ in range(n)]
+        augmented = [
+            row + [int(i == j) for j in range(n)] for i, row in enumerate(array)
+        ]
+        naive = _seconds(reference_fraction_rref, augmented)
+        bareiss = _seconds(exact_rref, augmented)
+        print(
+            f"  {n}x{n} inverse: Fraction rref {naive * 1000:.1f}ms, "
+            f"fraction-free {bareiss * 1000:.1f}ms"
+        )
+        determinate = _seconds(SquareMatrix(array).determinate)
+        print(f"  {n}x{n} determinate: {determinate * 1000:.1f}ms")
+
+
+def bench_backends():
+    rng = random.Random(0)
+    for n, backends in ((100, ("python", "numpy")), (500, ("numpy",))):
+        a, b = _random_array(n, n, rng), _random_array(n, n, rng)
+        for backend in backends:
+            m, other = Matrix(a, backend), Matrix(b, backend)
+            Timer(unit="ms", message=f"{backend} {n}x{n} multiply")(m.__mul__)(other)
+            Timer(unit="ms", message=f"{backend} {n}x{n} add")(m.__add__)(other)
+            Timer(unit="ms", message=f"{backend} {n}x{n} rref")(m.rref)()
+            square = SquareMatrix(b, backend)
+            message = f"{backend} {n}x{n} inverse"
+            Timer(unit="ms", message=message)(square.inverse)()
+
+
+def _retained_memory(build):
+    """
+    Bytes still allocated once build() returns, and its result
+    """
+    tracemalloc.start()
+    result = build()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return current, result
+
+
+def bench_storage():
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    rng = random.Random(0)
+    print("Storage of an n x n float matrix, list of lists against flat array('d')")
+    for n in STORAGE_SIZES:
+        for backend in ("python", "array"):
+            size, m = _retained_memory(
+                lambda: Matrix(_random_array(n, n, rng), backend)
+            )
+            add_rows = _seconds(lambda: [m.add_rows(0, r, 0.5) for r in range(1, n)])
+            transposed = _seconds(m.transposed)
+            result = (
+                f"  {n}x{n} {backend}: {size / 2 ** 20:.1f}MiB, "
+                f"add_rows pass {add_rows * 1000:.1f}ms, "
+                f"transposed {transposed * 1000:.1f}ms"
+            )
+            if np is not None:
+                result += f", to NumPy {_seconds(np.asarray, m) * 1000:.2f}ms"
+            print(result)
+
+
+def bench_strassen():
+    rng = random.Random(0)
+    print("Exact integer n x n products, classical against Strassen-Winograd")
+    for digits in (2, 30):
+        bound = 10 ** digits
+        for n in STRASSEN_SIZES:
+            a = [[rng.randint(-bound, bound) for _ in range(n)] for _ in range(n)]
+            b = [[rng.randint(-bound, bound) for _ in range(n)] for _ in range(n)]
+            m, other = SquareMatrix(a), SquareMatrix(b)
+            classical = _seconds(Matrix.__mul__, m, other)
+            results = ", ".join(
+                f"{crossover} {_seconds(m.strassen_multiply, other, crossover):.2f}s"
+                for crossover in STRASSEN_CROSSOVERS
+                if crossover < n
+            )
+            print(
+                f"  {n}x{n}, {digits} digit entries: classical {classical:.2f}s, "
+                f"Strassen by crossover {results}"
+            )
+
+
+if __name__ == "__main__":
+    bench_python_multiply()
+    bench_lu()
+    bench_rref()
+    bench_exact()
+    bench_backends()
+    bench_storage()
+    bench_strassen()
@@ -0,0 +1,45 @@
+"""
+Benchmarks for mttools.number_theory_tools.Modular against builtin pow
+
+Run from the repository root with:
+    python -m benchmarks.bench_modular
+"""
+import random
+
+from mttools.number_theory_tools.Modular import ModContext
+from mttools.utils.profilers import Timer
+
+
+def bench_pow():
+    rng = random.Random(0)
+    for bits in (1024, 4096, 8192, 12288):
+        m = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+        bases = [rng.randrange(m) for _ in range(2)]
+        exp = rng.getrandbits(bits)
+        Timer(unit="ms", message=f"builtin pow, {bits}-bit")(
+            lambda: [pow(b, exp, m) for b in bases]
+        )()
+        for reduction in ("barrett", "montgomery"):
+            context = ModContext(m, reduction)
+            Timer(unit="ms", message=f"ModContext.pow_many {reduction}, {bits}-bit")(
+                context.pow_many
+            )(bases, exp)
+
+
+def bench_fixed_base():
+    rng = random.Random(0)
+    for bits in (256, 1024, 2048):
+        m = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+        exps = [rng.getrandbits(bits) for _ in range(200)]
+        Timer(unit="ms", message=f"builtin pow, fixed base, {bits}-bit")(
+            lambda: [pow(5, e, m) for e in exps]
+        )()
+        table = ModContext(m).fixed_base(5, bits, window=6)
+        Timer(unit="ms", message=f"FixedBaseTable.pow_many, {bits}-bit")(
+            table.pow_many
+        )(exps)
+
+
+if __name__ == "__main__":
+    bench_pow()
+    bench_fixed_base()
@@ -0,0 +1,223 @@
+"""
+Benchmarks for mttools.number_theory_tools.Primes
+
+Run from the repository root with:
+    python -m benchmarks.bench_primes
+"""
+import random
+import tempfile
+from time import perf_counter
+
+from mttools.number_theory_tools.ArithmeticFunctions import (
+    mobius_range,
+    sigma_range,
+    totient_range,
+)
+from mttools.number_theory_tools import PrimeCache
+from mttools.number_theory_tools.Primes import (
+    are_prime,
+    division_primality_test,
+    filter_primes,
+    is_prime,
+    largest_prime_less_than,
+    lucas_lehmer_primality_test,
+    next_prime,
+    nth_prime,
+    prev_prime,
+    prime_pi,
+    prime_factors,
+    prime_factors_many,
+    segmented_sieve,
+    sieve_of_eratosthenes,
+    sweep_mersenne,
+)
+from mttools.utils.profilers import Timer
+
+
+def reference_sieve_of_eratosthenes(upper_bound):
+    """
+    The original list-backed sieve, kept for comparison
+    """
+    sieve = [True for _ in range(upper_bound)]
+    sieve[0] = False
+    sieve[1] = False
+    for i, is_prime in enumerate(sieve):
+        try:
+            if is_prime:
+                j = i * i
+            while j < upper_bound:
+                sieve[j] = False
+                j += i
+        except UnboundLocalError:
+            pass
+    return sorted([i for i, is_prime in enumerate(sieve) if is_prime])
+
+
+def bench_sieve():
+    for upper_bound in (10 ** 5, 10 ** 6, 10 ** 7):
+        Timer(unit="ms", message=f"reference sieve, upper_bound={upper_bound:.0e}")(
+            reference_sieve_of_eratosthenes
+        )(upper_bound)
+        Timer(unit="ms", message=f"segmented sieve, upper_bound={upper_bound:.0e}")(
+            sieve_of_eratosthenes
+        )(upper_bound)
+
+    # Streams without materializing the primes, memory stays bounded
+    Timer(unit="s", message="count primes below 1e8 with segmented_sieve")(
+        lambda: sum(1 for _ in segmented_sieve(10 ** 8))
+    )()
+
+
+def _random_prime(bits, rng):
+    while True:
+        n = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+        if is_prime(n):
+            return n
+
+
+def _tests_per_second(numbers):
+    before = perf_counter()
+    for n in numbers:
+        is_prime(n)
+    return len(numbers) / (perf_counter() - before)
+
+
+def bench_is_prime():
+    rng = random.Random(0)
+    for bits, count in ((64, 20000), (1024, 200)):
+        top = 1 << (bits - 1)
+        candidates = [rng.getrandbits(bits) | top | 1 for _ in range(count)]
+        primes = [_random_prime(bits, rng) for _ in range(count // 10)]
+        rate = _tests_per_second(candidates)
+        print(f"\nis_prime, {bits}-bit random odd: {rate:,.0f} tests/s")
+        rate = _tests_per_second(primes)
+        print(f"is_prime, {bits}-bit primes: {rate:,.0f} tests/s")
+
+
+def bench_prime_factors_many():
+    rng = random.Random(0)
+    nums = [rng.randrange(2, 10 ** 7) for _ in range(100000)]
+    Timer(unit="ms", message="prime_factors, 1e5 numbers below 1e7")(
+        lambda: [prime_factors(n) for n in nums]
+    )()
+    Timer(unit="ms", message="prime_factors_many, 1e5 numbers below 1e7")(
+        prime_factors_many
+    )(nums)
+    message = "prime_factors_many, reused table"
+    Timer(unit="ms", message=message)(prime_factors_many)(nums)
+
+
+def bench_arithmetic_functions():
+    def totients(n):
+        result = [0]
+        for i in range(1, n):
+            for p in prime_factors(i):
+                i = i // p * (p - 1)
+            result.append(i)
+        return result
+
+    Timer(unit="ms", message="totient via prime_factors, n < 1e5")(totients)(10 ** 5)
+    for use_numpy in (False, True):
+        backend = "numpy" if use_numpy else "array"
+        n = 10 ** 7 if use_numpy else 10 ** 6
+        for func in (totient_range, mobius_range, sigma_range):
+            message = f"{func.__name__}, {backend}, n < {n:.0e}"
+            Timer(unit="ms", message=message)(func)(n, use_numpy=use_numpy)
+
+
+def bench_prime_pi():
+    Timer(unit="ms", message="len(sieve_of_eratosthenes(1e8))")(
+        lambda: len(sieve_of_eratosthenes(10 ** 8))
+    )()
+    for exponent in (8, 10, 12):
+        message = f"prime_pi(1e{exponent})"
+        Timer(unit="ms", message=message)(prime_pi)(10 ** exponent)
+    Timer(unit="ms", message="nth_prime(1e9)")(nth_prime)(10 ** 9)
+
+
+def bench_prime_cache():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        PrimeCache.set_cache_dir(cache_dir)
+        Timer(unit="ms", message="prime_table(1e8), sieve and save")(
+            PrimeCache.prime_table
+        )(10 ** 8)
+        PrimeCache._TABLE_CACHE.clear()
+        Timer(unit="ms", message="prime_table(1e8), memory map")(
+            PrimeCache.prime_table
+        )(10 ** 8)
+        Timer(unit="ms", message="primes_upto(1e8), cached")(PrimeCache.primes_upto)(
+            10 ** 8
+        )
+        rng = random.Random(0)
+        nums = [rng.randrange(10 ** 8) for _ in range(10 ** 5)]
+        Timer(unit="ms", message="is_prime_cached, 1e5 numbers below 1e8")(
+            lambda: [PrimeCache.is_prime_cached(n) for n in nums]
+        )()
+        PrimeCache.set_cache_dir(None)
+
+
+def bench_next_prime():
+    rng = random.Random(0)
+    for bits in (64, 256, 512):
+        nums = [rng.getrandbits(bits) for _ in range(20)]
+        message = f"next_prime + prev_prime, 20 random {bits}-bit numbers"
+        Timer(unit="ms", message=message)(
+            lambda: [(next_prime(n), prev_prime(n)) for n in nums]
+        )()
+    Timer(unit="ms", message="largest_prime_less_than(10 ** 12)")(
+        largest_prime_less_than
+    )(10 ** 12)
+
+
+def bench_division_primality_test():
+    Timer(unit="ms", message="division_primality_test(999999999989)")(
+        division_primality_test
+    )(999999999989)
+    rng = random.Random(0)
+    nums = [rng.randrange(10 ** 11, 10 ** 12) for _ in range(1000)]
+    Timer(unit="ms", message="are_prime, 1000 numbers below 1e12")(are_prime)(nums)
+
+
+def reference_lucas_lehmer(num):
+    """
+    The original Lucas-Lehmer loop, reducing with a generic modulo
+    """
+    s = 4
+    for _ in range(num.bit_length() - 2):
+        s = ((s * s) - 2) % num
+    return s == 0
+
+
+def bench_lucas_lehmer():
+    for p in (4423, 9689, 21701):
+        Timer(unit="ms", message=f"reference Lucas-Lehmer, p={p}")(
+            reference_lucas_lehmer
+        )(2 ** p - 1)
+        Timer(unit="ms", message=f"lucas_lehmer_primality_test, p={p}")(
+            lucas_lehmer_primality_test
+        )(2 ** p - 1)
+
+
+def bench_parallel_sweeps():
+    rng = random.Random(0)
+    candidates = [rng.getrandbits(256) | 1 for _ in range(20000)]
+    for workers in (1, 2, 4, 8):
+        Timer(unit="s", message=f"sweep_mersenne(2, 3000), {workers} workers")(
+            lambda: list(sweep_mersenne(2, 3000, workers=workers))
+        )()
+        Timer(unit="s", message=f"filter_primes, 2e4 256-bit, {workers} workers")(
+            lambda: list(filter_primes(candidates, workers=workers))
+        )()
+
+
+if __name__ == "__main__":
+    bench_sieve()
+    bench_is_prime()
+    bench_prime_factors_many()
+    bench_arithmetic_functions()
+    bench_prime_pi()
+    bench_prime_cache()
+    bench_next_prime()
+    bench_division_primality_test()
+    bench_lucas_lehmer()
+    bench_parallel_sweeps()
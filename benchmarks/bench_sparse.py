@@ -0,0 +1,104 @@
+"""
+Benchmarks for mttools.linear_algebra_tools.sparse
+
+Run from the repository root with:
+    python -m benchmarks.bench_sparse
+"""
+
+import tracemalloc
+from time import perf_counter
+
+from mttools.linear_algebra_tools.matrix import Matrix
+from mttools.linear_algebra_tools.sparse import SparseMatrix
+
+# Side lengths of the square grids, the systems have k * k unknowns
+GRID_SIZES = (20, 50, 100, 200)
+
+# Largest grid also stored densely, k ** 4 entries
+DENSE_LIMIT = 50
+
+# Largest grid solved on the pure Python backend
+PYTHON_SOLVE_LIMIT = 50
+
+
+def laplacian(k):
+    """
+    COO triplets of the 5 point Laplacian of a k by k grid, the stiffness
+    matrix of the simplest mesh, with at most 5 entries per row
+    """
+    rows, columns, values = [], [], []
+    for i in range(k):
+        for j in range(k):
+            p = i * k + j
+            rows.append(p)
+            columns.append(p)
+            values.append(4.0)
+            for q, inside in ((p - k, i > 0), (p + k, i < k - 1)):
+                if inside:
+                    rows.append(p)
+                    columns.append(q)
+                    values.append(-1.0)
+            for q, inside in ((p - 1, j > 0), (p + 1, j < k - 1)):
+                if inside:
+                    rows.append(p)
+                    columns.append(q)
+                    values.append(-1.0)
+    return rows, columns, values, (k * k, k * k)
+
+
+def _peak_memory(func, *args):
+    """
+    Peak bytes allocated by func(*args), and its result
+    """
+    tracemalloc.start()
+    result = func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, result
+
+
+def _seconds(func, *args):
+    start = perf_counter()
+    func(*args)
+    return perf_counter() - start
+
+
+def bench_scaling():
+    print("5 point Laplacian on a k by k grid")
+    for k in GRID_SIZES:
+        rows, columns, values, shape = laplacian(k)
+        n = shape[0]
+        for backend in ("python", "numpy"):
+            build = _seconds(
+                SparseMatrix.from_coo, rows, columns, values, shape, backend
+            )
+            peak, m = _peak_memory(
+                SparseMatrix.from_coo, rows, columns, values, shape, backend
+            )
+            x = [1.0] * n
+            print(
+                f"  k={k}, n={n}, nnz={m.nnz}, {backend}: "
+                f"build {build * 1000:.1f}ms, {peak / 2 ** 20:.1f}MiB peak, "
+                f"matvec {_seconds(m.matvec, x) * 1000:.2f}ms"
+            )
+            if backend == "numpy" or k <= PYTHON_SOLVE_LIMIT:
+                cg = _seconds(m.solve, x, "cg")
+                bicgstab = _seconds(m.solve, x, "bicgstab")
+                print(
+                    f"    conjugate gradient {cg * 1000:.1f}ms, "
+                    f"BiCGSTAB {bicgstab * 1000:.1f}ms"
+                )
+
+        if k <= DENSE_LIMIT:
+            sparse = SparseMatrix.from_coo(rows, columns, values, shape, "python")
+            peak, dense_array = _peak_memory(sparse.to_dense)
+            dense = Matrix(dense_array, "python")
+            column = Matrix([[1.0] for _ in range(n)], "python")
+            print(
+                f"  k={k}, dense python: {peak / 2 ** 20:.1f}MiB, "
+                f"matvec {_seconds(dense.__mul__, column) * 1000:.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    bench_scaling()
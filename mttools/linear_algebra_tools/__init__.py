@@ -1,23 +1,45 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 from mttools.utils.exceptions import (
+    DimensionError,
     InconsistentWarning,
     InfiniteSolutionsWaring,
+    NoInverseWarning,
     UnderDeterminedError,
 )
 
-from .matrix import Matrix
+from .elimination import LUDecomposition, _is_exact
+from .matrix import Matrix, MatrixView, _default_backend
+from .sparse import SparseMatrix, bicgstab, conjugate_gradient
 
-from typing import List
+from typing import List, Optional, Sequence, Tuple
 from mttools.utils.types import RealNumber
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BATCH_METHODS = ("python", "numpy", "process")
+
 
-def solve_linear_equations(*args: List[RealNumber]) -> List[RealNumber]:
+def solve_linear_equations(
+    *args: List[RealNumber], tolerance: Optional[float] = None
+) -> List[RealNumber]:
     """
     Solves a system of linear equations
 
+    The system is classified from the pivots of the augmented matrix,
+    and floating point pivots at most tolerance count as zero.
+
     params:
         args:
             An ordered list of the coefficients for an equation,
             where the last number is the RH side
+        tolerance:
+            Defaults to EPSILON scaled by the size and norm of the system,
+            ints and Fractions are always solved exactly
 
     return:
         The Solutions to the system of linear equations
@@ -33,24 +55,152 @@ def solve_linear_equations(*args: List[RealNumber]) -> List[RealNumber]:
     if len(args) < len(args[0]) - 1:  # -1 because the RH side is not a variable
         raise UnderDeterminedError
 
-    m = Matrix(list(args))
+    m = Matrix(list(args), backend=_default_backend(args))
+    num_variables = m.num_columns - 1
 
-    # Put Matrix in Reduced-Row Echelon Form
-    m.rref()
+    # Factor the augmented matrix, U = L^-1 P [A | b] is in row echelon form
+    lu = LUDecomposition(m, tolerance)
 
-    # Check matrix for num_solutions
-    inf_sol = [0 for _ in range(m.num_columns)]
-    no_sol = inf_sol[:-1] + [1]
-    for row in m.array:
-        if row == inf_sol:
-            raise InfiniteSolutionsWaring
-        elif row == no_sol:
-            raise InconsistentWarning
+    # Check the pivots for num_solutions
+    if num_variables in lu.pivot_columns:
+        # A pivot in the RH side is a row [0, ..., 0, c] with c != 0
+        raise InconsistentWarning
+    if lu.rank < num_variables:
+        raise InfiniteSolutionsWaring
 
-    # Convert matrix to solution dict
-    solution = []
-    for row in m.array:
-        solution.append(row[-1])
+    # Back substitution through the first num_variables rows of U
+    u = lu.upper()
+    solution = [0] * num_variables
+    for i in reversed(range(num_variables)):
+        total = u[i][-1]
+        for k in range(i + 1, num_variables):
+            total -= u[i][k] * solution[k]
+        solution[i] = total / u[i][i]
 
-    # Return solution
     return solution
+
+
+def solve_many(A, B):
+    """
+    Solves A x = b for many right hand sides b, factoring A only once
+
+    params:
+        A:
+            The square coefficient matrix, a list of rows, an ndarray, a
+            Matrix whose cached factorization is reused between calls, or
+            an LUDecomposition
+        B:
+            One right hand side, or a list of rows with one column per
+            right hand side
+
+    return:
+        The solutions, in the same shape as B
+
+    Example:
+
+        >>> solve_many([[2.0, 1.0], [1.0, 3.0]], [[3.0, 5.0], [4.0, 5.0]])
+        [[1.0, 2.0], [1.0, 1.0]]
+    """
+    if isinstance(A, LUDecomposition):
+        lu = A
+    else:
+        m = A if isinstance(A, Matrix) else Matrix(A, backend=_default_backend(A))
+        lu = m.lu_decomposition()
+    if lu.num_rows != lu.num_columns:
+        raise DimensionError(
+            f"Expected a square matrix, got {lu.num_rows}x{lu.num_columns}"
+        )
+    solution = lu.solve(B)
+    if np is not None and isinstance(solution, np.ndarray):
+        if not isinstance(B, np.ndarray):
+            return solution.tolist()
+    return solution
+
+
+def _solve_chunk(systems):
+    """
+    Worker for solve_batch, solves each system in turn
+    """
+    return [solve_many(A, b) for A, b in systems]
+
+
+def _solve_stacked(systems):
+    """
+    Solves the systems in float64 with one call to np.linalg.solve for each
+    size of system, so the loop over systems runs in LAPACK
+    """
+    by_size = {}
+    for k, (A, b) in enumerate(systems):
+        by_size.setdefault(len(b), []).append(k)
+
+    solutions = [None] * len(systems)
+    for n, group in by_size.items():
+        a = np.array([systems[k][0] for k in group], dtype=float)
+        b = np.array([systems[k][1] for k in group], dtype=float)
+        if a.shape[1:] != (n, n):
+            raise DimensionError(f"Expected {n}x{n} coefficient matrices")
+        try:
+            x = np.linalg.solve(a, b[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            singular = next(
+                (k for k in group if np.linalg.matrix_rank(systems[k][0]) < n),
+                None,
+            )
+            if singular is None:
+                # LAPACK hit an exact zero pivot that matrix_rank's SVD
+                # tolerance does not count as rank deficient
+                raise NoInverseWarning(f"A system of size {n} is singular")
+            raise NoInverseWarning(f"System {singular} is singular")
+        for k, row in zip(group, x.tolist()):
+            solutions[k] = row
+    return solutions
+
+
+def solve_batch(
+    systems: Sequence[Tuple[List[List[RealNumber]], List[RealNumber]]],
+    method: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunksize: int = 256,
+) -> List[List[RealNumber]]:
+    """
+    Solves many independent square systems A x = b
+
+    params:
+        systems: (A, b) pairs, of any mix of sizes
+        method (optional):
+            "numpy" stacks the systems of each size into one float64 array
+            and solves them with one np.linalg.solve call,
+            "process" spreads them over a process pool,
+            "python" solves them one after another.
+            By default "numpy" when NumPy is installed, unless every entry
+            is an int or a Fraction, which "python" solves exactly
+        workers (optional): Number of processes for "process",
+            default os.cpu_count()
+        chunksize (optional): Systems sent to a process at a time
+
+    return:
+        The solution of each system, in order
+
+    Example:
+
+        >>> solve_batch([([[2.0, 0.0], [0.0, 4.0]], [2.0, 2.0]), ([[1.0]], [3.0])])
+        [[1.0, 0.5], [3.0]]
+    """
+    systems = list(systems)
+    if method is None:
+        exact = all(_is_exact(A) and _is_exact([b]) for A, b in systems)
+        method = "numpy" if np is not None and not exact else "python"
+    if method not in BATCH_METHODS:
+        raise ValueError(f"method must be one of {BATCH_METHODS}, got {method!r}")
+
+    if method == "numpy":
+        if np is None:
+            raise ImportError("The numpy method requires numpy")
+        return _solve_stacked(systems)
+    if method == "python":
+        return _solve_chunk(systems)
+
+    workers = workers or os.cpu_count() or 1
+    chunks = [systems[k : k + chunksize] for k in range(0, len(systems), chunksize)]
+    with ProcessPoolExecutor(workers) as executor:
+        return [x for chunk in executor.map(_solve_chunk, chunks) for x in chunk]
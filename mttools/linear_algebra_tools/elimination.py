@@ -0,0 +1,605 @@
+"""
+Gaussian elimination factorizations shared by Matrix and SquareMatrix
+"""
+
+from fractions import Fraction
+from math import gcd
+from operator import mul
+
+from mttools.Constants import EPSILON
+from mttools.utils.exceptions import DimensionError, NoInverseWarning
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+PIVOTING = ("partial", "complete")
+
+
+def default_tolerance(array):
+    """
+    Size below which a pivot cannot be told apart from rounding error,
+    EPSILON * max(m, n) * ||A|| in the infinity norm
+
+    :param array: (list or ndarray)
+        An m by n matrix
+    :return: (float)
+    """
+    if not len(array):
+        return 0.0
+    if np is not None and isinstance(array, np.ndarray):
+        norm = float(np.abs(array).sum(axis=1).max())
+    else:
+        norm = float(max(sum(map(abs, row)) for row in array))
+    return EPSILON * max(len(array), len(array[0])) * norm
+
+
+def _is_exact(array):
+    """
+    True if every entry is an int or a Fraction, so elimination can be exact
+    """
+    return all(isinstance(value, (int, Fraction)) for row in array for value in row)
+
+
+def _integer_rows(array):
+    """
+    Scales array by the least common denominator of its entries, floats
+    are converted to the Fraction they hold exactly
+
+    :return: (tuple)
+        The scaled rows as lists of ints, and the common denominator
+    """
+    rows = [[Fraction(value) for value in row] for row in array]
+    denominator = 1
+    for row in rows:
+        for value in row:
+            d = value.denominator
+            denominator = denominator // gcd(denominator, d) * d
+    return [[int(value * denominator) for value in row] for row in rows], denominator
+
+
+def _bareiss(a, num_columns, reduced=False):
+    """
+    Bareiss fraction-free elimination of the integer rows a, in place.
+
+    Each update (pivot * x - m * y) // previous divides exactly, every entry
+    stays a minor of the original matrix, so the entries only grow linearly
+    in length and no gcds are ever taken.
+
+    Without reduced only the rows below each pivot are cleared, and the
+    multiplier m of row i at step r is kept in a[i][r] as in the compact LU.
+    With reduced every other row is cleared (Gauss-Jordan), which leaves
+    every pivot equal to the last one.
+
+    :param a: (list)
+        Rows of ints
+    :param num_columns: (int)
+        Pivots are only taken from the first num_columns columns
+    :param reduced: (bool, Optional, default=False)
+        Clear above the pivots too
+    :return: (tuple)
+        permutation, sign and pivot_columns, as for LUDecomposition
+    """
+    num_rows = len(a)
+    permutation = list(range(num_rows))
+    sign = 1
+    pivot_columns = []
+
+    previous = 1
+    r = 0
+    for c in range(num_columns):
+        if r == num_rows:
+            break
+        p = max(range(r, num_rows), key=lambda i: abs(a[i][c]))
+        if not a[p][c]:
+            continue
+        if p != r:
+            a[p], a[r] = a[r], a[p]
+            permutation[p], permutation[r] = permutation[r], permutation[p]
+            sign = -sign
+
+        pivot_row = a[r]
+        pivot = pivot_row[c]
+        # Left of c the rows below hold multipliers, and the rows above
+        # are only divisible by previous once every entry is updated
+        start = 0 if reduced else c + 1
+        tail = pivot_row[start:]
+        for i in range(0 if reduced else r + 1, num_rows):
+            if i == r:
+                continue
+            row = a[i]
+            m = row[c]
+            row[start:] = [
+                (pivot * x - m * y) // previous for x, y in zip(row[start:], tail)
+            ]
+            row[c] = 0
+            if not reduced:
+                row[r] = m
+        pivot_columns.append(c)
+        previous = pivot
+        r += 1
+    return permutation, sign, pivot_columns
+
+
+def exact_rref(array):
+    """
+    Reduced row echelon form computed exactly, by fraction-free
+    Gauss-Jordan elimination over the integers
+
+    :param array: (list)
+        Rows of ints, Fractions or floats, floats are taken as the
+        Fraction they hold exactly
+    :return: (tuple)
+        The reduced rows as Fractions, and the pivot column of each nonzero row
+    """
+    a, _ = _integer_rows(array)
+    num_columns = len(a[0]) if a else 0
+    _, _, pivot_columns = _bareiss(a, num_columns, reduced=True)
+    rows = []
+    for i, row in enumerate(a):
+        pivot = a[i][pivot_columns[i]] if i < len(pivot_columns) else 1
+        rows.append([Fraction(value, pivot) for value in row])
+    return rows, pivot_columns
+
+
+def _partial_pivot(a, r, columns, tolerance):
+    """
+    The largest entry below row r in the leftmost column that has one
+    above tolerance, the columns passed over are zeroed below row r
+    """
+    while columns:
+        c = columns[0]
+        p = max(range(r, len(a)), key=lambda i: abs(a[i][c]))
+        if abs(a[p][c]) > tolerance:
+            return p, c
+        for i in range(r, len(a)):
+            a[i][c] = 0.0
+        del columns[0]
+    return None
+
+
+def _complete_pivot(a, r, columns, tolerance):
+    """
+    The largest entry above tolerance below row r in any of the columns
+    """
+    best, pivot = tolerance, None
+    for c in columns:
+        for i in range(r, len(a)):
+            value = abs(a[i][c])
+            if value > best:
+                best, pivot = value, (i, c)
+    return pivot
+
+
+def _gauss_jordan_python(a, pivoting, tolerance):
+    """
+    Gauss-Jordan elimination of the rows a, in place: the row lists are
+    swapped and overwritten rather than replaced
+
+    :return: (list)
+        Pivot column of each nonzero row, in the order they were taken
+    """
+    select = _partial_pivot if pivoting == "partial" else _complete_pivot
+    columns = list(range(len(a[0])))
+    pivot_columns = []
+    for r in range(len(a)):
+        found = select(a, r, columns, tolerance)
+        if found is None:
+            # Everything left is rounding error
+            for row in a[r:]:
+                row[:] = [0.0] * len(row)
+            break
+        p, c = found
+        columns.remove(c)
+        a[p], a[r] = a[r], a[p]
+
+        # With partial pivoting the pivot row is zero left of the pivot
+        start = c if pivoting == "partial" else 0
+        pivot_row = a[r]
+        pivot = pivot_row[c]
+        pivot_row[start:] = [value / pivot for value in pivot_row[start:]]
+        tail = pivot_row[start:]
+        for i, row in enumerate(a):
+            factor = row[c]
+            if i != r and factor:
+                row[start:] = [x - factor * y for x, y in zip(row[start:], tail)]
+                row[c] = 0.0
+        pivot_columns.append(c)
+    return pivot_columns
+
+
+def _gauss_jordan_numpy(a, pivoting, tolerance):
+    """
+    Gauss-Jordan elimination of the float ndarray a, in place, every rank
+    one update is written through one preallocated scratch array
+    """
+    num_rows, num_columns = a.shape
+    scratch = np.empty_like(a)
+    factors = np.empty(num_rows, dtype=a.dtype)
+    columns = list(range(num_columns))
+    pivot_columns = []
+    for r in range(num_rows):
+        found = None
+        if pivoting == "partial":
+            while columns:
+                column = np.abs(a[r:, columns[0]])
+                p = int(np.argmax(column))
+                if column[p] > tolerance:
+                    found = (r + p, columns[0])
+                    break
+                a[r:, columns[0]] = 0
+                del columns[0]
+        elif columns:
+            block = np.abs(a[r:, columns])
+            p, j = np.unravel_index(int(np.argmax(block)), block.shape)
+            if block[p, j] > tolerance:
+                found = (r + int(p), columns[j])
+        if found is None:
+            a[r:] = 0
+            break
+        p, c = found
+        columns.remove(c)
+        if p != r:
+            a[[p, r]] = a[[r, p]]
+
+        start = c if pivoting == "partial" else 0
+        a[r, start:] /= a[r, c]
+        factors[:] = a[:, c]
+        factors[r] = 0
+        np.multiply.outer(factors, a[r, start:], out=scratch[:, start:])
+        a[:, start:] -= scratch[:, start:]
+        a[:, c] = 0
+        a[r, c] = 1
+        pivot_columns.append(c)
+    return pivot_columns
+
+
+def rref_in_place(a, pivoting="partial", tolerance=0.0):
+    """
+    Reduces a to reduced row echelon form in floating point, in place.
+
+    Partial pivoting takes the largest entry of each column in turn.
+    Complete pivoting takes the largest entry left anywhere, which decides
+    the rank more reliably, the rows it leaves span the row space and are
+    then reduced again with partial pivoting, since the reduced row echelon
+    form has its pivots in the leftmost columns possible.
+
+    :param a: (list or ndarray)
+        Rows of floats, or a 2D float ndarray
+    :param pivoting: (str, Optional, default="partial")
+        "partial" or "complete"
+    :param tolerance: (float, Optional, default=0.0)
+        Entries with an absolute value at most tolerance count as zero
+    :return: (list)
+        The pivot column of each nonzero row, the rank is its length
+    """
+    if pivoting not in PIVOTING:
+        raise ValueError(f"pivoting must be one of {PIVOTING}, got {pivoting!r}")
+    if not len(a):
+        return []
+    reduce = _gauss_jordan_python if isinstance(a, list) else _gauss_jordan_numpy
+
+    pivot_columns = reduce(a, pivoting, tolerance)
+    if pivoting == "complete" and pivot_columns:
+        rank = len(pivot_columns)
+        basis = a[:rank]
+        pivot_columns = reduce(basis, "partial", tolerance)
+        if isinstance(a, list):
+            a[:rank] = basis
+    return pivot_columns
+
+
+class LUDecomposition:
+    """
+    PA = LU factorization with partial pivoting.
+
+    Computed once in O(n^3), then reused for the determinant, inverse,
+    rank and for solving. Rank deficient and rectangular matrices are
+    factored too, U is then in row echelon form.
+
+    Matrices of ints and Fractions are factored exactly by Bareiss
+    fraction-free elimination, so the determinant and rank take
+    polynomial time in exact integers, and L and U are Fractions.
+    Anything else is factored in floating point.
+
+    Attributes:
+        :num_rows: (int)
+            Number of rows of A
+
+        :num_columns: (int)
+            Number of columns of A
+
+        :exact: (bool)
+            True if A was factored exactly
+
+        :tolerance: (numeric)
+            Largest absolute value of a pivot counted as zero
+
+        :lu: (list or ndarray)
+            L below the diagonal, its unit diagonal is implied,
+            and U on and above it
+
+        :permutation: (list)
+            Row i of PA is row permutation[i] of A
+
+        :sign: (int)
+            Determinant of P, 1 or -1
+
+        :pivot_columns: (list)
+            Column of the pivot in each nonzero row of U
+
+        :rank: (int)
+            Number of pivots, the rank of A
+    """
+
+    def __init__(self, matrix, tolerance=None, exact=None):
+        """
+        :param matrix: (Matrix)
+            Matrix to factor, it is not modified
+        :param tolerance: (numeric, Optional)
+            Pivots with an absolute value at most tolerance count as zero,
+            by default default_tolerance(A), and 0 when factoring exactly
+        :param exact: (bool, Optional)
+            Factor exactly by fraction-free elimination, by default
+            only when every entry is an int or a Fraction
+        """
+        self.num_rows = matrix.num_rows
+        self.num_columns = matrix.num_columns
+        self.backend = matrix.backend
+        data = matrix._data
+        if self.backend == "array":
+            # Flat float storage is factored on the pure Python path
+            self.backend = "python"
+            data = matrix._rows()
+
+        if exact is None:
+            exact = (self.backend == "python" or data.dtype == object) and _is_exact(
+                data
+            )
+        self.exact = exact
+        if tolerance is None:
+            tolerance = 0 if exact else default_tolerance(data)
+        self.tolerance = tolerance
+        if exact:
+            self._factor_exact(data)
+            if self.backend == "numpy":
+                self.lu = np.array(self.lu, dtype=object)
+        elif self.backend == "numpy":
+            if data.dtype != object:
+                data = data.astype(np.result_type(data.dtype, np.float64))
+            self.lu = data.copy()
+            self._factor_numpy()
+        else:
+            self.lu = [list(row) for row in data]
+            self._factor_python()
+        self.rank = len(self.pivot_columns)
+
+    def _factor_exact(self, array):
+        """
+        Bareiss elimination of the rows scaled to integers, the Fractions of
+        L and U are only formed once at the end.
+
+        Before step k the integer rows are those of ordinary elimination
+        times the previous pivot p[k-1], so L[i][k] = m / p[k] for the
+        multiplier m of row i, and U[k] is Bareiss row k over p[k-1].
+        """
+        a, denominator = _integer_rows(array)
+        self.permutation, self.sign, self.pivot_columns = _bareiss(a, self.num_columns)
+        pivots = [a[k][c] for k, c in enumerate(self.pivot_columns)]
+        rank = len(pivots)
+        self._denominator = denominator
+        self._last_pivot = pivots[-1] if pivots else 0
+
+        self.lu = []
+        for i, row in enumerate(a):
+            width = min(i, rank)
+            scale = denominator * (pivots[i - 1] if 0 < i <= rank else 1)
+            self.lu.append(
+                [Fraction(value, pivots[j]) for j, value in enumerate(row[:width])]
+                + [Fraction(value, scale) for value in row[width:]]
+            )
+
+    def _factor_python(self):
+        a = self.lu
+        num_rows, num_columns = self.num_rows, self.num_columns
+        self.permutation = list(range(num_rows))
+        self.sign = 1
+        self.pivot_columns = []
+
+        r = 0
+        for c in range(num_columns):
+            if r == num_rows:
+                break
+            p = max(range(r, num_rows), key=lambda i: abs(a[i][c]))
+            if abs(a[p][c]) <= self.tolerance:
+                for i in range(r, num_rows):
+                    a[i][c] = 0
+                continue
+            if p != r:
+                a[p], a[r] = a[r], a[p]
+                self.permutation[p], self.permutation[r] = (
+                    self.permutation[r],
+                    self.permutation[p],
+                )
+                self.sign = -self.sign
+
+            pivot_row = a[r]
+            pivot = pivot_row[c]
+            tail = pivot_row[c + 1 :]
+            for i in range(r + 1, num_rows):
+                row = a[i]
+                factor = row[c] / pivot
+                row[c] = 0
+                row[r] = factor
+                if factor:
+                    row[c + 1 :] = [x - factor * y for x, y in zip(row[c + 1 :], tail)]
+            self.pivot_columns.append(c)
+            r += 1
+
+    def _factor_numpy(self):
+        a = self.lu
+        num_rows, num_columns = self.num_rows, self.num_columns
+        self.permutation = list(range(num_rows))
+        self.sign = 1
+        self.pivot_columns = []
+
+        r = 0
+        for c in range(num_columns):
+            if r == num_rows:
+                break
+            column = np.abs(a[r:, c])
+            p = r + int(np.argmax(column))
+            if column[p - r] <= self.tolerance:
+                a[r:, c] = 0
+                continue
+            if p != r:
+                a[[p, r]] = a[[r, p]]
+                self.permutation[p], self.permutation[r] = (
+                    self.permutation[r],
+                    self.permutation[p],
+                )
+                self.sign = -self.sign
+
+            factors = a[r + 1 :, c] / a[r, c]
+            a[r + 1 :, c] = 0
+            a[r + 1 :, c + 1 :] -= np.outer(factors, a[r, c + 1 :])
+            a[r + 1 :, r] = factors
+            self.pivot_columns.append(c)
+            r += 1
+
+    def _lu_lists(self):
+        return self.lu.tolist() if self.backend == "numpy" else self.lu
+
+    def lower(self):
+        """
+        :return: (list)
+            L, the unit lower triangular factor, num_rows by num_rows
+        """
+        lu = self._lu_lists()
+        # Multipliers are only stored in the first rank < num_columns columns
+        width = min(self.num_rows, self.num_columns)
+        return [
+            [
+                lu[i][j] if j < min(i, width) else int(i == j)
+                for j in range(self.num_rows)
+            ]
+            for i in range(self.num_rows)
+        ]
+
+    def upper(self):
+        """
+        :return: (list)
+            U, the upper triangular (row echelon) factor, num_rows by num_columns
+        """
+        lu = self._lu_lists()
+        return [
+            [lu[i][j] if j >= i else 0 for j in range(self.num_columns)]
+            for i in range(self.num_rows)
+        ]
+
+    def _require_nonsingular(self):
+        if self.num_rows != self.num_columns:
+            raise DimensionError(
+                f"Expected a square matrix, got {self.num_rows}x{self.num_columns}"
+            )
+        if self.rank < self.num_rows:
+            raise NoInverseWarning("The matrix is singular")
+
+    def determinant(self):
+        """
+        :return: (numeric)
+            det(A), the signed product of the pivots
+        """
+        if self.num_rows != self.num_columns:
+            raise DimensionError(
+                f"Expected a square matrix, got {self.num_rows}x{self.num_columns}"
+            )
+        if self.rank < self.num_rows:
+            return 0
+        if self.exact:
+            # The last Bareiss pivot is det(DA), for the common denominator D
+            result = Fraction(
+                self.sign * self._last_pivot, self._denominator ** self.num_rows
+            )
+            return int(result) if result.denominator == 1 else result
+        result = self.sign
+        for i in range(self.num_rows):
+            result *= self.lu[i][i]
+        return result.item() if hasattr(result, "item") else result
+
+    def solve(self, b):
+        """
+        Solves Ax = b by forward and back substitution
+
+        :param b: (list or ndarray)
+            Right hand side, a vector or a num_rows by k array of k columns
+        :return: (list or ndarray)
+            x, in the same shape as b
+        """
+        self._require_nonsingular()
+        if self.backend == "numpy":
+            return self._solve_numpy(b)
+
+        is_vector = not isinstance(b[0], (list, tuple))
+        rows = [[value] for value in b] if is_vector else b
+        if len(rows) != self.num_rows:
+            raise DimensionError(f"Expected {self.num_rows} rows, got {len(rows)}")
+        if self.exact:
+            convert = Fraction if _is_exact(rows) else float
+            y = [[convert(value) for value in rows[p]] for p in self.permutation]
+        else:
+            y = [list(rows[p]) for p in self.permutation]
+
+        lu = self.lu
+        n = self.num_rows
+        if is_vector:
+            # One dot product per row, rather than a row operation per entry
+            x = [row[0] for row in y]
+            for i in range(1, n):
+                x[i] -= sum(map(mul, lu[i][:i], x[:i]))
+            for i in reversed(range(n)):
+                row = lu[i]
+                x[i] = (x[i] - sum(map(mul, row[i + 1 : n], x[i + 1 :]))) / row[i]
+            return x
+
+        for i in range(n):
+            row, y_i = lu[i], y[i]
+            for k in range(i):
+                factor = row[k]
+                if factor:
+                    y_i[:] = [x - factor * z for x, z in zip(y_i, y[k])]
+        for i in reversed(range(n)):
+            row, y_i = lu[i], y[i]
+            for k in range(i + 1, n):
+                factor = row[k]
+                if factor:
+                    y_i[:] = [x - factor * z for x, z in zip(y_i, y[k])]
+            pivot = row[i]
+            y_i[:] = [value / pivot for value in y_i]
+
+        return y
+
+    def _solve_numpy(self, b):
+        b = np.asarray(b)
+        if b.shape[0] != self.num_rows:
+            raise DimensionError(f"Expected {self.num_rows} rows, got {b.shape[0]}")
+        y = b[self.permutation].astype(np.result_type(b.dtype, self.lu.dtype))
+        lu = self.lu
+        for i in range(self.num_rows):
+            y[i] -= lu[i, :i] @ y[:i]
+        for i in reversed(range(self.num_rows)):
+            y[i] = (y[i] - lu[i, i + 1 :] @ y[i + 1 :]) / lu[i, i]
+        return y
+
+    def inverse(self):
+        """
+        :return: (list or ndarray)
+            A^-1, found by solving against the columns of the identity
+        """
+        self._require_nonsingular()
+        n = self.num_rows
+        if self.backend == "numpy":
+            return self._solve_numpy(np.eye(n, dtype=self.lu.dtype))
+        return self.solve([[int(i == j) for j in range(n)] for i in range(n)])
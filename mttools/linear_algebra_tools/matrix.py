@@ -1,5 +1,152 @@
+from array import array as pyarray
+from collections.abc import Sequence
+from itertools import chain
+from operator import add, is_, mul, sub
+
+from mttools.linear_algebra_tools.elimination import (
+    LUDecomposition,
+    _is_exact,
+    default_tolerance,
+    exact_rref,
+    rref_in_place,
+)
 from mttools.utils.exceptions import DimensionError, NoInverseWarning
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Float matrices with at least this many entries are worth handing to NumPy,
+# below it the conversion costs more than the pure Python loops. Only used
+# for matrices that are never handed back to the caller, since writes to
+# the rows of Matrix.array are lost on the NumPy backend
+NUMPY_THRESHOLD = 32 * 32
+
+BACKENDS = ("python", "numpy", "array")
+
+# Columns of the right operand per tile of the pure Python multiply
+MUL_BLOCK_SIZE = 64
+
+# Largest size of the exact square blocks that Strassen-Winograd hands
+# to the classical multiply, see benchmarks/bench_matrix.py
+STRASSEN_CROSSOVER = 64
+
+
+def _default_backend(array):
+    """
+    Picks the NumPy backend for large matrices of real numbers with at least
+    one float, integer matrices stay exact on the pure Python backend.
+    Matrix itself never picks it for lists, see NUMPY_THRESHOLD
+    """
+    if np is not None and isinstance(array, np.ndarray):
+        return "numpy"
+    if np is None or len(array) * len(array[0]) < NUMPY_THRESHOLD:
+        return "python"
+    has_float = False
+    for row in array:
+        for value in row:
+            if type(value) is float:
+                has_float = True
+            elif type(value) is not int:
+                return "python"
+    return "numpy" if has_float else "python"
+
+
+def _list_backend(a, b):
+    """
+    Backend of the result of a pure Python operation on a and b,
+    floats stay flat if either one is
+    """
+    return "array" if "array" in (a.backend, b.backend) else "python"
+
+
+def _multiply_lists(a, b, block_size=MUL_BLOCK_SIZE):
+    """
+    Pure Python product of two lists of rows.
+
+    b is transposed once into column tuples, so every entry is one
+    sum(map(mul, row, column)) over two flat sequences. The columns are
+    taken a tile at a time, so each tile is reused by every row of a
+    while it is still in cache.
+    """
+    columns = list(zip(*b))
+    result = [[] for _ in a]
+    for start in range(0, len(columns), block_size):
+        tile = columns[start : start + block_size]
+        for row, new_row in zip(a, result):
+            new_row.extend([sum(map(mul, row, column)) for column in tile])
+    return result
+
+
+def _add_lists(a, b):
+    return [list(map(add, x, y)) for x, y in zip(a, b)]
+
+
+def _sub_lists(a, b):
+    return [list(map(sub, x, y)) for x, y in zip(a, b)]
+
+
+def _winograd(a, b, crossover):
+    """
+    One level of Strassen-Winograd on n by n lists, n even above crossover:
+    7 half size products and 15 half size additions instead of 8 products
+    """
+    n = len(a)
+    if n <= crossover:
+        return _multiply_lists(a, b)
+    h = n // 2
+    a11, a12 = [row[:h] for row in a[:h]], [row[h:] for row in a[:h]]
+    a21, a22 = [row[:h] for row in a[h:]], [row[h:] for row in a[h:]]
+    b11, b12 = [row[:h] for row in b[:h]], [row[h:] for row in b[:h]]
+    b21, b22 = [row[:h] for row in b[h:]], [row[h:] for row in b[h:]]
+
+    s1 = _add_lists(a21, a22)
+    s2 = _sub_lists(s1, a11)
+    s3 = _sub_lists(a11, a21)
+    s4 = _sub_lists(a12, s2)
+    t1 = _sub_lists(b12, b11)
+    t2 = _sub_lists(b22, t1)
+    t3 = _sub_lists(b22, b12)
+    t4 = _sub_lists(t2, b21)
+
+    p1 = _winograd(a11, b11, crossover)
+    u2 = _add_lists(p1, _winograd(s2, t2, crossover))
+    u3 = _add_lists(u2, _winograd(s3, t3, crossover))
+    p5 = _winograd(s1, t1, crossover)
+    u4 = _add_lists(u2, p5)
+    c11 = _add_lists(p1, _winograd(a12, b21, crossover))
+    c12 = _add_lists(u4, _winograd(s4, b22, crossover))
+    c21 = _sub_lists(u3, _winograd(a22, t4, crossover))
+    c22 = _add_lists(u3, p5)
+    return [x + y for x, y in zip(c11, c12)] + [x + y for x, y in zip(c21, c22)]
+
+
+def _strassen_lists(a, b, crossover=STRASSEN_CROSSOVER):
+    """
+    Strassen-Winograd product of two n by n lists of lists, in
+    O(n ** 2.81) operations.
+
+    The operands are padded with zeros once, to the smallest size that
+    halves evenly down to at most crossover, so at most 2 ** levels - 1
+    rows and columns are added.
+    """
+    n = len(a)
+    size, levels = n, 0
+    while size > crossover:
+        size = (size + 1) // 2
+        levels += 1
+    padding = (size << levels) - n
+    if not padding:
+        return _winograd(a, b, crossover)
+    zeros = [0] * padding
+    # The padding rows are only read, so they can share one list
+    zero_rows = [[0] * (n + padding)] * padding
+    a = [list(row) + zeros for row in a] + zero_rows
+    b = [list(row) + zeros for row in b] + zero_rows
+    product = _winograd(a, b, crossover)
+    return [row[:n] for row in product[:n]]
+
 
 class Matrix:
     """
@@ -9,7 +156,10 @@ class Matrix:
 
     Attributes:
         :array: (Array Like)
-            The matrix
+            The matrix, always a list of lists, for the NumPy backend
+            reading it makes a copy and assigning it replaces the storage.
+            The list assigned is copied, its rows are shared but never
+            modified in place by the methods of Matrix
 
         :num_rows: (int)
             Number of rows
@@ -17,22 +167,232 @@ class Matrix:
         :num_columns: (int)
             Number of Columns
 
+        :backend: (str)
+            "python" stores a list of lists,
+            "numpy" stores a 2D ndarray and hands the arithmetic to BLAS,
+            "array" stores the entries as floats in one flat row-major
+            array('d'), 8 bytes each instead of a pointer and a float object
+
     """
 
-    def __init__(self, array):
+    __slots__ = ("backend", "num_rows", "num_columns", "_data", "_lu", "_lu_entries")
+
+    def __init__(self, array, backend=None):
         """
         :param array: (NxM array-like)
-            Array of M, N-length arrays
+            Array of M, N-length arrays, or a 2D ndarray
+        :param backend: (str, Optional)
+            "python", "numpy" or "array", by default "numpy" for ndarrays
+            and "python" otherwise, so the rows of array stay editable
         """
-        for row in array:
-            if len(row) != len(array[0]):
-                print("Array is not rectangular, Cannot be a matrix")
-                raise DimensionError
+        if np is not None and isinstance(array, np.ndarray):
+            if array.ndim != 2:
+                raise DimensionError(f"Expected a 2D array, got {array.ndim}D")
+            if backend is None:
+                backend = "numpy"
+        else:
+            for row in array:
+                if len(row) != len(array[0]):
+                    print("Array is not rectangular, Cannot be a matrix")
+                    raise DimensionError
+            if backend is None:
+                backend = "python"
 
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+        if backend == "numpy" and np is None:
+            raise ImportError("The numpy backend requires numpy")
+
+        self.backend = backend
+        self._lu = None
         self.array = array
         self.num_rows = len(array)
         self.num_columns = len(array[0])
 
+    @classmethod
+    def _from_flat(cls, data, num_rows, num_columns):
+        """
+        A matrix on the array backend around the flat row-major array('d')
+        data, which is not copied
+        """
+        matrix = cls.__new__(cls)
+        matrix.backend = "array"
+        matrix._lu = None
+        matrix._data = data
+        matrix.num_rows = num_rows
+        matrix.num_columns = num_columns
+        return matrix
+
+    @property
+    def array(self):
+        if self.backend == "numpy":
+            return self._data.tolist()
+        if self.backend == "array":
+            return [row.tolist() for row in self._rows()]
+        return self._data
+
+    @array.setter
+    def array(self, array):
+        self._lu = None
+        if self.backend == "numpy":
+            self._data = np.array(array)
+        elif self.backend == "array":
+            if np is not None and isinstance(array, np.ndarray):
+                array = np.ascontiguousarray(array, dtype=float).tobytes()
+                self._data = pyarray("d", array)
+            else:
+                self._data = pyarray("d", chain.from_iterable(array))
+        elif np is not None and isinstance(array, np.ndarray):
+            self._data = array.tolist()
+        else:
+            # Only the outer list, so swap_rows cannot reorder the caller's
+            self._data = list(array)
+
+    def lu_decomposition(self, exact=None):
+        """
+        PLU factorization of self, computed on first use and cached
+        until self is modified, including entries of array edited in place
+
+        :param exact: (bool, Optional)
+            Passed to LUDecomposition, the cached factorization is
+            replaced if it was not computed that way
+        :return: (LUDecomposition)
+        """
+        if (
+            self._lu is None
+            or exact not in (None, self._lu.exact)
+            or not self._same_entries(self._lu_entries)
+        ):
+            self._lu = LUDecomposition(self, exact=exact)
+            self._lu_entries = self._entries()
+        return self._lu
+
+    def _entries(self):
+        """
+        Snapshot of the entries to check the cached LU decomposition
+        against, since the rows of array and the buffer handed to NumPy
+        can be edited in place without going through self
+        """
+        if self.backend == "python":
+            return [tuple(row) for row in self._data]
+        return self._data.tobytes()
+
+    def _same_entries(self, entries):
+        """
+        True if no entry was replaced since entries was taken, python
+        rows are compared by identity so an equal entry of another type
+        still counts as a change
+        """
+        if self.backend != "python":
+            return entries == self._entries()
+        rows = self._data
+        return len(rows) == len(entries) and all(
+            len(row) == len(old) and all(map(is_, row, old))
+            for row, old in zip(rows, entries)
+        )
+
+    def copy(self):
+        """
+        A new matrix of the same class and backend with its own storage
+
+        :return: (Matrix)
+        """
+        if self.backend == "numpy":
+            return self.__class__(self._data.copy(), backend="numpy")
+        if self.backend == "array":
+            return self._from_flat(self._data[:], self.num_rows, self.num_columns)
+        return self.__class__([list(row) for row in self._data], backend="python")
+
+    def view(self, rows=slice(None), columns=slice(None)):
+        """
+        Read only view of a block of self that shares its storage,
+        nothing is copied
+
+        :param rows: (slice, Optional, default = every row)
+            Rows of self in the view
+        :param columns: (slice, Optional, default = every column)
+            Columns of self in the view
+        :return: (MatrixView)
+        """
+        return MatrixView(self, rows, columns)
+
+    @property
+    def T(self):
+        """
+        Read only view of the transpose of self, nothing is copied
+
+        :return: (MatrixView)
+        """
+        return MatrixView(self, transposed=True)
+
+    def _exact(self):
+        """
+        True if every entry is an int or a Fraction
+        """
+        if self.backend == "array":
+            return False
+        if self.backend == "numpy" and self._data.dtype != object:
+            return False
+        return _is_exact(self._data)
+
+    def _rows(self):
+        """
+        The rows as sequences, for the array backend each row is
+        a new array('d') sliced from the flat storage
+        """
+        if self.backend == "array":
+            n = self.num_columns
+            return [self._data[i : i + n] for i in range(0, len(self._data), n)]
+        return self._data
+
+    def _ndarray(self):
+        """
+        The entries as an ndarray, without copying for the NumPy and
+        array backends
+        """
+        if self.backend == "numpy":
+            return self._data
+        if self.backend == "array":
+            return np.frombuffer(self._data).reshape(self.num_rows, self.num_columns)
+        return np.array(self._data)
+
+    def __array__(self, dtype=None, copy=None):
+        """
+        Lets np.asarray(matrix) take the entries, sharing the storage
+        of the NumPy and array backends
+        """
+        result = self._ndarray()
+        if dtype is not None:
+            result = result.astype(dtype, copy=False)
+        return result.copy() if copy else result
+
+    def buffer(self):
+        """
+        The entries as a 2D memoryview of C doubles, sharing the storage
+        of the array backend
+
+        :return: (memoryview)
+        """
+        if self.backend == "array":
+            shape = (self.num_rows, self.num_columns)
+            return memoryview(self._data).cast("B").cast("d", shape)
+        if self.backend == "numpy":
+            return memoryview(np.ascontiguousarray(self._data))
+        raise TypeError("The python backend has no buffer, use the array backend")
+
+    def __buffer__(self, flags):
+        # The buffer protocol for Python classes, memoryview(matrix) on 3.12+
+        return self.buffer()
+
+    def _promote(self, value):
+        """
+        Widens the NumPy storage so value can be stored without truncation,
+        for example int64 entries become float64 before dividing a row
+        """
+        dtype = np.result_type(self._data, value)
+        if dtype != self._data.dtype:
+            self._data = self._data.astype(dtype)
+
     def __str__(self):
         result = ""
         for row in self.array:
@@ -42,6 +402,12 @@ class Matrix:
             result += "]\n"
         return result
 
+    def _like(self, array, backend):
+        """
+        A new matrix of the class of self holding array
+        """
+        return self.__class__(array, backend=backend)
+
     def __mul__(self, other):
         """
         Implements the multilation operator between two matrices
@@ -51,22 +417,16 @@ class Matrix:
         :return: (Matrix Object)
             Product
         """
+        if not isinstance(other, (Matrix, MatrixView)):
+            return NotImplemented
         if self.num_columns != other.num_rows:
             raise DimensionError(
                 f"The number of columns in the RH maxtrix must equal the number of rows in the LH (got {self.num_columns} and {other.num_rows})"
             )
-        new_array = self.zero_array(
-            num_rows=self.num_rows, num_columns=other.num_columns
-        )
-        for r, row in enumerate(new_array):
-            for c, _ in enumerate(row):
-                new_array[r][c] = sum(
-                    [
-                        self.array[r][k] * other.array[k][c]
-                        for k in range(self.num_columns)
-                    ]
-                )
-        return self.__class__(new_array)
+        if "numpy" in (self.backend, other.backend):
+            return self._like(self._ndarray() @ other._ndarray(), backend="numpy")
+        product = _multiply_lists(self._rows(), other._rows())
+        return self._like(product, backend=_list_backend(self, other))
 
     def __add__(self, other):
         """
@@ -80,11 +440,13 @@ class Matrix:
         """
         if self.num_rows != other.num_rows or self.num_columns != other.num_columns:
             raise DimensionError
+        if "numpy" in (self.backend, other.backend):
+            return self._like(self._ndarray() + other._ndarray(), backend="numpy")
         new_array = self.zero_array()
-        for r, (s_row, o_row) in enumerate(zip(self.array, other.array)):
+        for r, (s_row, o_row) in enumerate(zip(self._rows(), other._rows())):
             for c, (s_val, o_val) in enumerate(zip(s_row, o_row)):
                 new_array[r][c] = s_val + o_val
-        return self.__class__(new_array)
+        return self._like(new_array, backend=_list_backend(self, other))
 
     def zero_array(self, num_rows=None, num_columns=None):
         """
@@ -111,6 +473,14 @@ class Matrix:
         :param scalar: (Numeric)
             Number to multiply by
         """
+        if self.backend == "numpy":
+            self._data = self._data * scalar
+            self._lu = None
+            return
+        if self.backend == "array":
+            self._data = pyarray("d", [value * scalar for value in self._data])
+            self._lu = None
+            return
         new_array = self.zero_array()
         for r, row in enumerate(self.array):
             for c, value in enumerate(row):
@@ -121,13 +491,45 @@ class Matrix:
         """
         Transposes matrix
         """
-        new_array = self.zero_array(
-            num_rows=self.num_columns, num_columns=self.num_rows
-        )
-        for r, row in enumerate(self.array):
-            for c, val in enumerate(row):
-                new_array[c][r] = val
-        self.array = new_array
+        if self.backend == "numpy":
+            # Copied so rows stay contiguous for the row operations
+            self._data = np.ascontiguousarray(self._data.T)
+            self._lu = None
+        elif self.backend == "array":
+            self._data = self._transposed_flat()
+            self._lu = None
+        else:
+            new_array = self.zero_array(
+                num_rows=self.num_columns, num_columns=self.num_rows
+            )
+            for r, row in enumerate(self.array):
+                for c, val in enumerate(row):
+                    new_array[c][r] = val
+            self.array = new_array
+        self.num_rows, self.num_columns = self.num_columns, self.num_rows
+
+    def _transposed_flat(self):
+        """
+        The flat array('d') of the transpose, one strided slice per column
+        """
+        data, n = self._data, self.num_columns
+        result = pyarray("d")
+        for c in range(n):
+            result.extend(data[c::n])
+        return result
+
+    def transposed(self):
+        """
+        The transpose of self as a new matrix, self is not modified
+
+        :return: (Matrix)
+        """
+        if self.backend == "numpy":
+            return self.__class__(np.ascontiguousarray(self._data.T), backend="numpy")
+        if self.backend == "array":
+            flat = self._transposed_flat()
+            return self._from_flat(flat, self.num_columns, self.num_rows)
+        return self.__class__([list(column) for column in zip(*self._data)], "python")
 
     def swap_rows(self, row_1, row_2):
         """
@@ -139,7 +541,15 @@ class Matrix:
         :param row_2: (int)
             index of the second row
         """
-        self.array[row_1], self.array[row_2] = self.array[row_2], self.array[row_1]
+        self._lu = None
+        if self.backend == "numpy":
+            self._data[[row_1, row_2]] = self._data[[row_2, row_1]]
+        elif self.backend == "array":
+            data, n = self._data, self.num_columns
+            a, b = row_1 * n, row_2 * n
+            data[a : a + n], data[b : b + n] = data[b : b + n], data[a : a + n]
+        else:
+            self._data[row_1], self._data[row_2] = self._data[row_2], self._data[row_1]
 
     def multiply_row(self, row_num, scalar):
         """
@@ -151,7 +561,16 @@ class Matrix:
         :param scalar: (numeric)
             scalar to multiply row by
         """
-        self.array[row_num] = [scalar * x for x in self.array[row_num]]
+        self._lu = None
+        if self.backend == "numpy":
+            self._promote(scalar)
+            self._data[row_num] *= scalar
+        elif self.backend == "array":
+            data, n = self._data, self.num_columns
+            a = row_num * n
+            data[a : a + n] = pyarray("d", [scalar * x for x in data[a : a + n]])
+        else:
+            self._data[row_num] = [scalar * x for x in self._data[row_num]]
 
     def add_rows(self, from_row, to_row, scalar=1):
         """
@@ -168,53 +587,294 @@ class Matrix:
         :param scalar: (numeric, Optional, default=1)
             optional multiple for from_row
         """
-        self.array[to_row] = [
-            scalar * y + x for x, y in zip(self.array[to_row], self.array[from_row])
-        ]
+        self._lu = None
+        if self.backend == "numpy":
+            self._promote(scalar)
+            self._data[to_row] += scalar * self._data[from_row]
+        elif self.backend == "array":
+            data, n = self._data, self.num_columns
+            a, b = to_row * n, from_row * n
+            data[a : a + n] = pyarray(
+                "d", [scalar * y + x for x, y in zip(data[a : a + n], data[b : b + n])]
+            )
+        else:
+            self._data[to_row] = [
+                scalar * y + x for x, y in zip(self._data[to_row], self._data[from_row])
+            ]
 
-    def rref(self):
+    def rref(self, exact=None, pivoting="partial", tolerance=None):
         """
         Puts the matrix in Reduced Row Echelon Form
+
+        :param exact: (bool, Optional)
+            Reduce exactly by fraction-free elimination, leaving Fractions,
+            by default only when every entry is an int or a Fraction
+        :param pivoting: (str, Optional, default="partial")
+            Floating point pivot choice, "partial" takes the largest entry
+            of each column, "complete" the largest entry left anywhere
+        :param tolerance: (float, Optional)
+            Floating point entries with an absolute value at most tolerance
+            count as zero, by default default_tolerance(self.array)
+        :return: (list)
+            The pivot column of each nonzero row, its length is the rank
+        """
+        if exact is None:
+            exact = self._exact()
+        if exact:
+            self.array, pivot_columns = exact_rref(self.array)
+            return pivot_columns
+
+        if self.backend == "numpy":
+            rows = self._data
+        else:
+            rows = [list(row) for row in self._rows()]
+        if tolerance is None:
+            tolerance = default_tolerance(rows)
+        if self.backend == "numpy":
+            self._promote(1.0)
+            rows = self._data
+        pivot_columns = rref_in_place(rows, pivoting, tolerance)
+        if self.backend == "array":
+            self.array = rows
+        else:
+            self._data = rows
+        self._lu = None
+        return pivot_columns
+
+    def rref_form(self, exact=None, pivoting="partial", tolerance=None):
+        """
+        The Reduced Row Echelon Form of self as a new matrix, self is
+        not modified, the parameters are those of rref
+
+        :return: (Matrix)
+        """
+        result = self.copy()
+        result.rref(exact, pivoting, tolerance)
+        return result
+
+    def rank(self, tolerance=None):
         """
-        lead = 0
-        for r in range(self.num_rows):
-            if lead >= self.num_columns:
-                return
-            i = r
-            while self.array[i][lead] == 0:
-                i += 1
-                if i == self.num_rows:
-                    i = r
-                    lead += 1
-                    if self.num_columns == lead:
-                        return
-            self.swap_rows(i, r)
-            lv = self.array[r][lead]
-            self.multiply_row(r, (1 / lv))
-            for i in range(self.num_rows):
-                if i != r:
-                    lv = self.array[i][lead]
-                    self.add_rows(r, i, -lv)
-            lead += 1
-
-    def rank(self):
-        """
-        Calculates the Rank of a matrix without modifying the current matrix
+        Calculates the Rank of a matrix without modifying the current matrix,
+        the elimination works on the LU decomposition's own copy of the entries
 
+        :param tolerance: (float, Optional)
+            Pivots with an absolute value at most tolerance count as zero,
+            by default the cached LU decomposition is used
         :return: (int)
             Rank of self
         """
-        new_matrix = Matrix(self.array)
-        new_matrix.rref()
-        num_non_zero_rows = 0
-        for row in new_matrix.array:
-            is_non_zero = False
-            for val in row:
-                if val != 0:
-                    is_non_zero = True
-            if is_non_zero:
-                num_non_zero_rows += 1
-        return num_non_zero_rows
+        if tolerance is None:
+            return self.lu_decomposition().rank
+        return LUDecomposition(self, tolerance).rank
+
+
+def _as_slice(indices):
+    """
+    The slice selecting the indices of a range, a negative stop
+    would count from the end so it becomes None
+    """
+    stop = indices.stop if indices.stop >= 0 else None
+    return slice(indices.start, stop, indices.step)
+
+
+class _ViewRows(Sequence):
+    """
+    The rows of a MatrixView on the python or array backend, each row
+    is read from the matrix into a new list when it is indexed
+    """
+
+    __slots__ = ("_view",)
+
+    def __init__(self, view):
+        self._view = view
+
+    def __len__(self):
+        return self._view.num_rows
+
+    def __getitem__(self, i):
+        view = self._view
+        data = view.matrix._data
+        n = view.matrix.num_columns
+        flat = view.matrix.backend == "array"
+        if view.transposed:
+            c = view.columns[i]
+            if flat:
+                return data[c::n][_as_slice(view.rows)].tolist()
+            return [data[r][c] for r in view.rows]
+        r = view.rows[i]
+        if flat:
+            return data[r * n : (r + 1) * n][_as_slice(view.columns)].tolist()
+        return data[r][_as_slice(view.columns)]
+
+
+class MatrixView:
+    """
+    Read only view of a block of a Matrix, possibly transposed, that shares
+    the Matrix's storage. Making one copies nothing, the entries are read
+    from the Matrix when they are used, so later changes to its entries
+    show through. Changing the shape of the Matrix invalidates the view.
+
+    Attributes:
+        :matrix: (Matrix)
+            The viewed matrix
+
+        :rows: (range)
+            Rows of matrix in the view
+
+        :columns: (range)
+            Columns of matrix in the view
+
+        :transposed: (bool)
+            True if the view is of the transpose of the block
+
+        :num_rows: (int)
+            Number of rows of the view
+
+        :num_columns: (int)
+            Number of columns of the view
+
+        :backend: (str)
+            The backend of matrix
+    """
+
+    __slots__ = (
+        "matrix",
+        "rows",
+        "columns",
+        "transposed",
+        "backend",
+        "num_rows",
+        "num_columns",
+    )
+
+    def __init__(self, matrix, rows=slice(None), columns=slice(None), transposed=False):
+        """
+        :param matrix: (Matrix)
+            Matrix to view
+        :param rows: (slice or range, Optional, default = every row)
+            Rows of matrix in the view
+        :param columns: (slice or range, Optional, default = every column)
+            Columns of matrix in the view
+        :param transposed: (bool, Optional, default=False)
+            View the transpose of the block
+        """
+        if not isinstance(rows, range):
+            rows = range(matrix.num_rows)[rows]
+        if not isinstance(columns, range):
+            columns = range(matrix.num_columns)[columns]
+        self.matrix = matrix
+        self.rows = rows
+        self.columns = columns
+        self.transposed = transposed
+        self.backend = matrix.backend
+        self.num_rows = len(self.rows)
+        self.num_columns = len(self.columns)
+        if transposed:
+            self.num_rows, self.num_columns = self.num_columns, self.num_rows
+
+    @property
+    def _data(self):
+        """
+        The entries, a read only ndarray view for the NumPy backend and
+        lazily read rows for the others
+        """
+        if self.backend != "numpy":
+            return _ViewRows(self)
+        block = self.matrix._data[_as_slice(self.rows), _as_slice(self.columns)]
+        if self.transposed:
+            block = block.T
+        block.flags.writeable = False
+        return block
+
+    @property
+    def array(self):
+        """
+        The entries as a new list of lists
+        """
+        if self.backend == "numpy":
+            return self._data.tolist()
+        return list(self._data)
+
+    def __getitem__(self, index):
+        """
+        :param index: (tuple)
+            Row and column of an entry of the view
+        :return: (numeric)
+        """
+        r, c = index
+        if self.transposed:
+            r, c = c, r
+        r, c = self.rows[r], self.columns[c]
+        if self.backend == "array":
+            return self.matrix._data[r * self.matrix.num_columns + c]
+        value = self.matrix._data[r][c]
+        return value.item() if hasattr(value, "item") else value
+
+    def view(self, rows=slice(None), columns=slice(None)):
+        """
+        Read only view of a block of self, sharing the matrix's storage
+
+        :param rows: (slice, Optional, default = every row)
+            Rows of self in the view
+        :param columns: (slice, Optional, default = every column)
+            Columns of self in the view
+        :return: (MatrixView)
+        """
+        if self.transposed:
+            rows, columns = columns, rows
+        return MatrixView(
+            self.matrix, self.rows[rows], self.columns[columns], self.transposed
+        )
+
+    @property
+    def T(self):
+        """
+        Read only view of the transpose of self, nothing is copied
+
+        :return: (MatrixView)
+        """
+        return MatrixView(self.matrix, self.rows, self.columns, not self.transposed)
+
+    def copy(self):
+        """
+        The entries of the view as a new matrix with its own storage, a
+        SquareMatrix if the view is square and the matrix is one
+
+        :return: (Matrix)
+        """
+        cls = Matrix
+        if self.num_rows == self.num_columns:
+            cls = self.matrix.__class__
+        if self.backend == "numpy":
+            return cls(np.array(self._data), backend="numpy")
+        return cls(self.array, backend=self.backend)
+
+    def _like(self, array, backend):
+        return Matrix(array, backend=backend)
+
+    def _rows(self):
+        return self._data
+
+    def _ndarray(self):
+        if self.backend == "numpy":
+            return self._data
+        return np.array(self.array)
+
+    def rank(self, tolerance=None):
+        """
+        Calculates the Rank of the view, the elimination works on
+        the LU decomposition's own copy of the entries
+
+        :param tolerance: (float, Optional)
+            As for Matrix.rank
+        :return: (int)
+        """
+        return LUDecomposition(self, tolerance).rank
+
+    __str__ = Matrix.__str__
+    __mul__ = Matrix.__mul__
+    __add__ = Matrix.__add__
+    zero_array = Matrix.zero_array
 
 
 class SquareMatrix(Matrix):
@@ -232,15 +892,19 @@ class SquareMatrix(Matrix):
                 Number of Columns
     """
 
-    def __init__(self, array):
+    __slots__ = ()
+
+    def __init__(self, array, backend=None):
         """
         :param array: (NxN array-like)
-            Array of N, N-length arrays
+            Array of N, N-length arrays, or a square 2D ndarray
+        :param backend: (str, Optional)
+            "python", "numpy" or "array", chosen as for Matrix by default
         """
         for a in array:
             if len(a) != len(array):
                 raise DimensionError("Array is not square, Use Matrix Instead")
-        super().__init__(array)
+        super().__init__(array, backend)
 
     def identity_matrix(self, size=None):
         """
@@ -256,50 +920,116 @@ class SquareMatrix(Matrix):
         a = [[0 for _ in range(size)] for _ in range(size)]
         for i in range(size):
             a[i][i] = 1
-        return SquareMatrix(a)
+        return SquareMatrix(a, backend=self.backend)
+
+    def __mul__(self, other):
+        """
+        Implements the multilation operator, exact products of two square
+        matrices larger than STRASSEN_CROSSOVER use strassen_multiply
+
+        :param other: (Matrix Object)
+            Matrix to multiply by
+        :return: (Matrix Object)
+            Product
+        """
+        if (
+            isinstance(other, SquareMatrix)
+            and self.num_rows == other.num_rows > STRASSEN_CROSSOVER
+            and "numpy" not in (self.backend, other.backend)
+            and self._exact()
+            and other._exact()
+        ):
+            return self.strassen_multiply(other)
+        return super().__mul__(other)
 
-    def inverse(self):
+    def strassen_multiply(self, other, crossover=None):
+        """
+        Product of self and other by recursive Strassen-Winograd multiplication,
+        7 half size products per level instead of 8. It pays for large exact
+        matrices, where every multiplication is a Python int or Fraction one.
+
+        :param other: (SquareMatrix)
+            Matrix of the same size to multiply by
+        :param crossover: (int, Optional, default = STRASSEN_CROSSOVER)
+            Blocks of at most this size are multiplied classically
+        :return: (SquareMatrix)
+            Product
+        """
+        if crossover is None:
+            crossover = STRASSEN_CROSSOVER
+        if crossover < 1:
+            raise ValueError(f"crossover must be at least 1, got {crossover}")
+        if self.num_rows != other.num_rows or other.num_rows != other.num_columns:
+            raise DimensionError(
+                f"Expected a {self.num_rows}x{self.num_rows} matrix, got {other.num_rows}x{other.num_columns}"
+            )
+        product = _strassen_lists(self.array, other.array, crossover)
+        if "numpy" in (self.backend, other.backend):
+            return self._like(product, backend="numpy")
+        return self._like(product, backend=_list_backend(self, other))
+
+    def _exact_solve(self, rows):
+        """
+        Reduces [self | rows] exactly, the right hand block is then
+        the solution of self * x = rows
+        """
+        n = self.num_rows
+        if len(rows) != n:
+            raise DimensionError(f"Expected {n} rows, got {len(rows)}")
+        augmented = [list(a) + list(b) for a, b in zip(self.array, rows)]
+        reduced, pivot_columns = exact_rref(augmented)
+        if pivot_columns[:n] != list(range(n)):
+            raise NoInverseWarning(self.__str__())
+        return [row[n:] for row in reduced]
+
+    def inverse(self, exact=None):
         """
         Calculates then sets self.array as the Inverse of self, if one exists
+
+        :param exact: (bool, Optional)
+            Invert exactly by fraction-free Gauss-Jordan elimination, giving
+            Fractions, by default only when every entry is an int or a Fraction
         """
-        if self.determinate() == 0:
+        self.array = self._inverse_array(exact)
+
+    def inversed(self, exact=None):
+        """
+        The Inverse of self as a new matrix, self is not modified
+
+        :param exact: (bool, Optional)
+            As for inverse
+        :return: (SquareMatrix)
+        """
+        return self.__class__(self._inverse_array(exact), backend=self.backend)
+
+    def _inverse_array(self, exact):
+        if exact is None:
+            exact = self._exact()
+        if exact:
+            return self._exact_solve(self.identity_matrix().array)
+        lu = self.lu_decomposition(exact=False)
+        if lu.rank < self.num_rows:
             raise NoInverseWarning(self.__str__())
+        return lu.inverse()
 
-        # Do ERO on array and identity matrix to get inverse
-        new_array = self.identity_matrix()
-
-        lead = 0
-        for r in range(self.num_rows):
-            if lead >= self.num_columns:
-                return
-            i = r
-            while self.array[i][lead] == 0:
-                i += 1
-                if i == self.num_rows:
-                    i = r
-                    lead += 1
-                    if self.num_columns == lead:
-                        return
-            # Swap Rows
-            self.swap_rows(i, r)
-            new_array.swap_rows(i, r)
-
-            lv = self.array[r][lead]
-
-            # Multiply row
-            self.multiply_row(r, (1 / lv))
-            new_array.multiply_row(r, (1 / lv))
-
-            for i in range(self.num_rows):
-                if i != r:
-
-                    # Add rows
-                    lv = self.array[i][lead]
-                    self.add_rows(r, i, -lv)
-                    new_array.add_rows(r, i, -lv)
-
-            lead += 1
-        self.array = new_array.array
+    def solve(self, b, exact=None):
+        """
+        Solves self * x = b, with the cached LU decomposition unless exact
+
+        :param b: (list)
+            Right hand side, a vector or a list of rows with one column per system
+        :param exact: (bool, Optional)
+            Solve exactly by fraction-free elimination, by default
+            only when every entry of self and b is an int or a Fraction
+        :return: (list)
+            x, in the same shape as b
+        """
+        is_vector = not isinstance(b[0], (list, tuple))
+        rows = [[value] for value in b] if is_vector else b
+        if exact or (exact is None and self._exact() and _is_exact(rows)):
+            x = self._exact_solve(rows)
+            return [row[0] for row in x] if is_vector else x
+        return self.lu_decomposition(exact).solve(b)
 
     def minor(self, row_number, col_number):
         """
@@ -332,27 +1062,16 @@ class SquareMatrix(Matrix):
         if self.num_columns == 2:
             return new_array[0][0]
 
-        return SquareMatrix(new_array)
+        return SquareMatrix(new_array, backend=self.backend)
 
     def determinate(self):
         """
-        Calculates the determinate of self
+        Calculates the determinate of self from the cached LU decomposition
 
         :return: (numeric)
             the determinate
         """
-        r = 1  # "first" index in the matrix
-        total = 0
-        for c in range(1, self.num_columns + 1):  # add one because matrix start at one
-            val = self.array[r - 1][c - 1]
-            sign = pow(-1, (r + c))
-            m = self.minor(r, c)
-            if isinstance(m, SquareMatrix):
-                det_m = m.determinate()
-            else:
-                det_m = m
-            total += val * sign * det_m
-        return total
+        return self.lu_decomposition().determinant()
 
     def trace(self):
         """
@@ -361,7 +1080,11 @@ class SquareMatrix(Matrix):
         :return: (numeric)
             trace of self.array
         """
+        if self.backend == "numpy":
+            return self._data.trace().item()
+        if self.backend == "array":
+            return sum(self._data[:: self.num_columns + 1])
         total = 0
         for i in range(self.num_columns):
-            total += self.array[i][i]
+            total += self._data[i][i]
         return total
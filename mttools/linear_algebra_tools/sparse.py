@@ -0,0 +1,703 @@
+"""
+Compressed sparse row matrices, for systems that are mostly zeros.
+
+Storage, the products, the transpose and every iteration of the solvers
+take time and memory proportional to the number of stored entries, nnz,
+rather than to the number of rows times the number of columns.
+"""
+
+import numbers
+from bisect import bisect_left
+from operator import itemgetter, mul
+
+from mttools.linear_algebra_tools.matrix import Matrix, MatrixView
+from mttools.linear_algebra_tools.vector import Vector
+from mttools.utils.exceptions import DimensionError, NoConvergenceWarning
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Relative residual, |b - Ax| / |b|, the iterative solvers stop at by default
+SOLVER_TOLERANCE = 1e-10
+
+SOLVERS = ("cg", "bicgstab")
+
+# The flat array backend of Matrix has no sparse counterpart
+BACKENDS = ("python", "numpy")
+
+
+def _pick_backend(values, backend):
+    if backend is None:
+        # Opt-in as for Matrix, the dense results share the backend
+        if np is not None and isinstance(values, np.ndarray):
+            return "numpy"
+        return "python"
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+    if backend == "numpy" and np is None:
+        raise ImportError("The numpy backend requires numpy")
+    return backend
+
+
+def _as_list(values):
+    if np is not None and isinstance(values, np.ndarray):
+        return values.tolist()
+    return list(values)
+
+
+def _indptr_from_rows(rows, num_rows):
+    """
+    Row pointers of a CSR matrix whose entries are in the sorted rows
+    """
+    counts = [0] * (num_rows + 1)
+    for i in rows:
+        counts[i + 1] += 1
+    for i in range(num_rows):
+        counts[i + 1] += counts[i]
+    return counts
+
+
+def _segment_sum(values, indptr):
+    """
+    Sums values[indptr[i]:indptr[i + 1]] along the first axis for every row i,
+    empty rows sum to zero
+    """
+    result = np.zeros((len(indptr) - 1,) + values.shape[1:], dtype=values.dtype)
+    nonempty = np.flatnonzero(np.diff(indptr))
+    if nonempty.size:
+        # Empty rows in between add nothing, so each segment ends where it should
+        result[nonempty] = np.add.reduceat(values, indptr[nonempty], axis=0)
+    return result
+
+
+def _compress_numpy(rows, columns, values, shape):
+    """
+    Sorts COO triplets into CSR arrays, summing repeats and dropping zeros
+    """
+    num_rows, num_columns = shape
+    keys = rows * num_columns + columns
+    keys, inverse = np.unique(keys, return_inverse=True)
+    sums = np.zeros(len(keys), dtype=values.dtype)
+    np.add.at(sums, inverse.ravel(), values)
+    keep = sums != 0
+    rows, columns = np.divmod(keys[keep], max(num_columns, 1))
+    indptr = np.zeros(num_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_rows), out=indptr[1:])
+    return sums[keep], columns, indptr
+
+
+class SparseMatrix:
+    """
+    Models a sparse matrix in compressed sparse row (CSR) form
+
+    Row i stores the values data[indptr[i]:indptr[i + 1]] in the columns
+    indices[indptr[i]:indptr[i + 1]], which are in increasing order.
+
+    Attributes:
+        :num_rows: (int)
+            Number of rows
+
+        :num_columns: (int)
+            Number of Columns
+
+        :data: (list or ndarray)
+            The stored values, row by row
+
+        :indices: (list or ndarray)
+            Column of each stored value
+
+        :indptr: (list or ndarray)
+            Where each row starts in data and indices, num_rows + 1 long
+
+        :backend: (str)
+            "python" stores lists, "numpy" stores ndarrays and
+            vectorises the products
+    """
+
+    def __init__(self, data, indices, indptr, shape, backend=None):
+        """
+        :param data: (list or ndarray)
+            The stored values, row by row
+        :param indices: (list or ndarray)
+            Column of each value, increasing within each row
+        :param indptr: (list or ndarray)
+            Start of each row in data, then nnz
+        :param shape: (tuple)
+            (num_rows, num_columns)
+        :param backend: (str, Optional)
+            "python" or "numpy", by default "numpy" for ndarrays
+            and "python" otherwise
+        """
+        num_rows, num_columns = shape
+        if len(indptr) != num_rows + 1 or len(data) != len(indices):
+            raise DimensionError(
+                f"Expected {num_rows + 1} row pointers and one column per value, "
+                f"got {len(indptr)} pointers, {len(indices)} columns "
+                f"and {len(data)} values"
+            )
+        if indptr[0] != 0 or indptr[-1] != len(data):
+            raise DimensionError("Row pointers must run from 0 to the number of values")
+
+        self.backend = _pick_backend(data, backend)
+        self.num_rows = num_rows
+        self.num_columns = num_columns
+        if self.backend == "numpy":
+            self.data = np.asarray(data)
+            self.indices = np.asarray(indices, dtype=np.int64)
+            self.indptr = np.asarray(indptr, dtype=np.int64)
+        else:
+            self.data = _as_list(data)
+            self.indices = _as_list(indices)
+            self.indptr = _as_list(indptr)
+
+    @classmethod
+    def from_coo(cls, rows, columns, values, shape, backend=None):
+        """
+        Builds a matrix from coordinate (COO) triplets, in any order.
+        Repeated entries are summed, the way finite element matrices are
+        assembled, and entries that come to zero are not stored.
+
+        :param rows: (list or ndarray)
+            Row of each entry
+        :param columns: (list or ndarray)
+            Column of each entry
+        :param values: (list or ndarray)
+            Value of each entry
+        :param shape: (tuple)
+            (num_rows, num_columns)
+        :param backend: (str, Optional)
+            "python" or "numpy", chosen as for SparseMatrix by default
+        :return: (SparseMatrix)
+        """
+        if not len(rows) == len(columns) == len(values):
+            raise DimensionError(
+                f"Expected as many rows, columns and values, "
+                f"got {len(rows)}, {len(columns)} and {len(values)}"
+            )
+        num_rows, num_columns = shape
+        for name, index, size in (
+            ("row", rows, num_rows),
+            ("column", columns, num_columns),
+        ):
+            if len(index):
+                if np is not None and isinstance(index, np.ndarray):
+                    low, high = index.min(), index.max()
+                else:
+                    low, high = min(index), max(index)
+                if low < 0 or high >= size:
+                    raise IndexError(f"A {name} index is outside of 0 to {size - 1}")
+
+        backend = _pick_backend(values, backend)
+        if backend == "numpy":
+            data, indices, indptr = _compress_numpy(
+                np.asarray(rows, dtype=np.int64),
+                np.asarray(columns, dtype=np.int64),
+                np.asarray(values),
+                shape,
+            )
+            return cls(data, indices, indptr, shape, backend)
+
+        data, indices, entry_rows = [], [], []
+        last = None
+        for i, j, value in sorted(
+            zip(_as_list(rows), _as_list(columns), _as_list(values)),
+            key=itemgetter(0, 1),
+        ):
+            if (i, j) == last:
+                data[-1] += value
+            else:
+                data.append(value)
+                indices.append(j)
+                entry_rows.append(i)
+                last = (i, j)
+
+        keep = [k for k, value in enumerate(data) if value != 0]
+        if len(keep) != len(data):
+            data = [data[k] for k in keep]
+            indices = [indices[k] for k in keep]
+            entry_rows = [entry_rows[k] for k in keep]
+        return cls(
+            data, indices, _indptr_from_rows(entry_rows, num_rows), shape, backend
+        )
+
+    @classmethod
+    def from_dense(cls, array, backend=None):
+        """
+        Builds a matrix from the nonzero entries of a dense one
+
+        :param array: (Matrix, NxM array-like or ndarray)
+            The dense matrix
+        :param backend: (str, Optional)
+            By default the backend of a Matrix, otherwise chosen as for SparseMatrix
+        :return: (SparseMatrix)
+        """
+        if isinstance(array, Matrix):
+            if backend is None and array.backend in BACKENDS:
+                backend = array.backend
+            array = array._rows()
+        if np is not None and isinstance(array, np.ndarray):
+            rows, columns = np.nonzero(array)
+            return cls.from_coo(
+                rows, columns, array[rows, columns], array.shape, backend
+            )
+
+        rows, columns, values = [], [], []
+        for i, row in enumerate(array):
+            for j, value in enumerate(row):
+                if value != 0:
+                    rows.append(i)
+                    columns.append(j)
+                    values.append(value)
+        shape = (len(array), len(array[0]) if array else 0)
+        return cls.from_coo(rows, columns, values, shape, backend)
+
+    @property
+    def shape(self):
+        return self.num_rows, self.num_columns
+
+    @property
+    def nnz(self):
+        """
+        Number of stored entries
+        """
+        return len(self.data)
+
+    def _row_ids(self):
+        """
+        Row of each stored entry, as an ndarray
+        """
+        return np.repeat(np.arange(self.num_rows), np.diff(self.indptr))
+
+    def to_coo(self):
+        """
+        :return: (tuple)
+            rows, columns and values of the stored entries, in row order
+        """
+        if self.backend == "numpy":
+            return self._row_ids(), self.indices.copy(), self.data.copy()
+        rows = []
+        for i in range(self.num_rows):
+            rows.extend([i] * (self.indptr[i + 1] - self.indptr[i]))
+        return rows, list(self.indices), list(self.data)
+
+    def to_dense(self):
+        """
+        :return: (list)
+            Every entry, as a list of lists
+        """
+        if self.backend == "numpy":
+            dense = np.zeros(self.shape, dtype=self.data.dtype)
+            dense[self._row_ids(), self.indices] = self.data
+            return dense.tolist()
+        dense = [[0] * self.num_columns for _ in range(self.num_rows)]
+        for i, row in enumerate(dense):
+            for k in range(self.indptr[i], self.indptr[i + 1]):
+                row[self.indices[k]] = self.data[k]
+        return dense
+
+    def to_matrix(self):
+        """
+        :return: (Matrix)
+            The dense matrix, on the same backend
+        """
+        return Matrix(self.to_dense(), backend=self.backend)
+
+    def with_backend(self, backend):
+        """
+        :param backend: (str)
+            "python" or "numpy"
+        :return: (SparseMatrix)
+            self if it already uses backend, otherwise a copy that does
+        """
+        if backend == self.backend:
+            return self
+        return SparseMatrix(self.data, self.indices, self.indptr, self.shape, backend)
+
+    def __getitem__(self, key):
+        i, j = key
+        if not (0 <= i < self.num_rows and 0 <= j < self.num_columns):
+            raise IndexError(
+                f"{key} is outside of a {self.num_rows}x{self.num_columns} matrix"
+            )
+        start, end = self.indptr[i], self.indptr[i + 1]
+        k = bisect_left(self.indices, j, start, end)
+        if k < end and self.indices[k] == j:
+            return self.data[k].item() if self.backend == "numpy" else self.data[k]
+        return 0
+
+    def __repr__(self):
+        return f"SparseMatrix(shape={self.shape}, nnz={self.nnz}, backend={self.backend!r})"
+
+    def __str__(self):
+        result = ""
+        for i in range(self.num_rows):
+            for k in range(self.indptr[i], self.indptr[i + 1]):
+                result += f"({i}, {self.indices[k]}): {self.data[k]}\n"
+        return result
+
+    def _transposed(self):
+        """
+        The transpose as a new matrix, by a counting sort of the entries
+        on their column
+        """
+        if self.backend == "numpy":
+            order = np.argsort(self.indices, kind="stable")
+            indptr = np.zeros(self.num_columns + 1, dtype=np.int64)
+            np.cumsum(
+                np.bincount(self.indices, minlength=self.num_columns), out=indptr[1:]
+            )
+            data, indices = self.data[order], self._row_ids()[order]
+        else:
+            indptr = _indptr_from_rows(self.indices, self.num_columns)
+            nxt = indptr[:-1]
+            data, indices = [0] * self.nnz, [0] * self.nnz
+            # Rows are visited in order, so each column comes out sorted
+            for i in range(self.num_rows):
+                for k in range(self.indptr[i], self.indptr[i + 1]):
+                    position = nxt[self.indices[k]]
+                    nxt[self.indices[k]] += 1
+                    data[position] = self.data[k]
+                    indices[position] = i
+        shape = (self.num_columns, self.num_rows)
+        return SparseMatrix(data, indices, indptr, shape, self.backend)
+
+    def transpose(self):
+        """
+        Transposes matrix
+        """
+        transposed = self._transposed()
+        self.data, self.indices, self.indptr = (
+            transposed.data,
+            transposed.indices,
+            transposed.indptr,
+        )
+        self.num_rows, self.num_columns = self.num_columns, self.num_rows
+
+    def _matvec(self, x):
+        """
+        self * x for a list or an ndarray x of the right length, giving
+        the same type back
+        """
+        if self.backend == "numpy":
+            return _segment_sum(self.data * np.asarray(x)[self.indices], self.indptr)
+        data, indices, indptr = self.data, self.indices, self.indptr
+        get = x.__getitem__
+        return [
+            sum(map(mul, data[start:end], map(get, indices[start:end])))
+            for start, end in zip(indptr, indptr[1:])
+        ]
+
+    def matvec(self, x):
+        """
+        Product with a vector
+
+        :param x: (list, tuple, ndarray or Vector)
+            Vector of num_columns entries
+        :return: (list, ndarray or Vector)
+            self * x, an ndarray or Vector if x is one, otherwise a list
+        """
+        coords = x.coords if isinstance(x, Vector) else x
+        if len(coords) != self.num_columns:
+            raise DimensionError(
+                f"Expected a vector of length {self.num_columns}, got {len(coords)}"
+            )
+        result = self._matvec(coords)
+        if isinstance(x, Vector):
+            return Vector(_as_list(result))
+        if np is not None and isinstance(x, np.ndarray):
+            return np.asarray(result)
+        return _as_list(result)
+
+    def _multiply_dense(self, other):
+        """
+        self * other for a dense matrix or view other, in O(nnz * other.num_columns).
+        The product is on the backend of other, so its rows stay editable
+        unless other is on the NumPy backend
+        """
+        if "numpy" in (self.backend, other.backend):
+            dense = other._ndarray()
+            a = self.with_backend("numpy")
+            product = _segment_sum(a.data[:, None] * dense[a.indices], a.indptr)
+            return Matrix(product, backend=other.backend)
+
+        product = []
+        rows = other._rows()
+        for i in range(self.num_rows):
+            total = [0] * other.num_columns
+            for k in range(self.indptr[i], self.indptr[i + 1]):
+                value = self.data[k]
+                total = [t + value * y for t, y in zip(total, rows[self.indices[k]])]
+            product.append(total)
+        return Matrix(
+            product, backend="array" if other.backend == "array" else "python"
+        )
+
+    def _multiply_sparse(self, other):
+        """
+        self * other for a sparse other, by Gustavson's row by row method,
+        in time proportional to the number of products of stored entries
+        """
+        shape = (self.num_rows, other.num_columns)
+        if "numpy" in (self.backend, other.backend):
+            a, b = self.with_backend("numpy"), other.with_backend("numpy")
+            starts = b.indptr[a.indices]
+            counts = b.indptr[a.indices + 1] - starts
+            # Position in b of every product, row k of b for each entry (i, k) of a
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+            positions = offsets + np.arange(counts.sum())
+            data, indices, indptr = _compress_numpy(
+                np.repeat(a._row_ids(), counts),
+                b.indices[positions],
+                np.repeat(a.data, counts) * b.data[positions],
+                shape,
+            )
+            return SparseMatrix(data, indices, indptr, shape, "numpy")
+
+        data, indices, indptr = [], [], [0]
+        for i in range(self.num_rows):
+            row = {}
+            for k in range(self.indptr[i], self.indptr[i + 1]):
+                value, r = self.data[k], self.indices[k]
+                for m in range(other.indptr[r], other.indptr[r + 1]):
+                    j = other.indices[m]
+                    row[j] = row.get(j, 0) + value * other.data[m]
+            for j in sorted(row):
+                if row[j] != 0:
+                    indices.append(j)
+                    data.append(row[j])
+            indptr.append(len(data))
+        return SparseMatrix(data, indices, indptr, shape, "python")
+
+    def _scale(self, scalar):
+        if not scalar:
+            return SparseMatrix(
+                [], [], [0] * (self.num_rows + 1), self.shape, self.backend
+            )
+        if self.backend == "numpy":
+            data = self.data * scalar
+        else:
+            data = [scalar * value for value in self.data]
+        return SparseMatrix(data, self.indices, self.indptr, self.shape, self.backend)
+
+    def __mul__(self, other):
+        """
+        Implements the multiplication operator
+
+        :param other: (SparseMatrix, Matrix, MatrixView, Vector or Numeric)
+            Matrix, vector or scalar to multiply by
+        :return: (SparseMatrix, Matrix or Vector)
+            A SparseMatrix for sparse and scalar products, a Matrix for
+            dense ones and a Vector for vectors
+        """
+        if isinstance(other, Vector):
+            return self.matvec(other)
+        if isinstance(other, (SparseMatrix, Matrix, MatrixView)):
+            if self.num_columns != other.num_rows:
+                raise DimensionError(
+                    f"The number of columns in the LH matrix must equal the number of rows in the RH (got {self.num_columns} and {other.num_rows})"
+                )
+            if isinstance(other, SparseMatrix):
+                return self._multiply_sparse(other)
+            return self._multiply_dense(other)
+        if isinstance(other, numbers.Number):
+            return self._scale(other)
+        return NotImplemented
+
+    def __rmul__(self, other):
+        """
+        Implements other * self for a dense Matrix, a MatrixView or a scalar other
+        """
+        if isinstance(other, (Matrix, MatrixView)):
+            if other.num_columns != self.num_rows:
+                raise DimensionError(
+                    f"The number of columns in the LH matrix must equal the number of rows in the RH (got {other.num_columns} and {self.num_rows})"
+                )
+            # (AB)^T = B^T A^T, and B^T is sparse
+            other_t = other.T.copy()
+            product = self._transposed()._multiply_dense(other_t)
+            product.transpose()
+            return product
+        return self.__mul__(other)
+
+    def solve(
+        self, b, method="cg", x0=None, tolerance=SOLVER_TOLERANCE, max_iterations=None
+    ):
+        """
+        Solves self * x = b iteratively
+
+        :param b: (list, tuple, ndarray or Vector)
+            Right hand side
+        :param method: (str, Optional, default="cg")
+            "cg" for the conjugate gradient method, which needs a symmetric
+            positive definite matrix, like the stiffness matrix of a mesh,
+            or "bicgstab" for any nonsingular one
+        :param x0: (list, Optional)
+            Starting guess, zero by default
+        :param tolerance: (float, Optional, default=SOLVER_TOLERANCE)
+            Stop once |b - self * x| <= tolerance * |b|
+        :param max_iterations: (int, Optional)
+            Raise NoConvergenceWarning after this many, 10 * num_rows by default
+        :return: (list, ndarray or Vector)
+            x, of the same type as b
+        """
+        if method not in SOLVERS:
+            raise ValueError(f"method must be one of {SOLVERS}, got {method!r}")
+        solver = conjugate_gradient if method == "cg" else bicgstab
+        return solver(self, b, x0, tolerance, max_iterations)
+
+
+def _vector_ops(backend):
+    """
+    dot(u, v) and axpy(a, u, v) = a * u + v for the vectors of a backend
+    """
+    if backend == "numpy":
+        return (lambda u, v: float(u @ v)), (lambda a, u, v: a * u + v)
+
+    def axpy(a, u, v):
+        return [a * x + y for x, y in zip(u, v)]
+
+    return (lambda u, v: sum(map(mul, u, v))), axpy
+
+
+def _start(matrix, b, x0, max_iterations):
+    """
+    Checks the system, and returns b and x0 as vectors of the backend
+    """
+    if matrix.num_rows != matrix.num_columns:
+        raise DimensionError(
+            f"Expected a square matrix, got {matrix.num_rows}x{matrix.num_columns}"
+        )
+    coords = b.coords if isinstance(b, Vector) else b
+    if len(coords) != matrix.num_rows:
+        raise DimensionError(f"Expected {matrix.num_rows} values, got {len(coords)}")
+    if matrix.backend == "numpy":
+        b = np.asarray(coords, dtype=float)
+        x = np.zeros(len(b)) if x0 is None else np.asarray(x0, dtype=float)
+    else:
+        b = [float(value) for value in coords]
+        x = [0.0] * len(b) if x0 is None else [float(value) for value in x0]
+    if max_iterations is None:
+        max_iterations = 10 * matrix.num_rows
+    return b, x, max_iterations
+
+
+def _finish(x, b):
+    """
+    x, as the same type of vector as b
+    """
+    if isinstance(b, Vector):
+        return Vector(_as_list(x))
+    if np is not None and isinstance(b, np.ndarray):
+        return np.asarray(x)
+    return _as_list(x)
+
+
+def conjugate_gradient(
+    matrix, b, x0=None, tolerance=SOLVER_TOLERANCE, max_iterations=None
+):
+    """
+    Solves Ax = b by the conjugate gradient method
+
+    Each iteration is one product with A and a few vector updates, O(nnz)
+    for a SparseMatrix, and no entry of A is ever filled in
+
+    params:
+        matrix: A symmetric positive definite SparseMatrix
+        b: Right hand side, a list, tuple, ndarray or Vector
+        x0: Starting guess, zero by default
+        tolerance: Stop once |b - Ax| <= tolerance * |b|
+        max_iterations: Raise NoConvergenceWarning after this many,
+            10 * num_rows by default
+
+    return:
+        x, of the same type as b
+
+    Example:
+
+        >>> a = SparseMatrix.from_dense([[4, 1], [1, 3]])
+        >>> [round(v, 6) for v in conjugate_gradient(a, [1, 2])]
+        [0.090909, 0.636364]
+    """
+    target, x, max_iterations = _start(matrix, b, x0, max_iterations)
+    dot, axpy = _vector_ops(matrix.backend)
+    threshold = tolerance * tolerance * dot(target, target)
+
+    r = axpy(-1, matrix._matvec(x), target)
+    p = r
+    rr = dot(r, r)
+    for _ in range(max_iterations):
+        if rr <= threshold:
+            return _finish(x, b)
+        ap = matrix._matvec(p)
+        curvature = dot(p, ap)
+        if curvature <= 0:
+            raise NoConvergenceWarning("The matrix is not positive definite")
+        alpha = rr / curvature
+        x = axpy(alpha, p, x)
+        r = axpy(-alpha, ap, r)
+        rr, previous = dot(r, r), rr
+        p = axpy(rr / previous, p, r)
+    if rr <= threshold:
+        return _finish(x, b)
+    raise NoConvergenceWarning(
+        f"Conjugate gradient did not converge in {max_iterations} iterations"
+    )
+
+
+def bicgstab(matrix, b, x0=None, tolerance=SOLVER_TOLERANCE, max_iterations=None):
+    """
+    Solves Ax = b by the stabilised biconjugate gradient method (BiCGSTAB)
+
+    Unlike the conjugate gradient method A need not be symmetric, each
+    iteration costs two products with A
+
+    params:
+        matrix: A nonsingular SparseMatrix
+        b: Right hand side, a list, tuple, ndarray or Vector
+        x0: Starting guess, zero by default
+        tolerance: Stop once |b - Ax| <= tolerance * |b|
+        max_iterations: Raise NoConvergenceWarning after this many,
+            10 * num_rows by default
+
+    return:
+        x, of the same type as b
+
+    Example:
+
+        >>> a = SparseMatrix.from_dense([[4, 1], [2, 3]])
+        >>> [round(v, 6) for v in bicgstab(a, [1, 2])]
+        [0.1, 0.6]
+    """
+    target, x, max_iterations = _start(matrix, b, x0, max_iterations)
+    dot, axpy = _vector_ops(matrix.backend)
+    threshold = tolerance * tolerance * dot(target, target)
+
+    r = axpy(-1, matrix._matvec(x), target)
+    r_hat = r
+    if dot(r, r) <= threshold:
+        return _finish(x, b)
+    rho = alpha = omega = 1.0
+    v = p = np.zeros(len(r)) if matrix.backend == "numpy" else [0.0] * len(r)
+    for _ in range(max_iterations):
+        rho, previous = dot(r_hat, r), rho
+        if rho == 0:
+            break
+        p = axpy(rho / previous * alpha / omega, axpy(-omega, v, p), r)
+        v = matrix._matvec(p)
+        alpha = rho / dot(r_hat, v)
+        s = axpy(-alpha, v, r)
+        if dot(s, s) <= threshold:
+            return _finish(axpy(alpha, p, x), b)
+        t = matrix._matvec(s)
+        omega = dot(t, s) / dot(t, t)
+        x = axpy(omega, s, axpy(alpha, p, x))
+        r = axpy(-omega, t, s)
+        if dot(r, r) <= threshold:
+            return _finish(x, b)
+        if omega == 0:
+            break
+    raise NoConvergenceWarning(
+        f"BiCGSTAB did not converge in {max_iterations} iterations"
+    )
@@ -0,0 +1,337 @@
+"""
+Sieves for multiplicative arithmetic functions over whole ranges:
+Euler's totient, the Möbius function and the divisor sums sigma_k.
+"""
+from array import array
+from math import isqrt
+from typing import Iterator, List, Optional, Tuple, Union
+
+from mttools.number_theory_tools.Primes import SEGMENT_SIZE, sieve_of_eratosthenes
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+Buffer = Union[array, "np.ndarray"]
+
+
+def _use_numpy(use_numpy: Optional[bool]) -> bool:
+    """
+    Resolves the use_numpy argument, None means use NumPy if it is installed
+    """
+    if use_numpy is None:
+        return np is not None
+    if use_numpy and np is None:
+        raise ImportError("use_numpy=True requires numpy")
+    return use_numpy
+
+
+def _base_primes(n: int) -> List[int]:
+    """
+    Primes up to sqrt(n - 1), enough to factor everything below n
+    """
+    return sieve_of_eratosthenes(isqrt(max(n - 1, 0)) + 1)
+
+
+def _prime_power_value(kind: str, p: int, e: int, k: int) -> int:
+    """
+    f(p^e) for the arithmetic function kind
+    """
+    if kind == "totient":
+        return (p - 1) * p ** (e - 1)
+    if kind == "mobius":
+        return -1 if e == 1 else 0
+    if k == 0:
+        return e + 1
+    pk = p ** k
+    return (pk ** (e + 1) - 1) // (pk - 1)
+
+
+def _linear_totient(n: int) -> array:
+    """
+    Linear sieve for phi, each composite is visited once through its smallest prime
+    """
+    phi = array("q", [0]) * n
+    if n > 1:
+        phi[1] = 1
+    primes: List[int] = []
+    for i in range(2, n):
+        if not phi[i]:
+            phi[i] = i - 1
+            primes.append(i)
+        phi_i = phi[i]
+        for p in primes:
+            ip = i * p
+            if ip >= n:
+                break
+            if i % p == 0:
+                phi[ip] = phi_i * p
+                break
+            phi[ip] = phi_i * (p - 1)
+    return phi
+
+
+def _linear_mobius(n: int) -> array:
+    """
+    Linear sieve for mu, composite[i] marks the numbers already reached
+    """
+    mu = array("q", [0]) * n
+    composite = bytearray(n)
+    if n > 1:
+        mu[1] = 1
+    primes: List[int] = []
+    for i in range(2, n):
+        if not composite[i]:
+            mu[i] = -1
+            primes.append(i)
+        mu_i = mu[i]
+        for p in primes:
+            ip = i * p
+            if ip >= n:
+                break
+            composite[ip] = 1
+            if i % p == 0:
+                break
+            mu[ip] = -mu_i
+    return mu
+
+
+def _linear_sigma(n: int, k: int) -> array:
+    """
+    Linear sieve for sigma_k, power_sum[i] is 1 + p^k + ... + p^(ke)
+    for the largest power p^e of the smallest prime p dividing i
+    """
+    sigma = array("q", [0]) * n
+    power_sum = array("q", [0]) * n
+    if n > 1:
+        sigma[1] = power_sum[1] = 1
+    primes: List[int] = []
+    powers: List[int] = []
+    for i in range(2, n):
+        if not sigma[i]:
+            sigma[i] = power_sum[i] = 1 + i ** k
+            primes.append(i)
+            powers.append(i ** k)
+        sigma_i = sigma[i]
+        for p, pk in zip(primes, powers):
+            ip = i * p
+            if ip >= n:
+                break
+            if i % p == 0:
+                power_sum[ip] = power_sum[i] * pk + 1
+                sigma[ip] = sigma_i // power_sum[i] * power_sum[ip]
+                break
+            power_sum[ip] = 1 + pk
+            sigma[ip] = sigma_i * (1 + pk)
+    return sigma
+
+
+def _python_block(kind: str, lo: int, hi: int, base_primes: List[int], k: int) -> array:
+    """
+    Values of the multiplicative function kind for n in [lo, hi), in pure Python
+    """
+    size = hi - lo
+    rem = array("q", range(lo, hi))
+    values = array("q", [1]) * size
+    sums = array("q", [1]) * size if kind == "sigma" else None
+    skip = 1 if lo == 0 else 0  # 0 is divisible by every p
+
+    for p in base_primes:
+        pk = p ** k
+        q = p
+        while q < hi:
+            indices = range((-lo) % q or skip * q, size, q)
+            if not indices:
+                break
+            for i in indices:
+                rem[i] //= p
+            if kind == "totient":
+                factor = p - 1 if q == p else p
+                for i in indices:
+                    values[i] *= factor
+            elif kind == "mobius":
+                factor = -1 if q == p else 0
+                for i in indices:
+                    values[i] *= factor
+            elif q == p:
+                for i in indices:
+                    sums[i] = 1 + pk
+            else:
+                for i in indices:
+                    sums[i] = sums[i] * pk + 1
+            q *= p
+        if kind == "sigma":
+            for i in range((-lo) % p or skip * p, size, p):
+                values[i] *= sums[i]
+
+    # What is left is 1 or a single prime larger than sqrt(hi)
+    for i in range(skip, size):
+        if rem[i] > 1:
+            values[i] *= _prime_power_value(kind, rem[i], 1, k)
+    if skip and size:
+        values[0] = 0
+    return values
+
+
+def _numpy_block(kind: str, lo: int, hi: int, base_primes: List[int], k: int):
+    """
+    Values of the multiplicative function kind for n in [lo, hi), with NumPy.
+        Each prime power p^j is applied as one strided slice over its multiples.
+    """
+    size = hi - lo
+    rem = np.arange(lo, hi, dtype=np.int64)
+    values = np.ones(size, dtype=np.int64)
+    sums = np.ones(size, dtype=np.int64) if kind == "sigma" else None
+    skip = 1 if lo == 0 else 0
+
+    for p in base_primes:
+        pk = p ** k
+        q = p
+        while q < hi:
+            first = (-lo) % q or skip * q
+            if first >= size:
+                break
+            multiples = slice(first, size, q)
+            rem[multiples] //= p
+            if kind == "totient":
+                values[multiples] *= p - 1 if q == p else p
+            elif kind == "mobius":
+                values[multiples] *= -1 if q == p else 0
+            elif q == p:
+                sums[multiples] = 1 + pk
+            else:
+                # 1 + p^k + ... + p^(kj) from the sum for p^(j - 1)
+                sums[multiples] = sums[multiples] * pk + 1
+            q *= p
+        if kind == "sigma":
+            multiples = slice((-lo) % p or skip * p, size, p)
+            values[multiples] *= sums[multiples]
+
+    large = rem > 1
+    if kind == "totient":
+        values[large] *= rem[large] - 1
+    elif kind == "mobius":
+        values[large] *= -1
+    else:
+        values[large] *= 1 + rem[large] ** k
+    if skip and size:
+        values[0] = 0
+    return values
+
+
+def _arithmetic_range(kind: str, n: int, k: int, use_numpy: Optional[bool]) -> Buffer:
+    n = max(n, 0)
+    if _use_numpy(use_numpy):
+        return _numpy_block(kind, 0, n, _base_primes(n), k)
+    if kind == "totient":
+        return _linear_totient(n)
+    if kind == "mobius":
+        return _linear_mobius(n)
+    return _linear_sigma(n, k)
+
+
+def _arithmetic_segments(
+    kind: str, n: int, k: int, segment_size: int, use_numpy: Optional[bool]
+) -> Iterator[Tuple[int, Buffer]]:
+    block = _numpy_block if _use_numpy(use_numpy) else _python_block
+    base_primes = _base_primes(n)
+    for lo in range(0, n, segment_size):
+        yield lo, block(kind, lo, min(lo + segment_size, n), base_primes, k)
+
+
+def totient_range(n: int, use_numpy: Optional[bool] = None) -> Buffer:
+    """
+    Sieves Euler's totient phi(i) for every 0 <= i < n, with phi(0) = 0
+
+    params:
+        n: Exclusive upper bound
+        use_numpy (optional): Return a NumPy int64 array instead of an
+            array('q'), default is to use NumPy if it is installed
+
+    Example:
+
+        >>> list(totient_range(10, use_numpy=False))
+        [0, 1, 1, 2, 2, 4, 2, 6, 4, 6]
+    """
+    return _arithmetic_range("totient", n, 0, use_numpy)
+
+
+def mobius_range(n: int, use_numpy: Optional[bool] = None) -> Buffer:
+    """
+    Sieves the Möbius function mu(i) for every 0 <= i < n, with mu(0) = 0
+
+    params:
+        n: Exclusive upper bound
+        use_numpy (optional): Return a NumPy int64 array instead of an
+            array('q'), default is to use NumPy if it is installed
+
+    Example:
+
+        >>> list(mobius_range(10, use_numpy=False))
+        [0, 1, -1, -1, 0, -1, 1, -1, 0, 0]
+    """
+    return _arithmetic_range("mobius", n, 0, use_numpy)
+
+
+def sigma_range(n: int, k: int = 1, use_numpy: Optional[bool] = None) -> Buffer:
+    """
+    Sieves the divisor function sigma_k(i), the sum of d^k over the divisors
+    of i, for every 0 <= i < n, with sigma_k(0) = 0.
+        Values must fit in a signed 64-bit integer.
+
+    params:
+        n: Exclusive upper bound
+        k (optional): Power of the divisors, default 1
+        use_numpy (optional): Return a NumPy int64 array instead of an
+            array('q'), default is to use NumPy if it is installed
+
+    Example:
+
+        >>> list(sigma_range(10, use_numpy=False))
+        [0, 1, 3, 4, 7, 6, 12, 8, 15, 13]
+    """
+    if k < 0:
+        raise ValueError(f"k must not be negative, got {k}")
+    return _arithmetic_range("sigma", n, k, use_numpy)
+
+
+def totient_segments(
+    n: int, segment_size: int = SEGMENT_SIZE, use_numpy: Optional[bool] = None
+) -> Iterator[Tuple[int, Buffer]]:
+    """
+    Segmented totient_range, for n too large to hold in memory at once
+
+    return:
+        Generator of (start, values) where values[i] is phi(start + i)
+    """
+    return _arithmetic_segments("totient", n, 0, segment_size, use_numpy)
+
+
+def mobius_segments(
+    n: int, segment_size: int = SEGMENT_SIZE, use_numpy: Optional[bool] = None
+) -> Iterator[Tuple[int, Buffer]]:
+    """
+    Segmented mobius_range, for n too large to hold in memory at once
+
+    return:
+        Generator of (start, values) where values[i] is mu(start + i)
+    """
+    return _arithmetic_segments("mobius", n, 0, segment_size, use_numpy)
+
+
+def sigma_segments(
+    n: int,
+    k: int = 1,
+    segment_size: int = SEGMENT_SIZE,
+    use_numpy: Optional[bool] = None,
+) -> Iterator[Tuple[int, Buffer]]:
+    """
+    Segmented sigma_range, for n too large to hold in memory at once
+
+    return:
+        Generator of (start, values) where values[i] is sigma_k(start + i)
+    """
+    if k < 0:
+        raise ValueError(f"k must not be negative, got {k}")
+    return _arithmetic_segments("sigma", n, k, segment_size, use_numpy)
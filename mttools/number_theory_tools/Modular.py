@@ -0,0 +1,283 @@
+"""
+Tools for arithmetic modulo a fixed number,
+and for solving systems of congruences.
+"""
+from typing import Callable, Iterable, List, Literal, Optional, Sequence, Tuple
+
+from mttools.number_theory_tools import gcd, mod_inverse
+
+Reduction = Literal["builtin", "barrett", "montgomery"]
+
+
+class ModContext:
+    """
+    Precomputed state for repeated arithmetic modulo a fixed m.
+
+    Attributes:
+        :modulus: (int)
+            The modulus m
+
+        :reduction: (str)
+            How products are reduced: "builtin" uses %, "barrett" uses
+            Barrett reduction, "montgomery" uses Montgomery multiplication
+    """
+
+    def __init__(self, m: int, reduction: Optional[Reduction] = None):
+        """
+        :param m: (int)
+            Modulus, at least 2
+        :param reduction: (str, Optional)
+            "builtin", "barrett" or "montgomery" (odd m only), by default
+            "builtin", which benchmarks/bench_modular.py finds fastest for
+            pow at every size it measures
+        """
+        if m < 2:
+            raise ValueError(f"m must be at least 2, got {m}")
+        if reduction is None:
+            reduction = "builtin"
+        if reduction not in ("builtin", "barrett", "montgomery"):
+            raise ValueError(f"Unknown reduction {reduction!r}")
+        if reduction == "montgomery" and not m & 1:
+            raise ValueError("Montgomery reduction requires an odd modulus")
+
+        self.modulus = m
+        self.reduction = reduction
+
+        self._bits = m.bit_length()
+        # Barrett: mu = floor(4^k / m)
+        self._mu = (1 << (2 * self._bits)) // m
+        # Montgomery: R = 2^k, m' = -m^-1 mod R
+        self._r_mask = (1 << self._bits) - 1
+        if m & 1:
+            self._m_prime = -mod_inverse(m, 1 << self._bits) & self._r_mask
+            self._r2 = (1 << (2 * self._bits)) % m
+
+    def reduce(self, x: int) -> int:
+        """
+        :param x: (int)
+            Any integer, fastest for 0 <= x < m^2
+        :return: (int)
+            x mod m
+        """
+        if self.reduction == "builtin" or x < 0 or x >> (2 * self._bits):
+            return x % self.modulus
+        # Barrett reduction, also used for single products in Montgomery mode
+        k = self._bits
+        r = x - (((x >> (k - 1)) * self._mu) >> (k + 1)) * self.modulus
+        while r >= self.modulus:
+            r -= self.modulus
+        return r
+
+    def mul(self, a: int, b: int) -> int:
+        """
+        :return: (int)
+            a * b mod m, for residues 0 <= a, b < m
+        """
+        return self.reduce(a * b)
+
+    def inverse(self, a: int) -> int:
+        """
+        :return: (int)
+            x where a * x = 1 mod m
+        """
+        return mod_inverse(a, self.modulus)
+
+    def to_montgomery(self, a: int) -> int:
+        """
+        :return: (int)
+            a * R mod m, the Montgomery form of a, where R = 2^bit_length(m)
+        """
+        self._require_odd()
+        return self._redc(a % self.modulus * self._r2)
+
+    def from_montgomery(self, a: int) -> int:
+        """
+        :return: (int)
+            The residue whose Montgomery form is a
+        """
+        self._require_odd()
+        return self._redc(a)
+
+    def montgomery_mul(self, a: int, b: int) -> int:
+        """
+        Multiplies two numbers in Montgomery form without any division
+
+        :return: (int)
+            a * b / R mod m, the Montgomery form of the product
+        """
+        self._require_odd()
+        return self._redc(a * b)
+
+    def pow(self, base: int, exp: int) -> int:
+        """
+        :return: (int)
+            base^exp mod m, a negative exp uses the inverse of base
+        """
+        m = self.modulus
+        if exp < 0:
+            base, exp = self.inverse(base), -exp
+        if self.reduction == "builtin":
+            return pow(base, exp, m)
+        if self.reduction == "barrett":
+            return _windowed_pow(base % m, exp, self.mul, 1)
+        result = _windowed_pow(
+            self.to_montgomery(base % m),
+            exp,
+            self.montgomery_mul,
+            self.to_montgomery(1),
+        )
+        return self.from_montgomery(result)
+
+    def pow_many(self, bases: Iterable[int], exp: int) -> List[int]:
+        """
+        :return: (list)
+            base^exp mod m for each base, in order
+        """
+        return [self.pow(base, exp) for base in bases]
+
+    def fixed_base(self, base: int, max_bits: int, window: int = 4) -> "FixedBaseTable":
+        """
+        Precomputes powers of base so that later exponents need no squarings
+
+        :param base: (int)
+            The fixed base
+        :param max_bits: (int)
+            Exponents must be less than 2^max_bits
+        :param window: (int, Optional, default=4)
+            Bits of the exponent handled by each table lookup
+        :return: (FixedBaseTable)
+        """
+        return FixedBaseTable(self, base, max_bits, window)
+
+    def _redc(self, t: int) -> int:
+        """
+        Montgomery reduction, t / R mod m for 0 <= t < m * R
+        """
+        u = ((t & self._r_mask) * self._m_prime) & self._r_mask
+        t = (t + u * self.modulus) >> self._bits
+        return t - self.modulus if t >= self.modulus else t
+
+    def _require_odd(self) -> None:
+        if not self.modulus & 1:
+            raise ValueError("Montgomery form requires an odd modulus")
+
+
+class FixedBaseTable:
+    """
+    Table of base^(d * 2^(window * i)) mod m, so base^exp is a product
+    of one entry per window of exp, with no squarings.
+
+    Attributes:
+        :context: (ModContext)
+            Context the table belongs to
+
+        :base: (int)
+            The fixed base
+
+        :max_bits: (int)
+            Exponents must be less than 2^max_bits
+
+        :window: (int)
+            Bits of the exponent handled by each table lookup
+    """
+
+    def __init__(self, context: ModContext, base: int, max_bits: int, window: int = 4):
+        if max_bits < 1 or window < 1:
+            raise ValueError("max_bits and window must be positive")
+        self.context = context
+        self.base = base % context.modulus
+        self.max_bits = max_bits
+        self.window = window
+
+        mul = context.mul
+        one = 1
+        self._table: List[List[int]] = []
+        power = self.base
+        for _ in range(-(-max_bits // window)):
+            row = [one, power]
+            for _ in range(2, 1 << window):
+                row.append(mul(row[-1], power))
+            self._table.append(row)
+            power = mul(row[-1], power)
+
+    def pow(self, exp: int) -> int:
+        """
+        :param exp: (int)
+            Exponent, 0 <= exp < 2^max_bits
+        :return: (int)
+            base^exp mod m
+        """
+        if not 0 <= exp < 1 << self.max_bits:
+            raise ValueError(f"exp must be between 0 and 2^{self.max_bits} - 1")
+        mul = self.context.mul
+        mask = (1 << self.window) - 1
+        result = 1
+        for row in self._table:
+            if exp & mask:
+                result = mul(result, row[exp & mask])
+            exp >>= self.window
+            if not exp:
+                break
+        return result
+
+    def pow_many(self, exps: Iterable[int]) -> List[int]:
+        """
+        :return: (list)
+            base^exp mod m for each exp, in order
+        """
+        return [self.pow(exp) for exp in exps]
+
+
+def _windowed_pow(
+    base: int, exp: int, mul: Callable[[int, int], int], one: int, window: int = 5
+) -> int:
+    """
+    Left-to-right fixed window exponentiation with the given multiplication
+    """
+    if exp == 0:
+        return one
+    table = [one, base]
+    for _ in range(2, 1 << window):
+        table.append(mul(table[-1], base))
+
+    result = one
+    mask = (1 << window) - 1
+    for shift in range((exp.bit_length() - 1) // window * window, -1, -window):
+        for _ in range(window):
+            result = mul(result, result)
+        digit = (exp >> shift) & mask
+        if digit:
+            result = mul(result, table[digit])
+    return result
+
+
+def crt(residues: Sequence[int], moduli: Sequence[int]) -> Tuple[int, int]:
+    """
+    Solves the system x = residues[i] (mod moduli[i]) with the
+    Chinese Remainder Theorem. The moduli do not need to be coprime.
+
+    return: (x, M) where M is the lcm of the moduli and 0 <= x < M,
+        every solution is x + k * M
+
+    Example:
+
+        >>> crt([2, 3, 2], [3, 5, 7])
+        (23, 105)
+    """
+    if len(residues) != len(moduli):
+        raise ValueError("residues and moduli must have the same length")
+
+    x, modulus = 0, 1
+    for r, m in zip(residues, moduli):
+        if m < 1:
+            raise ValueError(f"moduli must be positive, got {m}")
+        g = gcd(modulus, m)
+        if (r - x) % g:
+            raise ValueError("The system of congruences has no solution")
+        # x + modulus * t = r (mod m)  =>  t = (r - x) / g * (modulus / g)^-1
+        step = m // g
+        t = (r - x) // g * mod_inverse(modulus // g, step) % step
+        x += modulus * t
+        modulus *= step
+        x %= modulus
+    return x, modulus
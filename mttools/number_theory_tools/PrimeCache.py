@@ -0,0 +1,411 @@
+"""
+A prime table that is sieved once, saved to a cache directory, and
+memory-mapped by every later process that needs it.
+
+The file holds one bit per odd number, plus a rank table with the number
+of primes before every block of bits, so counting and indexing primes
+never has to scan the table.
+"""
+
+import mmap
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_right
+from typing import List, Optional, Union, cast
+
+from mttools.Constants import Prime
+from mttools.number_theory_tools.Primes import (
+    SEGMENT_SIZE,
+    _odd_segments,
+    _read_table_file,
+    is_prime,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Environment variable naming the cache directory
+CACHE_DIR_ENV = "MTTOOLS_CACHE_DIR"
+
+# Smallest table built by the module level functions
+MIN_TABLE_LIMIT = 1 << 20
+
+# Largest table built by the module level functions, a 64 MiB bitmap
+MAX_TABLE_LIMIT = 1 << 30
+
+# Bytes of the bitmap covered by each rank table entry
+_RANK_BLOCK = 64
+
+# _BIT_OFFSETS[b] is the odd offsets 2j + 1 of the bits j set in byte b
+_BIT_OFFSETS = [tuple(2 * j + 1 for j in range(8) if b >> j & 1) for b in range(256)]
+
+_cache_dir: Optional[str] = None
+
+
+def set_cache_dir(path: Optional[str]) -> None:
+    """
+    Sets the directory prime tables are saved to and loaded from,
+    None restores the default.
+
+    params:
+        path: Directory to use, created when the first table is saved
+    """
+    global _cache_dir
+    _cache_dir = path
+    _TABLE_CACHE.clear()
+
+
+def get_cache_dir() -> str:
+    """
+    Returns the directory prime tables are saved to and loaded from.
+
+    In order of preference this is the directory given to set_cache_dir,
+    the MTTOOLS_CACHE_DIR environment variable, or mttools under the
+    user's cache directory.
+    """
+    if _cache_dir is not None:
+        return _cache_dir
+    if os.environ.get(CACHE_DIR_ENV):
+        return os.environ[CACHE_DIR_ENV]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "mttools")
+
+
+def _pack_flags(flags: bytes) -> bytes:
+    """
+    Packs one flag per byte into one flag per bit, least significant bit first.
+
+    int.from_bytes turns each of the 8 interleaved slices into an integer with
+    one flag per byte, shifting and or-ing them packs 8 flags into every byte.
+    """
+    flags = bytes(flags) + bytes(-len(flags) % 8)
+    packed = 0
+    for j in range(8):
+        packed |= int.from_bytes(flags[j::8], "little") << j
+    return packed.to_bytes(len(flags) // 8, "little")
+
+
+def _popcount(data: bytes) -> int:
+    return bin(int.from_bytes(data, "little")).count("1")
+
+
+class PrimeTable:
+    """
+    Bit-packed table of the primes below a limit.
+
+    Attributes:
+        :limit: (int)
+            Exclusive upper bound of the table
+
+        :count: (int)
+            Number of primes below limit
+
+        :bits: (bytes or memoryview)
+            Bit i is set if 2i + 1 is prime
+
+        :ranks: (array or memoryview of unsigned long longs)
+            ranks[b] is the number of odd primes before byte b * 64 of bits
+    """
+
+    _MAGIC = b"MTPRM001"
+    _HEADER = struct.Struct("<8sQQ")
+
+    def __init__(
+        self,
+        limit: int,
+        bits: Union[bytes, memoryview, None] = None,
+        ranks: Union[array, memoryview, None] = None,
+    ):
+        """
+        :param limit: (int)
+            Exclusive upper bound
+        :param bits: (bytes or memoryview, Optional)
+            A prebuilt bitmap, used by PrimeTable.load
+        :param ranks: (array or memoryview, Optional)
+            A prebuilt rank table, used by PrimeTable.load
+        """
+        if limit < 0:
+            raise ValueError(f"limit must not be negative, got {limit}")
+        self.limit = limit
+        self._mmap: Optional[mmap.mmap] = None
+
+        if bits is None:
+            # SEGMENT_SIZE is a multiple of 8, so only the last block is padded
+            packed = bytearray()
+            for start, flags in _odd_segments(1, limit, SEGMENT_SIZE):
+                if start == 1:
+                    flags[0] = 0  # 1 is not prime
+                packed += _pack_flags(flags)
+            bits = bytes(packed + bytes(-len(packed) % _RANK_BLOCK))
+        if ranks is None:
+            ranks = array("Q", [0])
+            for start in range(0, len(bits), _RANK_BLOCK):
+                ranks.append(ranks[-1] + _popcount(bits[start : start + _RANK_BLOCK]))
+        self.bits = bits
+        self.ranks = ranks
+        self.count = ranks[-1] + int(limit > 2)
+
+    def _check(self, n: int) -> None:
+        if not 0 <= n < self.limit:
+            raise ValueError(f"n must be between 0 and {self.limit - 1}, got {n}")
+
+    def _rank(self, i: int) -> int:
+        """
+        Number of set bits before bit i
+        """
+        block, offset = divmod(i >> 3, _RANK_BLOCK)
+        start = block * _RANK_BLOCK
+        rank = self.ranks[block] + _popcount(self.bits[start : start + offset])
+        if i & 7:
+            rank += bin(self.bits[i >> 3] & ((1 << (i & 7)) - 1)).count("1")
+        return rank
+
+    def is_prime(self, n: int) -> bool:
+        """
+        :param n: (int)
+            Number to look up, where 0 <= n < limit
+        :return: (bool)
+            True if n is prime
+        """
+        self._check(n)
+        if not n & 1:
+            return n == 2
+        return bool(self.bits[n >> 4] >> ((n >> 1) & 7) & 1)
+
+    def pi(self, x: int) -> int:
+        """
+        :param x: (int)
+            Inclusive upper bound, where x < limit
+        :return: (int)
+            Number of primes p where p <= x
+        """
+        if x < 2:
+            return 0
+        self._check(x)
+        return 1 + self._rank((x + 1) // 2)
+
+    def prime_index(self, p: Prime) -> int:
+        """
+        :param p: (int)
+            A prime below limit
+        :return: (int)
+            The position of p in the primes, counting from prime_index(2) = 1
+        """
+        if not self.is_prime(p):
+            raise ValueError(f"{p} is not prime")
+        return self.pi(p)
+
+    def nth_prime(self, n: int) -> Prime:
+        """
+        Binary searches the rank table for the block holding the nth prime
+
+        :param n: (int)
+            Index of the prime, where 1 <= n <= count
+        :return: (int)
+            The nth prime, counting from nth_prime(1) = 2
+        """
+        if not 1 <= n <= self.count:
+            raise ValueError(f"n must be between 1 and {self.count}, got {n}")
+        if n == 1:
+            return 2
+        # The (n - 1)th odd prime is in the last block with fewer before it
+        block = bisect_right(self.ranks, n - 2) - 1
+        remaining = n - 1 - self.ranks[block]
+        start = block * _RANK_BLOCK
+        for i in range(start, start + _RANK_BLOCK):
+            offsets = _BIT_OFFSETS[self.bits[i]]
+            if remaining <= len(offsets):
+                return 16 * i + offsets[remaining - 1]
+            remaining -= len(offsets)
+        raise AssertionError("rank table does not match the bitmap")
+
+    def primes_upto(self, n: int) -> List[Prime]:
+        """
+        :param n: (int)
+            Inclusive upper bound, where n < limit
+        :return: (list)
+            The primes p where p <= n, in order
+        """
+        if n < 2:
+            return []
+        self._check(n)
+        bits = self.bits[: (n + 16) >> 4]
+        primes = [2]
+        if np is not None:
+            flags = np.unpackbits(np.frombuffer(bits, np.uint8), bitorder="little")
+            primes.extend((2 * np.flatnonzero(flags) + 1).tolist())
+        else:
+            primes.extend(
+                16 * i + offset
+                for i, byte in enumerate(bits)
+                if byte
+                for offset in _BIT_OFFSETS[byte]
+            )
+        del primes[bisect_right(primes, n) :]
+        return primes
+
+    def save(self, path: str) -> None:
+        """
+        Atomically writes the table to disk, so concurrent readers never see
+        a partial file
+
+        :param path: (str)
+            File to write
+        """
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(self._HEADER.pack(self._MAGIC, self.limit, len(self.bits)))
+            file.write(self.bits)
+            file.write(memoryview(self.ranks).cast("B"))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str, memory_map: bool = True) -> "PrimeTable":
+        """
+        Reads a table written by save
+
+        :param path: (str)
+            File to read
+        :param memory_map: (bool, Optional, default=True)
+            Map the file read-only instead of copying it into memory,
+            so several processes can share one copy of the table
+        :return: (PrimeTable)
+        """
+        data, (limit, size), body = _read_table_file(
+            path,
+            cls._HEADER,
+            cls._MAGIC,
+            "prime table",
+            lambda limit, size: size + (size // _RANK_BLOCK + 1) * array("Q").itemsize,
+            memory_map,
+        )
+        bits, rank_bytes = body[:size], body[size:]
+        if memory_map:
+            result = cls(limit, bits, rank_bytes.cast("Q"))
+            result._mmap = cast(mmap.mmap, data)
+        else:
+            ranks = array("Q")
+            ranks.frombytes(rank_bytes)
+            result = cls(limit, bytes(bits), ranks)
+        return result
+
+
+# Table shared between the module level lookups
+_TABLE_CACHE: List[PrimeTable] = []
+
+
+_TABLE_NAME = re.compile(r"primes-(\d+)\.bin")
+
+
+def _table_path(limit: int) -> str:
+    return os.path.join(get_cache_dir(), f"primes-{limit}.bin")
+
+
+def _saved_limit(limit: int) -> Optional[int]:
+    """
+    Smallest limit of a table saved in the cache directory that reaches limit
+    """
+    try:
+        names = os.listdir(get_cache_dir())
+    except FileNotFoundError:
+        return None
+    saved = [int(m.group(1)) for m in map(_TABLE_NAME.fullmatch, names) if m]
+    return min((s for s in saved if s >= limit), default=None)
+
+
+def prime_table(limit: int) -> PrimeTable:
+    """
+    Returns a table of at least the primes below limit.
+
+    The smallest table saved in the cache directory that reaches limit is
+    loaded, otherwise one is sieved and saved for later processes.
+    Limits are rounded up to a power of two, so few sizes are ever saved.
+
+    params:
+        limit: Exclusive upper bound the table must reach,
+            at most MAX_TABLE_LIMIT
+
+    return:
+        A memory-mapped PrimeTable
+    """
+    if _TABLE_CACHE and _TABLE_CACHE[0].limit >= limit:
+        return _TABLE_CACHE[0]
+    if limit > MAX_TABLE_LIMIT:
+        raise ValueError(f"limit must be at most {MAX_TABLE_LIMIT}, got {limit}")
+
+    saved = _saved_limit(limit)
+    if saved is not None:
+        limit = saved
+    else:
+        limit = max(1 << (limit - 1).bit_length(), MIN_TABLE_LIMIT)
+    path = _table_path(limit)
+    if saved is None:
+        os.makedirs(get_cache_dir(), exist_ok=True)
+        PrimeTable(limit).save(path)
+    _TABLE_CACHE[:] = [PrimeTable.load(path)]
+    return _TABLE_CACHE[0]
+
+
+def is_prime_cached(n: int) -> bool:
+    """
+    Primality test by lookup in the cached prime table, numbers the
+    table cannot reach fall back to Primes.is_prime
+
+    params:
+        n: Number to test, where n >= 0
+
+    return:
+        True if n is prime
+
+    Example:
+
+        >>> is_prime_cached(1000003)
+        True
+    """
+    if n >= MAX_TABLE_LIMIT:
+        return is_prime(n)
+    return prime_table(n + 1).is_prime(n)
+
+
+def primes_upto(n: int) -> List[Prime]:
+    """
+    Lists the primes less than or equal to n from the cached prime table
+
+    params:
+        n: Inclusive upper bound, less than MAX_TABLE_LIMIT
+
+    return:
+        Ordered list of the primes p where p <= n
+
+    Example:
+
+        >>> primes_upto(20)
+        [2, 3, 5, 7, 11, 13, 17, 19]
+    """
+    if n < 2:
+        return []
+    return prime_table(n + 1).primes_upto(n)
+
+
+def prime_index(p: Prime) -> int:
+    """
+    Position of p in the primes, from the rank table of the cached prime table
+
+    params:
+        p: A prime less than MAX_TABLE_LIMIT
+
+    return:
+        k where p is the kth prime, counting from prime_index(2) = 1
+
+    Example:
+
+        >>> prime_index(7919)
+        1000
+    """
+    return prime_table(p + 1).prime_index(p)
@@ -1,8 +1,40 @@
+import json
+import mmap
+import os
 import random
+import struct
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, islice
+from math import gcd, isqrt, log
 
-from typing import List, Dict, Optional, cast
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Dict,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 from mttools.Constants import Prime
 
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Number of odd numbers sieved per block, sized so the flags fit in L2 cache
+SEGMENT_SIZE = 1 << 18
+
 
 def fermat_primality_test(p: int, num_trials: int) -> bool:
     """
@@ -60,7 +92,7 @@ def fermat_primality_test(p: int, num_trials: int) -> bool:
     # Fermat's Little Theorem
     for _ in range(num_trials):
         base = random.randint(2, p - 1)
-        if pow(base, p - 1) % p != 1:
+        if pow(base, p - 1, p) != 1:
             return False
     return True
 
@@ -69,6 +101,9 @@ def division_primality_test(p: int) -> bool:
     """
     Standard division test for primality
 
+    Divides by the cached primes up to sqrt(p),
+    past the cache it continues with a 2·3·5 wheel.
+
     params:
         p: Number that is being tested for primality
     """
@@ -76,14 +111,402 @@ def division_primality_test(p: int) -> bool:
     if p < 2:
         return False
 
-    # Checks divisors from 3 to p/2
-    for divisor in range(2, int(p / 2) + 1):
+    root = isqrt(p)
+    for divisor in _division_primes(root + 1):
+        if divisor > root:
+            return True
+        if p % divisor == 0:
+            return False
+
+    for divisor in _wheel_30(_division_bound):
+        if divisor > root:
+            return True
         if p % divisor == 0:
             return False
+    return True
+
+
+def are_prime(nums: Iterable[int]) -> List[bool]:
+    """
+    Division test for primality over a batch of numbers.
+
+    When the numbers are dense enough the batch is answered from a single
+    sieve, otherwise the prime cache is grown once for the largest number.
+
+    params:
+        nums: Numbers that are being tested for primality
+
+    return:
+        List of booleans, True where the number is prime
+
+    Example:
+
+        >>> are_prime([1, 2, 9, 97])
+        [False, True, False, True]
+    """
+    nums = list(nums)
+    if not nums:
+        return []
+    largest = max(nums)
+
+    if largest < 64 * len(nums):
+        flags = _odd_sieve(largest + 1)
+        return [n == 2 or (n > 2 and n & 1 == 1 and flags[n // 2] == 1) for n in nums]
 
+    _division_primes(isqrt(max(largest, 0)) + 1)
+    return [division_primality_test(n) for n in nums]
+
+
+# Deterministic Miller-Rabin witnesses, (exclusive upper bound, bases)
+# Jaeschke (1993) and Sorenson & Webster (2015)
+_MILLER_RABIN_BASES = (
+    (2047, (2,)),
+    (1373653, (2, 3)),
+    (25326001, (2, 3, 5)),
+    (3215031751, (2, 3, 5, 7)),
+    (2152302898747, (2, 3, 5, 7, 11)),
+    (3474749660383, (2, 3, 5, 7, 11, 13)),
+    (341550071728321, (2, 3, 5, 7, 11, 13, 17)),
+    (3825123056546413051, (2, 3, 5, 7, 11, 13, 17, 19, 23)),
+    (318665857834031151167461, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+    (3317044064679887385961981, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)),
+)
+
+
+def _miller_rabin(n: int, bases) -> bool:
+    """
+    Strong probable-prime test of odd n > 2 to each of the given bases.
+    """
+    d = n - 1
+    s = 0
+    while not d & 1:
+        d >>= 1
+        s += 1
+    for base in bases:
+        x = pow(base, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
     return True
 
 
+def _jacobi(a: int, n: int) -> int:
+    """
+    Jacobi symbol (a/n) for odd n > 0.
+    """
+    a %= n
+    result = 1
+    while a:
+        while not a & 1:
+            a >>= 1
+            if n & 7 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a & 3 == 3 and n & 3 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def _strong_lucas_test(n: int) -> bool:
+    """
+    Strong Lucas probable-prime test of odd n > 2,
+    using Selfridge's method A to choose the parameters.
+    """
+    root = isqrt(n)
+    if root * root == n:
+        return False
+
+    # Find the first D in 5, -7, 9, -11, ... with (D/n) == -1
+    D = 5
+    while True:
+        j = _jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P = 1
+    Q = (1 - D) // 4
+
+    d = n + 1
+    s = 0
+    while not d & 1:
+        d >>= 1
+        s += 1
+
+    # Compute U_d, V_d and Q^d mod n, from the most significant bit down
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U = U * V % n
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == "1":
+            U, V = P * U + V, D * U + P * V
+            if U & 1:
+                U += n
+            if V & 1:
+                V += n
+            U = (U >> 1) % n
+            V = (V >> 1) % n
+            Qk = Qk * Q % n
+
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        if V == 0:
+            return True
+        Qk = Qk * Qk % n
+    return False
+
+
+def _probable_prime(n: int) -> bool:
+    """
+    Primality test for odd n > 2 with no small factors.
+        Deterministic Miller-Rabin below 3.3 * 10^24, Baillie-PSW above.
+    """
+    for bound, bases in _MILLER_RABIN_BASES:
+        if n < bound:
+            return _miller_rabin(n, bases)
+    return _miller_rabin(n, (2,)) and _strong_lucas_test(n)
+
+
+def is_prime(n: int) -> bool:
+    """
+    Tests n for primality.
+
+    Small factors are removed with trial division, then n is checked with a
+    deterministic Miller-Rabin test for n < 3.3 * 10^24 and with the
+    Baillie-PSW test above that. Baillie-PSW has no known counterexamples.
+
+    params:
+        n: Number that is being tested for primality
+
+    return:
+        True if n is prime, False if it is not
+
+    Example:
+
+        >>> is_prime(2 ** 127 - 1)
+        True
+        >>> is_prime(561)
+        False
+    """
+    if n < 2:
+        return False
+    for p in _SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    if n < _SMALL_PRIMES[-1] ** 2:
+        return True
+    return _probable_prime(n)
+
+
+def _odd_sieve(limit: int) -> bytearray:
+    """
+    Sieves the odd numbers below limit
+
+    params:
+        limit: Exclusive upper bound
+
+    return:
+        flags where flags[i] is 1 if 2i + 1 is prime
+    """
+    size = max(limit, 0) // 2
+    flags = bytearray([1]) * size
+    if size:
+        flags[0] = 0  # 1 is not prime
+    for i in range(1, (isqrt(max(limit - 1, 0)) + 1) // 2):
+        if flags[i]:
+            p = 2 * i + 1
+            start = p * p // 2
+            flags[start::p] = bytes(len(range(start, size, p)))
+    return flags
+
+
+def _small_primes(limit: int) -> List[Prime]:
+    """
+    Ordered list of all primes less than limit, sieved in a single block.
+    Used for the base primes of the segmented sieve.
+    """
+    if limit <= 2:
+        return []
+    return [2] + [2 * i + 1 for i in compress(range(limit // 2), _odd_sieve(limit))]
+
+
+# Trial divisors used to pre-filter the probable-prime tests
+_SMALL_PRIMES = tuple(_small_primes(256))
+
+
+# Upper bound on the primes cached for division_primality_test
+_DIVISION_CACHE_LIMIT = 1 << 20
+
+# Cached primes below _division_bound, grown on demand
+_DIVISION_PRIMES: List[Prime] = []
+_division_bound = 2
+
+# Residues coprime to 2·3·5
+_WHEEL_30 = (1, 7, 11, 13, 17, 19, 23, 29)
+
+
+def _division_primes(bound: int) -> List[Prime]:
+    """
+    Grows the cache of division primes to cover bound, up to _DIVISION_CACHE_LIMIT
+
+    return:
+        The cached primes, all primes less than _division_bound
+    """
+    global _division_bound
+    if bound > _division_bound and _division_bound < _DIVISION_CACHE_LIMIT:
+        # At least double so a run of growing inputs does not re-sieve every call
+        new_bound = min(max(bound, 2 * _division_bound), _DIVISION_CACHE_LIMIT)
+        _DIVISION_PRIMES.extend(primes_between(_division_bound, new_bound))
+        _division_bound = new_bound
+    return _DIVISION_PRIMES
+
+
+def _wheel_30(start: int) -> Iterator[int]:
+    """
+    Generates the numbers >= start that are coprime to 30
+    """
+    base = start - start % 30
+    while True:
+        for residue in _WHEEL_30:
+            if base + residue >= start:
+                yield base + residue
+        base += 30
+
+
+def _odd_segments(
+    lo: int, hi: int, segment_size: int = SEGMENT_SIZE
+) -> Iterator[Tuple[int, bytearray]]:
+    """
+    Sieves the odd numbers in [lo, hi) one block at a time.
+
+    params:
+        lo: Inclusive lower bound, must be odd and at least 3
+        hi: Exclusive upper bound
+        segment_size: Number of odd numbers per block
+
+    return:
+        (start, flags) pairs, where flags[i] is 1 if start + 2i is prime
+    """
+    base_primes = _small_primes(isqrt(max(hi - 1, 0)) + 1)[1:]
+    start = lo
+    while start < hi:
+        end = min(start + 2 * segment_size, hi)
+        size = (end - start + 1) // 2
+        flags = bytearray([1]) * size
+        for p in base_primes:
+            first = p * p
+            if first >= end:
+                break
+            if first < start:
+                # First odd multiple of p that is in the block
+                first = start + (-start) % p
+                if not first & 1:
+                    first += p
+            index = (first - start) // 2
+            flags[index::p] = bytes(len(range(index, size, p)))
+        yield start, flags
+        start = end
+
+
+def primes_between(
+    lo: int, hi: int, segment_size: int = SEGMENT_SIZE
+) -> Iterator[Prime]:
+    """
+    Lazily generates the primes p where lo <= p < hi.
+
+    The range is sieved one block at a time, so memory stays at
+    O(sqrt(hi) + segment_size) no matter how wide the range is.
+
+    params:
+        lo: Inclusive lower bound
+        hi: Exclusive upper bound
+        segment_size (optional): Number of odd numbers sieved per block
+
+    return:
+        Generator of the primes in [lo, hi), in order
+
+    Example:
+
+        >>> list(primes_between(100, 130))
+        [101, 103, 107, 109, 113, 127]
+    """
+    if lo <= 2 < hi:
+        yield 2
+    start = max(lo, 3) | 1
+    for seg_start, flags in _odd_segments(start, hi, segment_size):
+        yield from compress(range(seg_start, seg_start + 2 * len(flags), 2), flags)
+
+
+def iter_primes(
+    start: int = 2, stop: Optional[int] = None, segment_size: int = SEGMENT_SIZE
+) -> Iterator[Prime]:
+    """
+    Lazily generates the primes p where start <= p < stop.
+
+    If stop is None the generator never ends. The sieve window doubles as it
+    advances, so the base primes are only recomputed O(log(p)) times and memory
+    stays at O(sqrt(p) + segment_size), where p is the last prime yielded.
+
+    params:
+        start (optional): Inclusive lower bound, default 2
+        stop (optional): Exclusive upper bound, default unbounded
+        segment_size (optional): Number of odd numbers sieved per block
+
+    return:
+        Generator of primes, in order
+
+    Example:
+
+        >>> primes = iter_primes(10 ** 12)
+        >>> next(primes)
+        1000000000039
+    """
+    if stop is not None:
+        yield from primes_between(start, stop, segment_size)
+        return
+
+    lo = max(start, 2)
+    while True:
+        hi = max(2 * lo, lo + 2 * segment_size)
+        yield from primes_between(lo, hi, segment_size)
+        lo = hi
+
+
+def segmented_sieve(
+    upper_bound: int, segment_size: int = SEGMENT_SIZE
+) -> Iterator[Prime]:
+    """
+    Lazily generates the primes less than upper_bound.
+
+    Only odd numbers are stored, and the sieve is processed in blocks of
+    segment_size flags, so memory stays at O(sqrt(upper_bound) + segment_size)
+    regardless of upper_bound.
+
+    params:
+        upper_bound: Exclusive upper bound
+        segment_size (optional): Number of odd numbers sieved per block
+
+    return:
+        Generator of the primes less than upper_bound, in order
+
+    Example:
+
+        >>> list(segmented_sieve(20))
+        [2, 3, 5, 7, 11, 13, 17, 19]
+    """
+    return primes_between(2, upper_bound, segment_size)
+
+
 def sieve_of_eratosthenes(upper_bound: int) -> List[Prime]:
     """
     Creates a Sieve of Eratosthenes from 0 to upper_bound
@@ -94,30 +517,329 @@ def sieve_of_eratosthenes(upper_bound: int) -> List[Prime]:
     return:
         Ordered list of all primes less than upper_bound
     """
+    return list(segmented_sieve(upper_bound))
 
-    # Assume everything is prime, except 0 and 1
-    sieve = [True for _ in range(upper_bound)]
-    sieve[0] = False
-    sieve[1] = False
 
-    # Iterate over sieve
-    for i, is_prime in enumerate(sieve):
-        try:
-            if is_prime:
-                j = i * i
-            while j < upper_bound:
-                sieve[j] = False
-                j += i
-        except UnboundLocalError:
-            pass
+# Below this prime_pi counts with the sieve directly
+_PRIME_PI_SIEVE_LIMIT = 1 << 16
 
-    return sorted([i for i, is_prime in enumerate(sieve) if is_prime])
+# Above this the int64 tables of the NumPy prime_pi could overflow
+_PRIME_PI_NUMPY_LIMIT = 1 << 62
+
+
+def _lucy_python(x: int) -> int:
+    """
+    Lucy_Hedgehog's prime count in pure Python.
+
+    small[v] holds the count for v and large[i] the count for x // i,
+    for each prime p up to sqrt(x) every entry at least p^2 drops the
+    numbers whose smallest prime factor is p.
+    """
+    r = isqrt(x)
+    small = [v - 1 for v in range(r + 1)]
+    large = [0] + [x // i - 1 for i in range(1, r + 1)]
+    small[0] = 0
+    for p in _small_primes(r + 1):
+        count = small[p - 1]
+        p2 = p * p
+        split = min(r // p, x // p2)
+        for i in range(1, split + 1):
+            large[i] -= large[i * p] - count
+        for i in range(split + 1, min(r, x // p2) + 1):
+            large[i] -= small[x // (i * p)] - count
+        for v in range(r, p2 - 1, -1):
+            small[v] -= small[v // p] - count
+    return large[1]
+
+
+def _lucy_numpy(x: int) -> int:
+    """
+    Lucy_Hedgehog's prime count with each prime's updates done as array operations
+    """
+    r = isqrt(x)
+    index = np.arange(r + 1, dtype=np.int64)
+    small = index - 1
+    small[0] = 0
+    quotients = np.zeros(r + 1, dtype=np.int64)
+    quotients[1:] = x // index[1:]
+    large = quotients - 1
+    for p in _small_primes(r + 1):
+        count = small[p - 1]
+        p2 = p * p
+        stop = min(r, x // p2)
+        split = min(r // p, stop)
+        # The right-hand sides are copies, so they read the counts from before p
+        large[1 : split + 1] -= large[p : split * p + 1 : p] - count
+        if stop > split:
+            large[split + 1 : stop + 1] -= (
+                small[quotients[split + 1 : stop + 1] // p] - count
+            )
+        if p2 <= r:
+            # v // p for v = p^2, ..., r runs through p, ..., r // p, p times each
+            small[p2:] -= np.repeat(small[p : r // p + 1], p)[: r - p2 + 1] - count
+    return int(large[1])
+
+
+def prime_pi(x: int) -> int:
+    """
+    Counts the primes less than or equal to x, without listing them.
+
+    Uses Lucy_Hedgehog's algorithm, O(x^(3/4)) time and O(sqrt(x)) memory,
+    vectorised with NumPy when it is installed.
+
+    params:
+        x: Inclusive upper bound
+
+    return:
+        Number of primes p where p <= x
+
+    Example:
+
+        >>> prime_pi(10 ** 9)
+        50847534
+    """
+    if x < _PRIME_PI_SIEVE_LIMIT:
+        return sum(1 for _ in primes_between(2, max(x + 1, 2)))
+    if np is not None and x < _PRIME_PI_NUMPY_LIMIT:
+        return _lucy_numpy(x)
+    return _lucy_python(x)
+
+
+def nth_prime(n: int) -> Prime:
+    """
+    Returns the nth prime, counting from nth_prime(1) = 2
+
+    An estimate of the nth prime is counted with prime_pi, then
+    the primes between the estimate and the answer are sieved.
+
+    params:
+        n: Index of the prime, at least 1
+
+    return:
+        The nth prime
+
+    Example:
+
+        >>> nth_prime(10 ** 6)
+        15485863
+    """
+    if n < 1:
+        raise ValueError(f"n must be at least 1, got {n}")
+    if n < 6:
+        return (2, 3, 5, 7, 11)[n - 1]
+
+    # Cipolla's asymptotic expansion, within a fraction of a percent
+    ln_n = log(n)
+    ln_ln_n = log(ln_n)
+    x = int(n * (ln_n + ln_ln_n - 1 + (ln_ln_n - 2) / ln_n))
+    count = prime_pi(x)
+
+    if count < n:
+        return next(islice(iter_primes(x + 1), n - count - 1, None))
+
+    # Walk down from x, the answer is the (count - n + 1)th prime <= x
+    remaining = count - n + 1
+    width = max(SEGMENT_SIZE, int(remaining * log(x)))
+    hi = x + 1
+    while True:
+        lo = max(hi - width, 2)
+        primes = list(primes_between(lo, hi))
+        if remaining <= len(primes):
+            return primes[-remaining]
+        remaining -= len(primes)
+        hi = lo
+
+
+# Trial divisors used before the sub-exponential factoring methods
+_TRIAL_PRIMES = tuple(_small_primes(1 << 12))
+
+# Largest cycle length Pollard-Brent tries before handing over to ECM
+_RHO_MAX_ITERATIONS = 1 << 18
+
+# (B1, number of curves) for each ECM round, tuned for 15 to 35 digit factors
+_ECM_SCHEDULE = (
+    (2000, 25),
+    (11000, 90),
+    (50000, 300),
+    (250000, 700),
+    (1000000, 1800),
+)
+
+# Half the step between stage 2 blocks of ECM
+_ECM_STAGE_2_STEP = 100
+
+
+def _pollard_brent(n: int, c: int, max_iterations: int) -> Optional[int]:
+    """
+    Brent's variant of Pollard's rho, iterating x -> x^2 + c mod n.
+
+    return:
+        A non-trivial factor of n, or None if none was found
+    """
+    y, r, q, g = 2, 1, 1, 1
+    batch = 128
+    x = ys = y
+    while g == 1:
+        x = y
+        for _ in range(r):
+            y = (y * y + c) % n
+        k = 0
+        while k < r and g == 1:
+            ys = y
+            for _ in range(min(batch, r - k)):
+                y = (y * y + c) % n
+                q = q * abs(x - y) % n
+            g = gcd(q, n)
+            k += batch
+        r <<= 1
+        if r > max_iterations:
+            return None
+
+    if g == n:
+        # The batched product overshot, step back through the last batch
+        g = 1
+        while g == 1:
+            ys = (ys * ys + c) % n
+            g = gcd(abs(x - ys), n)
+    return g if g != n else None
+
+
+def _ecm_double(x: int, z: int, a24: int, n: int) -> Tuple[int, int]:
+    """
+    Doubles the point (x : z) on a Montgomery curve, a24 = (A + 2) / 4
+    """
+    t1 = (x + z) * (x + z) % n
+    t2 = (x - z) * (x - z) % n
+    t3 = t1 - t2
+    return t1 * t2 % n, t3 * (t2 + a24 * t3) % n
+
+
+def _ecm_add(
+    xp: int, zp: int, xq: int, zq: int, xd: int, zd: int, n: int
+) -> Tuple[int, int]:
+    """
+    Adds P and Q on a Montgomery curve, given their difference (xd : zd)
+    """
+    u = (xp - zp) * (xq + zq)
+    v = (xp + zp) * (xq - zq)
+    return zd * (u + v) * (u + v) % n, xd * (u - v) * (u - v) % n
+
+
+def _ecm_multiply(k: int, x: int, z: int, a24: int, n: int) -> Tuple[int, int]:
+    """
+    Montgomery ladder, computes k * (x : z)
+    """
+    x0, z0 = x, z
+    x1, z1 = _ecm_double(x, z, a24, n)
+    for bit in bin(k)[3:]:
+        if bit == "1":
+            x0, z0 = _ecm_add(x1, z1, x0, z0, x, z, n)
+            x1, z1 = _ecm_double(x1, z1, a24, n)
+        else:
+            x1, z1 = _ecm_add(x1, z1, x0, z0, x, z, n)
+            x0, z0 = _ecm_double(x0, z0, a24, n)
+    return x0, z0
+
+
+def _ecm(n: int, b1: int, curves: int, rng: random.Random) -> Optional[int]:
+    """
+    Lenstra's elliptic curve method with Suyama's parametrization,
+    using a stage 2 bound of 100 * b1.
+
+    return:
+        A non-trivial factor of n, or None if none was found
+    """
+    step = _ECM_STAGE_2_STEP
+    b2 = 100 * b1
+    primes = _small_primes(b2 + 1)
+
+    # Stage 1 multiplies by every prime power up to b1
+    k = 1
+    for p in primes:
+        if p > b1:
+            break
+        pe = p
+        while pe * p <= b1:
+            pe *= p
+        k *= pe
+
+    b = b1 - 1 if b1 % 2 == 0 else b1
+    first_stage_2 = next(i for i, p in enumerate(primes) if p > b)
+
+    for _ in range(curves):
+        sigma = rng.randrange(6, n - 1)
+        u = (sigma * sigma - 5) % n
+        v = 4 * sigma % n
+        x = pow(u, 3, n)
+        z = pow(v, 3, n)
+        denominator = 16 * x * v % n
+        g = gcd(denominator, n)
+        if g == n:
+            continue
+        if g != 1:
+            return g
+        a24 = pow(v - u, 3, n) * (3 * u + v) * pow(denominator, -1, n) % n
+
+        x, z = _ecm_multiply(k, x, z, a24, n)
+        g = gcd(z, n)
+        if g == n:
+            continue
+        if g != 1:
+            return g
+
+        # Stage 2, one prime q in (b1, b2] at a time: s[d] = 2d * Q
+        s = [(0, 0), _ecm_double(x, z, a24, n)]
+        s.append(_ecm_double(*s[1], a24, n))
+        for d in range(3, step + 1):
+            s.append(_ecm_add(*s[d - 1], *s[1], *s[d - 2], n))
+        beta = [xs * zs % n for xs, zs in s]
+
+        r = b
+        xr, zr = _ecm_multiply(r, x, z, a24, n)
+        xt, zt = _ecm_multiply(r - 2 * step, x, z, a24, n)
+        g = 1
+        i = first_stage_2
+        while r < b2:
+            alpha = xr * zr % n
+            while i < len(primes) and primes[i] <= r + 2 * step:
+                delta = (primes[i] - r) // 2
+                xs, zs = s[delta]
+                g = g * ((xr - xs) * (zr + zs) - alpha + beta[delta]) % n
+                i += 1
+            xr, zr, xt, zt = (*_ecm_add(xr, zr, *s[step], xt, zt, n), xr, zr)
+            r += 2 * step
+        g = gcd(g, n)
+        if 1 < g < n:
+            return g
+    return None
+
+
+def _find_factor(n: int) -> int:
+    """
+    Finds a non-trivial factor of the odd composite n,
+    first with Pollard-Brent rho and then with ECM.
+    """
+    for c in (1, 3, 5):
+        factor = _pollard_brent(n, c, _RHO_MAX_ITERATIONS)
+        if factor is not None:
+            return factor
+
+    rng = random.Random(n)
+    while True:
+        for b1, curves in _ECM_SCHEDULE:
+            factor = _ecm(n, b1, curves, rng)
+            if factor is not None:
+                return factor
 
 
 def prime_factors(num: int) -> Dict[Prime, int]:
     """
     Creates a dictionary of prime factors for a given number.
 
+    Small factors are removed by trial division with a table of primes,
+    the remaining cofactor is split with Pollard-Brent rho and then with
+    Lenstra's elliptic curve method, and every piece is checked with is_prime.
+
     params
         num: Number to be factored
 
@@ -131,18 +853,325 @@ def prime_factors(num: int) -> Dict[Prime, int]:
         >>> prime_factors(36)
         {2: 2, 3: 2,}
     """
-    n: Prime = 2
     result: Dict[Prime, int] = {}
-    while n <= num:
-        if num % n == 0:
-            num = num // n
-            if n in result:
-                result[n] += 1
-            else:
-                result.update({n: 1})
+    for p in _TRIAL_PRIMES:
+        if p * p > num:
+            break
+        if num % p == 0:
+            power = 0
+            while num % p == 0:
+                num //= p
+                power += 1
+            result[p] = power
+
+    composites = [num] if num > 1 else []
+    while composites:
+        n = composites.pop()
+        if n < _TRIAL_PRIMES[-1] ** 2 or _probable_prime(n):
+            result[n] = result.get(n, 0) + 1
         else:
-            n += 1
-    return result
+            factor = _find_factor(n)
+            composites += [factor, n // factor]
+
+    return dict(sorted(result.items()))
+
+
+def _read_table_file(
+    path: str,
+    header: struct.Struct,
+    magic: bytes,
+    kind: str,
+    body_size: Callable[..., int],
+    memory_map: bool,
+) -> Tuple[Union[bytes, mmap.mmap], tuple, memoryview]:
+    """
+    Opens a table file written by a save method and checks it is whole.
+
+    params:
+        path: File to read
+        header: Layout of the header, the magic number then the fields
+        magic: Magic number the file must start with
+        kind: Name of the table, for the error messages
+        body_size: Bytes the body must hold, given the header fields
+        memory_map: Map the file read-only instead of reading it
+
+    return:
+        The file contents, which keep the body alive, the header fields
+        after the magic number, and a memoryview of the body
+    """
+    with open(path, "rb") as file:
+        if memory_map:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = file.read()
+    found, *fields = header.unpack_from(data)
+    if found != magic:
+        raise ValueError(f"{path} is not a {kind}")
+    body = memoryview(data)[header.size :]
+    if len(body) != body_size(*fields):
+        raise ValueError(f"{path} is truncated")
+    return data, tuple(fields), body
+
+
+# Largest table prime_factors_many builds on its own, larger numbers fall back to prime_factors
+SPF_TABLE_LIMIT = 1 << 24
+
+
+class SPFTable:
+    """
+    Smallest-prime-factor table for every n below a limit.
+        Built once, then factoring any n < limit takes O(log(n)) lookups.
+
+    Attributes:
+        :limit: (int)
+            Exclusive upper bound of the table
+
+        :table: (array or memoryview of unsigned ints)
+            table[n] is the smallest prime factor of n, for n >= 2
+    """
+
+    _MAGIC = b"MTSPF001"
+    _HEADER = struct.Struct("<8sQ")
+
+    def __init__(self, limit: int, table: Union[array, memoryview, None] = None):
+        """
+        :param limit: (int)
+            Exclusive upper bound, must be at most 2^32
+        :param table: (array or memoryview, Optional)
+            A prebuilt table, used by SPFTable.load
+        """
+        if not 0 <= limit <= 1 << 32:
+            raise ValueError(f"limit must be between 0 and 2^32, got {limit}")
+        self.limit = limit
+        self._mmap: Optional[mmap.mmap] = None
+
+        if table is None:
+            # Every n starts as its own factor, then the smaller primes
+            # overwrite the larger ones, leaving the smallest prime factor.
+            # This is O(n log log n) rather than the O(n) of a linear sieve,
+            # but each prime is one slice assignment in C, where the linear
+            # sieve visits every n in Python and is about 5x slower
+            table = array("I", range(limit))
+            for p in reversed(_small_primes(isqrt(max(limit - 1, 0)) + 1)):
+                table[p * p :: p] = array("I", [p]) * len(range(p * p, limit, p))
+        self.table = table
+
+    def smallest_prime_factor(self, n: int) -> Prime:
+        """
+        :param n: (int)
+            Number to look up, where 2 <= n < limit
+        :return: (int)
+            The smallest prime factor of n
+        """
+        if not 2 <= n < self.limit:
+            raise ValueError(f"n must be between 2 and {self.limit - 1}, got {n}")
+        return self.table[n]
+
+    def factorize(self, n: int) -> Dict[Prime, int]:
+        """
+        Factors n by following the table, in the same format as prime_factors
+
+        :param n: (int)
+            Number to factor, where n < limit
+        :return: (dict)
+            The prime factors of n and their powers
+        """
+        if n >= self.limit:
+            raise ValueError(f"n must be less than {self.limit}, got {n}")
+        table = self.table
+        result: Dict[Prime, int] = {}
+        while n > 1:
+            p = table[n]
+            power = 0
+            while n % p == 0:
+                n //= p
+                power += 1
+            result[p] = power
+        return result
+
+    def save(self, path: str) -> None:
+        """
+        Atomically writes the table to disk in native byte order, so
+        concurrent readers never see a partial file
+
+        :param path: (str)
+            File to write
+        """
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(self._HEADER.pack(self._MAGIC, self.limit))
+            file.write(memoryview(self.table).cast("B"))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str, memory_map: bool = True) -> "SPFTable":
+        """
+        Reads a table written by save
+
+        :param path: (str)
+            File to read
+        :param memory_map: (bool, Optional, default=True)
+            Map the file read-only instead of copying it into memory,
+            so several processes can share one copy of the table
+        :return: (SPFTable)
+        """
+        data, (limit,), body = _read_table_file(
+            path,
+            cls._HEADER,
+            cls._MAGIC,
+            "smallest-prime-factor table",
+            lambda limit: limit * array("I").itemsize,
+            memory_map,
+        )
+        if memory_map:
+            result = cls(limit, body.cast("I"))
+            result._mmap = cast(mmap.mmap, data)
+        else:
+            table = array("I")
+            table.frombytes(body)
+            result = cls(limit, table)
+        return result
+
+
+# Table shared between prime_factors_many calls
+_SPF_CACHE: List[SPFTable] = []
+
+
+def _shared_spf_table(limit: int) -> SPFTable:
+    """
+    Returns the shared table, rebuilding it only if it does not reach limit
+    """
+    if not _SPF_CACHE or _SPF_CACHE[0].limit < limit:
+        # Round up so growing batches do not rebuild the table every call
+        _SPF_CACHE[:] = [SPFTable(max(1 << (limit - 1).bit_length(), 1 << 16))]
+    return _SPF_CACHE[0]
+
+
+def prime_factors_many(
+    nums: Iterable[int], table: Optional[SPFTable] = None
+) -> List[Dict[Prime, int]]:
+    """
+    Factors many numbers with a shared smallest-prime-factor table.
+
+    params:
+        nums: Numbers to be factored
+        table (optional): Table to use, by default one is built and cached
+            covering the largest number below SPF_TABLE_LIMIT, numbers
+            the table does not reach are factored by prime_factors
+
+    return:
+        List of prime factor dictionaries, in the same order as nums
+
+    Example:
+
+        >>> prime_factors_many([12, 13, 14])
+        [{2: 2, 3: 1}, {13: 1}, {2: 1, 7: 1}]
+    """
+    nums = list(nums)
+    if table is None:
+        largest = max((n for n in nums if n < SPF_TABLE_LIMIT), default=1)
+        if largest > 1:
+            table = _shared_spf_table(largest + 1)
+
+    results = []
+    for n in nums:
+        if table is not None and n < table.limit:
+            results.append(table.factorize(n))
+        else:
+            results.append(prime_factors(n))
+    return results
+
+
+def _sieve_window(lo: int, width: int) -> bytearray:
+    """
+    Sieves [lo, lo + width) by the trial primes.
+
+    return:
+        flags where flags[i] is 1 if lo + i has no factor in _TRIAL_PRIMES.
+        Below _TRIAL_PRIMES[-1]^2 the flags mark exactly the primes.
+    """
+    flags = bytearray([1]) * width
+    for i in range(max(0, 2 - lo)):
+        flags[i] = 0  # 0 and 1 are not prime
+    for p in _TRIAL_PRIMES:
+        first = max(p * p, lo + (-lo) % p)
+        index = first - lo
+        if index < width:
+            flags[index::p] = bytes(len(range(index, width, p)))
+    return flags
+
+
+def _window_width(n: int) -> int:
+    """
+    Sieve window used by next_prime and prev_prime,
+    a few times the average prime gap near n
+    """
+    return max(256, 2 * n.bit_length())
+
+
+def _is_window_prime(candidate: int) -> bool:
+    """
+    Confirms a survivor of _sieve_window
+    """
+    return candidate < _TRIAL_PRIMES[-1] ** 2 or _probable_prime(candidate)
+
+
+def next_prime(num: int) -> Prime:
+    """
+    Returns the smallest prime greater than num.
+
+    A window above num is sieved by small primes,
+    then the survivors are confirmed with the same test as is_prime.
+
+    params:
+        num: Number to search for primes above
+
+    return:
+        Smallest prime greater than num
+
+    Example:
+
+        >>> next_prime(10 ** 12)
+        1000000000039
+    """
+    lo = max(num + 1, 0)
+    width = _window_width(lo)
+    while True:
+        for i in compress(range(width), _sieve_window(lo, width)):
+            if _is_window_prime(lo + i):
+                return lo + i
+        lo += width
+
+
+def prev_prime(num: int) -> Optional[Prime]:
+    """
+    Returns the largest prime less than num,
+    if there are no primes less than num, returns None
+
+    A window below num is sieved by small primes,
+    then the survivors are confirmed with the same test as is_prime.
+
+    params:
+        num: Number to search for primes below
+
+    return:
+        Largest prime less than num, if such a prime does not exist, returns None
+
+    Example:
+
+        >>> prev_prime(10 ** 12)
+        999999999989
+    """
+    hi = num
+    width = _window_width(hi)
+    while hi > 2:
+        lo = max(hi - width, 0)
+        flags = _sieve_window(lo, hi - lo)
+        for i in reversed(list(compress(range(hi - lo), flags))):
+            if _is_window_prime(lo + i):
+                return lo + i
+        hi = lo
+    return None
 
 
 def largest_prime_less_than(num: int) -> Optional[int]:
@@ -156,19 +1185,96 @@ def largest_prime_less_than(num: int) -> Optional[int]:
     return:
         Largest prime less than num, if such a prime does not exist, returns None
     """
-    for i in range((num - 1), 0, -1):
-        if division_primality_test(i):
-            return i
-    else:
-        return None
+    return prev_prime(num)
+
+
+def _read_lucas_lehmer_checkpoint(path: str, exponent: int) -> Tuple[int, int]:
+    """
+    Reads a checkpoint written by _write_lucas_lehmer_checkpoint
+
+    return:
+        (iterations completed, residue), or (0, 4) if there is no checkpoint
+    """
+    if not os.path.exists(path):
+        return 0, 4
+    with open(path) as file:
+        state = json.load(file)
+    if state["exponent"] != exponent:
+        raise ValueError(
+            f"Checkpoint {path} is for 2^{state['exponent']} - 1, not 2^{exponent} - 1"
+        )
+    return state["iteration"], int(state["residue"], 16)
+
+
+def _write_lucas_lehmer_checkpoint(
+    path: str, exponent: int, iteration: int, residue: int
+) -> None:
+    """
+    Atomically saves the state of a Lucas-Lehmer run
+    """
+    state = {"exponent": exponent, "iteration": iteration, "residue": hex(residue)}
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as file:
+        json.dump(state, file)
+    os.replace(temp_path, path)
+
+
+def _lucas_lehmer(
+    p: int,
+    progress: Optional[Callable[[int, int], None]] = None,
+    checkpoint: Optional[str] = None,
+    checkpoint_interval: int = 1000,
+) -> bool:
+    """
+    Lucas-Lehmer test of 2^p - 1 for p > 2, see lucas_lehmer_primality_test
+    """
+    iteration, s = 0, 4
+    if checkpoint is not None:
+        iteration, s = _read_lucas_lehmer_checkpoint(checkpoint, p)
+
+    mersenne = (1 << p) - 1
+    if gmpy2 is not None:
+        s, mersenne = gmpy2.mpz(s), gmpy2.mpz(mersenne)
+
+    total = p - 2
+    while iteration < total:
+        # s * s - 2 mod 2^p - 1, since 2^p = 1 the high bits fold onto the low bits
+        s = s * s - 2
+        s = (s & mersenne) + (s >> p)
+        if s >= mersenne:
+            s -= mersenne
+        iteration += 1
+
+        if checkpoint is not None and iteration % checkpoint_interval == 0:
+            _write_lucas_lehmer_checkpoint(checkpoint, p, iteration, int(s))
+        if progress is not None:
+            progress(iteration, total)
+
+    if checkpoint is not None and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    return s == 0
 
 
-def lucas_lehmer_primality_test(num: int) -> bool:
+def lucas_lehmer_primality_test(
+    num: int,
+    progress: Optional[Callable[[int, int], None]] = None,
+    checkpoint: Optional[str] = None,
+    checkpoint_interval: int = 1000,
+) -> bool:
     """
     Uses Lucas–Lehmer primality test to test for primality of Mersenne numbers.
 
+    Reduces modulo 2^p - 1 with shifts and masks instead of division,
+    and uses gmpy2 for the squaring when it is installed.
+
     params:
         num: Mersenne number to test primality of
+        progress (optional): Called as progress(iterations_done, total_iterations)
+            after every iteration
+        checkpoint (optional): Path of a file the state is saved to every
+            checkpoint_interval iterations. If the file exists the run resumes
+            from it, and it is removed once the test finishes.
+        checkpoint_interval (optional): Iterations between checkpoints
 
     return:
         True if num is prime, False if it is not
@@ -184,7 +1290,99 @@ def lucas_lehmer_primality_test(num: int) -> bool:
     if 2 ** p - 1 != num:
         raise ValueError("num must be a mersenne number")
 
-    s = 4
-    for _ in range(p - 2):
-        s = ((s * s) - 2) % num
-    return s == 0
+    return _lucas_lehmer(p, progress, checkpoint, checkpoint_interval)
+
+
+def _mersenne_chunk(exponents: List[int]) -> List[Tuple[int, bool]]:
+    """
+    Worker for sweep_mersenne, tests 2^p - 1 for each prime p in exponents
+    """
+    return [(p, p == 2 or _lucas_lehmer(p)) for p in exponents]
+
+
+def _prime_chunk(candidates: List[int]) -> List[int]:
+    """
+    Worker for filter_primes, keeps the primes in candidates
+    """
+    return [n for n in candidates if is_prime(n)]
+
+
+def _ordered_chunks(
+    worker: Callable[[List[int]], List],
+    items: Iterable[int],
+    workers: int,
+    chunksize: int,
+) -> Iterator:
+    """
+    Runs worker over chunks of items in a process pool,
+    yielding the results in order while only a few chunks are in flight.
+    """
+    iterator = iter(items)
+    chunks = iter(lambda: list(islice(iterator, chunksize)), [])
+    if workers == 1:
+        for chunk in chunks:
+            yield from worker(chunk)
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        pending: deque = deque()
+        try:
+            for chunk in chunks:
+                pending.append(executor.submit(worker, chunk))
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def sweep_mersenne(
+    p_lo: int, p_hi: int, workers: Optional[int] = None, chunksize: int = 1
+) -> Iterator[Tuple[int, bool]]:
+    """
+    Runs the Lucas-Lehmer test on 2^p - 1 for every prime p where p_lo <= p < p_hi.
+        Composite exponents are skipped, since 2^p - 1 is then composite.
+
+    params:
+        p_lo: Inclusive lower bound on the exponent
+        p_hi: Exclusive upper bound on the exponent
+        workers (optional): Number of processes, default os.cpu_count()
+        chunksize (optional): Exponents sent to a process at a time
+
+    return:
+        Generator of (p, True if 2^p - 1 is prime), in order of p
+
+    Example:
+
+        >>> [p for p, is_mersenne_prime in sweep_mersenne(2, 32) if is_mersenne_prime]
+        [2, 3, 5, 7, 13, 17, 19, 31]
+    """
+    workers = workers or os.cpu_count() or 1
+    return _ordered_chunks(
+        _mersenne_chunk, primes_between(p_lo, p_hi), workers, chunksize
+    )
+
+
+def filter_primes(
+    candidates: Iterable[int], workers: Optional[int] = None, chunksize: int = 1024
+) -> Iterator[Prime]:
+    """
+    Tests each candidate with is_prime in a process pool.
+
+    params:
+        candidates: Numbers to test, may be a lazy or unbounded iterable
+        workers (optional): Number of processes, default os.cpu_count()
+        chunksize (optional): Candidates sent to a process at a time
+
+    return:
+        Generator of the prime candidates, in their original order
+
+    Example:
+
+        >>> list(filter_primes([15, 13, 2 ** 61 - 1, 2 ** 61 + 1]))
+        [13, 2305843009213693951]
+    """
+    workers = workers or os.cpu_count() or 1
+    return _ordered_chunks(_prime_chunk, candidates, workers, chunksize)
@@ -3,19 +3,103 @@ A Collection of tools related to the number theory branch of mathmatics.
 These include Primes, Greatest Common Factors, etc.
 """
 
-from math import sqrt
+from itertools import product
+from math import prod, sqrt
 
-from typing import List
+from typing import Iterable, Iterator, List, Tuple, Union
 
+from mttools.number_theory_tools.Primes import prime_factors
 
-def perfect_factors(n: int) -> List[int]:
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def iter_perfect_factors(n: int) -> Iterator[int]:
+    """
+    Lazily generates the perfect factors of n from its prime factorization,
+    in no particular order.
+
+    n: positive number to find the factors of
+
+    return: a generator of the Perfect Factors
+
+    Example:
+
+        >>> sorted(iter_perfect_factors(12))
+        [1, 2, 3, 4, 6, 12]
+    """
+    if n < 1:
+        raise ValueError(f"n must be positive, got {n}")
+    prime_powers = [
+        [p ** e for e in range(power + 1)] for p, power in prime_factors(n).items()
+    ]
+    for powers in product(*prime_powers):
+        yield prod(powers)
+
+
+def divisor_count(n: int) -> int:
+    """
+    Counts the perfect factors of n without listing them
+
+    n: positive number to count the factors of
+
+    return: the number of Perfect Factors, including 1 and n
+
+    Example:
+
+        >>> divisor_count(36)
+        9
+    """
+    return divisor_sum(n, 0)
+
+
+def divisor_sum(n: int, k: int = 1) -> int:
+    """
+    Sums the kth powers of the perfect factors of n without listing them
+
+    n: positive number to sum the factors of
+    k: power each factor is raised to, default 1
+
+    return: the sum of d^k over all Perfect Factors d of n
+
+    Example:
+
+        >>> divisor_sum(12)
+        28
+    """
+    if n < 1:
+        raise ValueError(f"n must be positive, got {n}")
+    if k < 0:
+        raise ValueError(f"k must not be negative, got {k}")
+    total = 1
+    for p, power in prime_factors(n).items():
+        if k == 0:
+            total *= power + 1
+        else:
+            pk = p ** k
+            total *= (pk ** (power + 1) - 1) // (pk - 1)
+    return total
+
+
+def perfect_factors(
+    n: int, use_factorization: bool = False, sort: bool = True
+) -> List[int]:
     """
     Generates perfect factors of number starting with 1
 
     n: number to find the factors of
+    use_factorization (optional): Build the factors from the prime factorization
+        of n instead of trial dividing up to sqrt(n), much faster for large n
+    sort (optional): Sort the factors, default True
 
-    return: a sorted List of the Perfect Factors
+    return: a List of the Perfect Factors, sorted unless sort is False
     """
+    if use_factorization:
+        factors = list(iter_perfect_factors(n))
+        return sorted(factors) if sort else factors
+
     # 1 and n are always divisors
     factors = [1, n]
 
@@ -33,29 +117,169 @@ def perfect_factors(n: int) -> List[int]:
             factors.append(i)
             factors.append(n // i)
 
-    return sorted(factors)
+    return sorted(factors) if sort else factors
+
+
+# Operands longer than this many bits use Lehmer's algorithm in gcd,
+# below it plain Euclid is faster in pure Python
+LEHMER_THRESHOLD = 8192
+
+
+def _lehmer_gcd(a: int, b: int) -> int:
+    """
+    Lehmer's gcd for a >= b >= 0. Runs Euclid's algorithm on the leading
+    64 bits and only applies the combined quotients to the full numbers.
+    """
+    while b >> 64:
+        shift = a.bit_length() - 64
+        x, y = a >> shift, b >> shift
+        A, B, C, D = 1, 0, 0, 1
+        while y + C != 0 and y + D != 0:
+            q = (x + A) // (y + C)
+            if q != (x + B) // (y + D):
+                break
+            A, C = C, A - q * C
+            B, D = D, B - q * D
+            x, y = y, x - q * y
+
+        if B == 0:
+            a, b = b, a % b
+        else:
+            a, b = A * a + B * b, C * a + D * b
+
+    while b:
+        a, b = b, a % b
+    return a
 
 
 def gcd(a: int, b: int) -> int:
     """
     Finds the Greatest Common Divisor of two integers.
+
+    Example:
+
+        >>> gcd(150, -100)
+        50
     """
     a, b = abs(a), abs(b)
-    # Simple cases
-    if b == 0:
-        return a
+    if a < b:
+        a, b = b, a
+    if b.bit_length() > LEHMER_THRESHOLD:
+        return _lehmer_gcd(a, b)
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def xgcd(a: int, b: int) -> Tuple[int, int, int]:
+    """
+    Extended Euclidean algorithm.
+
+    return: (g, x, y) where g = gcd(a, b) = a * x + b * y
+
+    Example:
+
+        >>> xgcd(240, 46)
+        (2, -9, 47)
+    """
+    old_r, r = a, b
+    old_x, x = 1, 0
+    old_y, y = 0, 1
+    while r:
+        q = old_r // r
+        old_r, r = r, old_r - q * r
+        old_x, x = x, old_x - q * x
+        old_y, y = y, old_y - q * y
+    if old_r < 0:
+        return -old_r, -old_x, -old_y
+    return old_r, old_x, old_y
+
 
-    if a == 0:
-        return b
+def mod_inverse(a: int, m: int) -> int:
+    """
+    Finds x where a * x = 1 (mod m), with 0 <= x < m
+
+    Example:
 
-    sort = sorted([a, b])
-    if sort[1] % sort[0] == 0:
-        return sort[0]
-    return gcd(b, a % b)
+        >>> mod_inverse(3, 11)
+        4
+    """
+    if m < 1:
+        raise ValueError(f"m must be positive, got {m}")
+    g, x, _ = xgcd(a % m, m)
+    if g != 1:
+        raise ValueError(f"{a} has no inverse modulo {m}")
+    return x % m
 
 
 def lcm(a: int, b: int) -> int:
     """
     Finds the Least Common Multiple of two integers.
+
+    Example:
+
+        >>> lcm(4, -6)
+        12
+    """
+    if a == 0 or b == 0:
+        return 0
+    return abs(a // gcd(a, b) * b)
+
+
+def gcd_many(nums: Iterable[int]) -> int:
+    """
+    Finds the Greatest Common Divisor of any number of integers.
+        NumPy integer arrays are reduced with numpy.gcd.
+
+    Example:
+
+        >>> gcd_many([12, 18, -30])
+        6
+    """
+    if np is not None and isinstance(nums, np.ndarray):
+        return int(np.gcd.reduce(nums, axis=None)) if nums.size else 0
+
+    result = 0
+    for n in nums:
+        result = gcd(result, n)
+        if result == 1:
+            break
+    return result
+
+
+def lcm_many(nums: Iterable[int]) -> int:
+    """
+    Finds the Least Common Multiple of any number of integers,
+    1 if there are none.
+
+    Example:
+
+        >>> lcm_many([4, 6, 10])
+        60
+    """
+    result = 1
+    for n in nums:
+        result = lcm(result, n)
+        if result == 0:
+            break
+    return result
+
+
+def gcd_array(
+    a: Union[int, Iterable[int]], b: Union[int, Iterable[int]]
+) -> "np.ndarray":
+    """
+    Elementwise Greatest Common Divisor of two int64 arrays, requires NumPy
+
+    a, b: array-likes that broadcast against each other
+
+    return: numpy int64 array of the gcds
+
+    Example:
+
+        >>> gcd_array([12, 7, 0], [18, 21, 5])
+        array([6, 7, 5])
     """
-    return (a * b) / gcd(a, b)
+    if np is None:
+        raise ImportError("gcd_array requires numpy")
+    return np.gcd(np.asarray(a, dtype=np.int64), np.asarray(b, dtype=np.int64))
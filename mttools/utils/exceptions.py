@@ -31,3 +31,9 @@ class InfiniteSolutionsWaring(RuntimeWarning):
     """
     Raised when a system of linear equations has infinite solutions
     """
+
+
+class NoConvergenceWarning(RuntimeWarning):
+    """
+    Raised when an iterative method does not converge
+    """
@@ -0,0 +1,228 @@
+from fractions import Fraction
+
+import pytest
+
+from mttools.linear_algebra_tools import LUDecomposition
+from mttools.linear_algebra_tools.elimination import exact_rref
+from mttools.linear_algebra_tools import matrix
+from mttools.linear_algebra_tools.matrix import Matrix, SquareMatrix
+from mttools.utils.exceptions import DimensionError, NoInverseWarning
+
+
+def multiply(a, b):
+    return [[sum(x * y for x, y in zip(row, col)) for col in zip(*b)] for row in a]
+
+
+def assert_factors(array, backend="python"):
+    lu = LUDecomposition(Matrix(array, backend=backend))
+    permuted = [array[p] for p in lu.permutation]
+    product = multiply(lu.lower(), lu.upper())
+    for row, expected in zip(product, permuted):
+        assert pytest.approx(expected) == row
+    return lu
+
+
+class TestFactorization:
+    @pytest.mark.parametrize(
+        "array",
+        [
+            [[1, 2], [3, 4]],
+            [[0, 1, 2], [1, 2, 1], [2, 7, 8]],
+            [[1, 2, 3], [8, 9, 3]],
+            [[1, 2], [3, 4], [2, 5]],
+            [[0, 0, 1], [0, 2, 4], [0, 1, 2]],
+            [[2.5, -1.0, 3.0], [0.5, 4.0, -2.0], [1.0, 1.0, 1.0]],
+        ],
+    )
+    def test_pa_equals_lu(self, array):
+        assert_factors(array)
+
+    def test_partial_pivoting(self):
+        lu = assert_factors([[1, 2], [3, 4]])
+        assert [1, 0] == lu.permutation
+        assert -1 == lu.sign
+
+    def test_rank(self):
+        assert 2 == assert_factors([[1, 2], [3, 4], [2, 5]]).rank
+        assert 2 == assert_factors([[0, 1, 2], [1, 2, 1], [2, 7, 8]]).rank
+        assert 0 == assert_factors([[0, 0], [0, 0]]).rank
+
+    def test_pivot_columns(self):
+        lu = assert_factors([[0, 0, 1], [0, 2, 4], [0, 1, 2]])
+        assert [1, 2] == lu.pivot_columns
+
+    def test_exact_for_integers(self):
+        lu = LUDecomposition(Matrix([[1, 2], [3, 4]]))
+        assert lu.exact
+        assert all(isinstance(v, Fraction) for row in lu.lu for v in row)
+
+    def test_exact_fractions(self):
+        array = [[Fraction(1, 2), Fraction(2, 3)], [Fraction(3, 4), 5]]
+        lu = assert_factors(array)
+        assert lu.exact
+        assert [[1, 0], [Fraction(2, 3), 1]] == lu.lower()
+
+    def test_exact_option(self):
+        lu = LUDecomposition(Matrix([[1, 2], [3, 4]]), exact=False)
+        assert not lu.exact
+        assert isinstance(lu.lu[1][1], float)
+        assert LUDecomposition(Matrix([[0.5, 2.0], [3.0, 4.0]]), exact=True).exact
+
+    def test_numpy_backend(self):
+        pytest.importorskip("numpy")
+        lu = assert_factors(
+            [[0.0, 1.0, 2.0], [1.0, 2.0, 1.0], [2.0, 7.0, 9.0]], "numpy"
+        )
+        assert 3 == lu.rank
+
+
+class TestDeterminant:
+    def test_integer_determinant_is_exact(self):
+        m = SquareMatrix([[1, 3, 2, 5], [4, 1, 3, 5], [2, 5, 2, 5], [3, 4, 5, 6]])
+        assert -88 == m.determinate()
+        assert isinstance(m.determinate(), int)
+
+    def test_singular(self):
+        assert 0 == SquareMatrix([[1, 2], [2, 4]]).determinate()
+
+    def test_12_by_12(self):
+        # Triangular plus a permutation, so the determinant is known
+        array = [[int(c >= r) * (r + c + 1) for c in range(12)] for r in range(12)]
+        array[0], array[1] = array[1], array[0]
+        expected = -1
+        for r in range(12):
+            expected *= 2 * r + 1
+        assert expected == SquareMatrix(array).determinate()
+
+    def test_fractions(self):
+        # det of the 5x5 Hilbert matrix
+        hilbert = [[Fraction(1, r + c + 1) for c in range(5)] for r in range(5)]
+        assert Fraction(1, 266716800000) == SquareMatrix(hilbert).determinate()
+
+    def test_large_integers(self):
+        # Vandermonde, det is the product of x_j - x_i for i < j
+        xs = [3 ** k for k in range(10)]
+        expected = 1
+        for j, x_j in enumerate(xs):
+            for x_i in xs[:j]:
+                expected *= x_j - x_i
+        array = [[x ** k for k in range(10)] for x in xs]
+        assert expected == SquareMatrix(array).determinate()
+
+    def test_not_square(self):
+        with pytest.raises(DimensionError):
+            LUDecomposition(Matrix([[1, 2, 3], [4, 5, 6]])).determinant()
+
+
+class TestSolve:
+    def test_vector(self):
+        m = SquareMatrix([[3, 2, -2], [0, 4, 0], [7, -2, 1]])
+        assert [3, 2, 2] == m.solve([9, 8, 19])
+
+    def test_several_columns(self):
+        m = SquareMatrix([[2, 1], [1, 3]])
+        assert [[1, 0], [0, 1]] == m.solve([[2, 1], [1, 3]])
+
+    def test_floats(self):
+        m = SquareMatrix([[2.0, 1.0], [1.0, 3.0]])
+        assert pytest.approx([1.0, 2.0]) == m.solve([4.0, 7.0])
+
+    def test_singular(self):
+        with pytest.raises(NoInverseWarning):
+            SquareMatrix([[1, 2], [2, 4]]).solve([1, 2])
+
+    def test_bad_size(self):
+        with pytest.raises(DimensionError):
+            SquareMatrix([[1, 2], [3, 4]]).solve([1, 2, 3])
+
+
+class TestExactRREF:
+    def test_rank_deficient(self):
+        rows, pivot_columns = exact_rref([[1, 2, 1, 1], [2, 4, 0, 6], [3, 6, 1, 7]])
+        assert [[1, 2, 0, 3], [0, 0, 1, -2], [0, 0, 0, 0]] == rows
+        assert [0, 2] == pivot_columns
+
+    def test_fractions(self):
+        rows, _ = exact_rref([[Fraction(1, 2), 1], [1, Fraction(1, 3)]])
+        assert [[1, 0], [0, 1]] == rows
+
+    def test_solve_exact(self):
+        m = SquareMatrix([[3, 1], [1, 2]])
+        assert [Fraction(1, 5), Fraction(2, 5)] == m.solve([1, 1])
+        assert all(isinstance(v, float) for v in m.solve([1, 1], exact=False))
+
+    def test_solve_singular(self):
+        with pytest.raises(NoInverseWarning):
+            SquareMatrix([[1, 2], [2, 4]]).solve([1, 2], exact=True)
+
+
+class TestCaching:
+    def test_reused(self, monkeypatch):
+        factorizations = []
+
+        class CountingLU(LUDecomposition):
+            def __init__(self, *args, **kwargs):
+                factorizations.append(self)
+                super().__init__(*args, **kwargs)
+
+        monkeypatch.setattr(matrix, "LUDecomposition", CountingLU)
+        m = SquareMatrix([[2.0, 1.0], [1.0, 3.0]])
+        assert m.determinate() == pytest.approx(5)
+        assert m.solve([3.0, 4.0]) == pytest.approx([1, 1])
+        m.inversed()
+        assert 2 == m.rank()
+        m.inverse()
+        assert 1 == len(factorizations)
+        assert m.determinate() == pytest.approx(0.2)
+        assert 2 == len(factorizations)
+
+    def test_entry_edited_in_place(self):
+        m = SquareMatrix([[1, 2], [3, 4]])
+        assert -2 == m.determinate()
+        m.array[0][0] = 5
+        assert 14 == m.determinate()
+
+    def test_rank_entry_edited_in_place(self):
+        m = Matrix([[1, 2], [2, 4]])
+        assert 1 == m.rank()
+        m.array[1][1] = 5
+        assert 2 == m.rank()
+
+    def test_row_operations(self):
+        m = SquareMatrix([[1, 2], [3, 4]])
+        assert -2 == m.determinate()
+        m.swap_rows(0, 1)
+        assert 2 == m.determinate()
+        m.multiply_row(0, 2)
+        assert 4 == m.determinate()
+        m.array = [[1, 0], [0, 1]]
+        assert 1 == m.determinate()
+
+    def test_mutators(self):
+        def fresh(m):
+            return SquareMatrix([list(row) for row in m.array]).determinate()
+
+        m = SquareMatrix([[1, 2], [3, 5]])
+        m.determinate()
+        m.add_rows(0, 1, 2)
+        assert fresh(m) == m.determinate()
+        m.scalar_multiplication(2)
+        assert fresh(m) == m.determinate()
+        m.array[0][1] = 0
+        m.transpose()
+        assert fresh(m) == m.determinate()
+        m.rref()
+        assert 1 == m.determinate()
+
+    @pytest.mark.parametrize("backend", ["numpy", "array"])
+    def test_buffer_edited_in_place(self, backend):
+        np = pytest.importorskip("numpy")
+        m = SquareMatrix([[1.0, 2.0], [3.0, 4.0]], backend=backend)
+        assert m.determinate() == pytest.approx(-2)
+        np.asarray(m)[0, 0] = 5.0
+        assert m.determinate() == pytest.approx(14)
+
+    def test_rank_does_not_modify(self):
+        m = Matrix([[1, 2], [3, 4], [2, 5]])
+        assert 2 == m.rank()
+        assert [[1, 2], [3, 4], [2, 5]] == m.array
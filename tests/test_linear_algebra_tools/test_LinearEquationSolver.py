@@ -1,11 +1,20 @@
+from fractions import Fraction
+
 import pytest
 
 from mttools.utils.exceptions import (
+    DimensionError,
     InconsistentWarning,
     InfiniteSolutionsWaring,
+    NoInverseWarning,
     UnderDeterminedError,
 )
-from mttools.linear_algebra_tools import solve_linear_equations
+from mttools.linear_algebra_tools import (
+    solve_batch,
+    solve_linear_equations,
+    solve_many,
+)
+from mttools.linear_algebra_tools.matrix import Matrix
 
 
 class TestLinearEquationSolver:
@@ -35,3 +44,117 @@ class TestLinearEquationSolver:
         eq_2 = [0, 4, 0, 8]
         with pytest.raises(UnderDeterminedError):
             solve_linear_equations(eq_1, eq_2)
+
+    def test_3eq_2unk_1sol(self):
+        eq_1 = [1, 1, 3]
+        eq_2 = [1, -1, 1]
+        eq_3 = [2, 1, 5]
+        assert [2, 1] == solve_linear_equations(eq_1, eq_2, eq_3)
+
+    def test_3eq_2unk_0sol(self):
+        eq_1 = [1, 1, 3]
+        eq_2 = [1, -1, 1]
+        eq_3 = [2, 1, 6]
+        with pytest.raises(InconsistentWarning):
+            solve_linear_equations(eq_1, eq_2, eq_3)
+
+    def test_fractions_inconsistent(self):
+        eq_1 = [1, Fraction(1, 3), 1]
+        eq_2 = [3, 1, Fraction(3, 1) + Fraction(1, 10 ** 12)]
+        with pytest.raises(InconsistentWarning):
+            solve_linear_equations(eq_1, eq_2)
+
+    def test_floats_near_singular(self):
+        eq_1 = [0.1, 0.2, 0.3, 0.6]
+        eq_2 = [0.4, 0.5, 0.6, 1.5]
+        eq_3 = [0.7, 0.8, 0.9, 2.4]
+        with pytest.raises(InfiniteSolutionsWaring):
+            solve_linear_equations(eq_1, eq_2, eq_3)
+        with pytest.raises(InconsistentWarning):
+            solve_linear_equations(eq_1, eq_2, [0.7, 0.8, 0.9, 2.5])
+
+    def test_floats_tolerance(self):
+        eq_1 = [1.0, 1.0, 2.0]
+        eq_2 = [1.0, 1.0 + 1e-9, 2.0]
+        assert pytest.approx([2.0, 0.0]) == solve_linear_equations(eq_1, eq_2)
+        with pytest.raises(InfiniteSolutionsWaring):
+            solve_linear_equations(eq_1, eq_2, tolerance=1e-6)
+
+
+class TestSolveMany:
+    def test_columns(self):
+        a = [[3, 2, -2], [0, 4, 0], [7, -2, 1]]
+        b = [[9, 3], [8, 0], [19, 7]]
+        assert [[3, 1], [2, 0], [2, 0]] == solve_many(a, b)
+
+    def test_vector(self):
+        assert [3, 2, 2] == solve_many([[3, 2, -2], [0, 4, 0], [7, -2, 1]], [9, 8, 19])
+
+    def test_reuses_factorization(self):
+        m = Matrix([[2.0, 1.0], [1.0, 3.0]])
+        assert pytest.approx([1.0, 2.0]) == solve_many(m, [4.0, 7.0])
+        lu = m.lu_decomposition()
+        assert pytest.approx([1.0, 2.0]) == solve_many(lu, [4.0, 7.0])
+        assert pytest.approx([2.0, 1.0]) == solve_many(lu, [5.0, 5.0])
+
+    def test_numpy_backend(self):
+        pytest.importorskip("numpy")
+        m = Matrix([[2.0, 1.0], [1.0, 3.0]], backend="numpy")
+        x = solve_many(m, [[4.0], [7.0]])
+        assert isinstance(x, list)
+        assert pytest.approx([1.0, 2.0]) == [row[0] for row in x]
+
+    def test_singular(self):
+        with pytest.raises(NoInverseWarning):
+            solve_many([[1, 2], [2, 4]], [1, 2])
+
+    def test_not_square(self):
+        with pytest.raises(DimensionError):
+            solve_many([[1, 2, 3], [4, 5, 6]], [1, 2])
+
+
+SYSTEMS = [
+    ([[3.0, 2.0, -2.0], [0.0, 4.0, 0.0], [7.0, -2.0, 1.0]], [9.0, 8.0, 19.0]),
+    ([[2.0, 1.0], [1.0, 3.0]], [4.0, 7.0]),
+    ([[0.0, 2.0], [5.0, 0.0]], [2.0, 10.0]),
+    ([[4.0]], [2.0]),
+]
+SOLUTIONS = [[3.0, 2.0, 2.0], [1.0, 2.0], [2.0, 1.0], [0.5]]
+
+
+class TestSolveBatch:
+    @pytest.mark.parametrize("method", ["python", "numpy", "process"])
+    def test_methods(self, method):
+        if method == "numpy":
+            pytest.importorskip("numpy")
+        solutions = solve_batch(SYSTEMS, method, workers=2, chunksize=3)
+        assert len(SOLUTIONS) == len(solutions)
+        for expected, x in zip(SOLUTIONS, solutions):
+            assert pytest.approx(expected) == list(x)
+
+    def test_exact_by_default(self):
+        assert [[Fraction(1, 2), Fraction(1, 4)]] == solve_batch(
+            [([[2, 0], [0, 4]], [1, 1])]
+        )
+
+    def test_empty(self):
+        assert [] == solve_batch([])
+
+    @pytest.mark.parametrize("method", ["python", "numpy"])
+    def test_singular(self, method):
+        if method == "numpy":
+            pytest.importorskip("numpy")
+        systems = SYSTEMS + [([[1.0, 2.0], [2.0, 4.0]], [1.0, 2.0])]
+        with pytest.raises(NoInverseWarning):
+            solve_batch(systems, method)
+
+    def test_singular_at_full_rank(self, monkeypatch):
+        np = pytest.importorskip("numpy")
+        monkeypatch.setattr(np.linalg, "matrix_rank", lambda a: len(a))
+        systems = SYSTEMS + [([[1.0, 2.0], [2.0, 4.0]], [1.0, 2.0])]
+        with pytest.raises(NoInverseWarning):
+            solve_batch(systems, "numpy")
+
+    def test_bad_method(self):
+        with pytest.raises(ValueError):
+            solve_batch(SYSTEMS, "threads")
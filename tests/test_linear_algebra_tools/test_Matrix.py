@@ -1,6 +1,9 @@
+from fractions import Fraction
+
 import pytest
 
-from mttools.linear_algebra_tools.matrix import Matrix
+from mttools.linear_algebra_tools.matrix import Matrix, MatrixView, SquareMatrix
+from mttools.linear_algebra_tools.sparse import SparseMatrix
 from mttools.utils.exceptions import DimensionError
 
 
@@ -51,6 +54,17 @@ class TestMul:
         n = Matrix([[1, 2], [3, 4]])  # 2x2
         assert isinstance(m * n, Matrix)
 
+    def test_mul_several_tiles(self):
+        a = [[r * 7 + c - 50 for c in range(70)] for r in range(5)]  # 5x70
+        b = [[(r * c) % 11 - 5 for c in range(130)] for r in range(70)]  # 70x130
+        expected = [
+            [sum(a[r][k] * b[k][c] for k in range(70)) for c in range(130)]
+            for r in range(5)
+        ]
+        product = Matrix(a) * Matrix(b)
+        assert expected == product.array
+        assert (5, 130) == (product.num_rows, product.num_columns)
+
 
 class TestScalarMul:
     def test_scalar_mul(self):
@@ -96,6 +110,92 @@ class TestTranspose:
         m.transpose()
         assert [[1, 2, 3], [8, 9, 0]] == m.array
 
+    def test_transposed(self):
+        m = Matrix([[1, 2, 3], [8, 9, 0]])
+        t = m.transposed()
+        assert [[1, 8], [2, 9], [3, 0]] == t.array
+        assert (3, 2) == (t.num_rows, t.num_columns)
+        assert [[1, 2, 3], [8, 9, 0]] == m.array
+
+
+class TestCopy:
+    def test_copy(self):
+        array = [[1, 2], [3, 4]]
+        m = SquareMatrix(array)
+        c = m.copy()
+        assert isinstance(c, SquareMatrix)
+        c.add_rows(0, 1)
+        c.swap_rows(0, 1)
+        assert [[1, 2], [3, 4]] == m.array
+
+    def test_caller_rows_not_reordered(self):
+        array = [[1, 2], [3, 4]]
+        Matrix(array).swap_rows(0, 1)
+        assert [[1, 2], [3, 4]] == array
+
+
+@pytest.fixture(params=["python", "numpy", "array"])
+def backend(request):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    return request.param
+
+
+class TestView:
+    def test_block(self, backend):
+        m = Matrix([[1, 2, 3], [4, 5, 6], [7, 8, 9]], backend)
+        v = m.view(slice(1, 3), slice(0, 2))
+        assert isinstance(v, MatrixView)
+        assert [[4, 5], [7, 8]] == v.array
+        assert (2, 2) == (v.num_rows, v.num_columns)
+        assert 8 == v[1, 1]
+
+    def test_transpose(self, backend):
+        m = Matrix([[1, 2, 3], [8, 9, 0]], backend)
+        assert [[1, 8], [2, 9], [3, 0]] == m.T.array
+        assert [[3, 0], [2, 9]] == m.T.view(slice(None, None, -1), slice(None)).array[
+            :2
+        ]
+        assert m.array == m.T.T.array
+        assert 0 == m.T[2, 1]
+
+    def test_shares_storage(self, backend):
+        m = Matrix([[1, 2], [3, 4]], backend)
+        v = m.view(slice(1, 2))
+        m.swap_rows(0, 1)
+        m.multiply_row(1, 10)
+        assert [[10, 20]] == v.array
+        assert [[3, 10], [4, 20]] == m.T.array
+
+    def test_read_only(self):
+        pytest.importorskip("numpy")
+        v = Matrix([[1, 2], [3, 4]], "numpy").T
+        with pytest.raises(ValueError):
+            v._data[0, 0] = 5
+
+    def test_products(self, backend):
+        m = Matrix([[1, 2, 3], [4, 5, 6]], backend)
+        product = m.T * m
+        assert isinstance(product, Matrix)
+        assert [[17, 22, 27], [22, 29, 36], [27, 36, 45]] == product.array
+        assert [[14, 32], [32, 77]] == (m * m.T).array
+        assert [[2, 8], [4, 10], [6, 12]] == (m.T + m.T).array
+
+    def test_copy(self, backend):
+        m = SquareMatrix([[1, 2], [3, 4]], backend)
+        c = m.T.copy()
+        assert isinstance(c, SquareMatrix)
+        c.swap_rows(0, 1)
+        assert [[2, 4], [1, 3]] == c.array
+        assert [[1, 2], [3, 4]] == m.array
+        assert not isinstance(m.view(slice(1)).copy(), SquareMatrix)
+
+    def test_rank(self, backend):
+        m = Matrix([[1, 2, 3], [2, 4, 6], [1, 0, 1]], backend)
+        assert 1 == m.view(slice(0, 2)).rank()
+        assert 2 == m.T.rank()
+        assert [[1, 2, 3], [2, 4, 6], [1, 0, 1]] == m.array
+
 
 class TestSwapRows:
     def test_swap_rows(self):
@@ -134,3 +234,240 @@ class TestRREF:
         m.rref()
         expected = [[1, 0, -3], [0, 1, 2], [0, 0, 0]]
         assert expected == m.array
+
+    def test_rref_exact(self):
+        m = Matrix([[3, 1, 2], [1, 3, 1]])
+        m.rref()
+        assert [[1, 0, Fraction(5, 8)], [0, 1, Fraction(1, 8)]] == m.array
+        assert all(isinstance(v, Fraction) for row in m.array for v in row)
+
+    def test_rref_exact_fractions(self):
+        m = Matrix([[Fraction(1, 3), Fraction(1, 2), 1], [Fraction(2, 3), 1, 3]])
+        m.rref()
+        assert [[1, Fraction(3, 2), 0], [0, 0, 1]] == m.array
+
+    def test_rref_exact_from_floats(self):
+        # 0.1 and 0.3 are not exactly a tenth and three tenths,
+        # so the rows are independent
+        m = Matrix([[0.1, 0.3], [1, 3]])
+        m.rref(exact=True)
+        assert [[1, 0], [0, 1]] == m.array
+
+    @pytest.mark.parametrize("backend", ["python", "numpy"])
+    @pytest.mark.parametrize("pivoting", ["partial", "complete"])
+    def test_rref_near_singular(self, backend, pivoting):
+        if backend == "numpy":
+            pytest.importorskip("numpy")
+        # Rank 2, but rounding leaves a tiny third pivot
+        m = Matrix([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6], [0.7, 0.8, 0.9]], backend)
+        assert [0, 1] == m.rref(pivoting=pivoting)
+        assert [0, 0, 0] == m.array[2]
+        assert pytest.approx([-1.0, 2.0]) == [row[2] for row in m.array[:2]]
+
+    def test_rref_tolerance(self):
+        m = Matrix([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6], [0.7, 0.8, 0.9]])
+        assert [0, 1, 2] == m.rref(tolerance=0)
+
+    def test_rref_complete_pivoting_leftmost(self):
+        # Complete pivoting starts from the 7, the pivots still end up leftmost
+        m = Matrix([[1.0, 2.0, 3.0], [2.0, 4.0, 7.0]])
+        assert [0, 2] == m.rref(pivoting="complete")
+        assert [[1, 2, 0], [0, 0, 1]] == m.array
+
+    def test_rref_bad_pivoting(self):
+        with pytest.raises(ValueError):
+            Matrix([[1.0, 2.0]]).rref(pivoting="rook")
+
+    def test_rref_inexact(self):
+        m = Matrix([[1, 2, 3], [8, 9, 3]])
+        m.rref(exact=False)
+        assert pytest.approx([-3.0, 3.0]) == [row[-1] for row in m.array]
+        assert isinstance(m.array[0][2], float)
+
+
+class TestRREFForm:
+    def test_rref_form(self, backend):
+        m = Matrix([[0, 1, 2], [1, 2, 1], [2, 7, 8]], backend)
+        assert [[1, 0, -3], [0, 1, 2], [0, 0, 0]] == m.rref_form().array
+        assert [[0, 1, 2], [1, 2, 1], [2, 7, 8]] == m.array
+
+    def test_float(self):
+        m = Matrix([[2.0, 4.0], [1.0, 3.0]])
+        assert [[1.0, 0.0], [0.0, 1.0]] == m.rref_form(pivoting="complete").array
+        assert [[2.0, 4.0], [1.0, 3.0]] == m.array
+
+
+class TestRank:
+    def test_rank_near_singular(self):
+        m = Matrix([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6], [0.7, 0.8, 0.9]])
+        assert 2 == m.rank()
+        assert 3 == m.rank(tolerance=0)
+
+
+class TestBackend:
+    def test_default_small(self):
+        assert "python" == Matrix([[1.5, 2], [3, 4]]).backend
+
+    def test_default_large_float(self):
+        pytest.importorskip("numpy")
+        m = Matrix([[float(r * c) for c in range(40)] for r in range(40)])
+        assert "python" == m.backend
+        m.array[0][0] = 99.0
+        assert 99.0 == m.array[0][0]
+
+    def test_large_float_from_sparse(self):
+        pytest.importorskip("numpy")
+        array = [[float(r * c + 1) for c in range(40)] for r in range(40)]
+        sparse = SparseMatrix.from_dense(array)
+        assert "python" == sparse.backend
+        for m in (sparse.to_matrix(), sparse * Matrix(array)):
+            assert "python" == m.backend
+            m.array[0][0] = 99.0
+            assert 99.0 == m.array[0][0]
+        product = sparse.with_backend("numpy") * Matrix(array)
+        assert "python" == product.backend
+
+    def test_default_large_int(self):
+        m = Matrix([[r * c for c in range(40)] for r in range(40)])
+        assert "python" == m.backend
+
+    def test_bad_backend(self):
+        with pytest.raises(ValueError):
+            Matrix([[1, 2]], backend="fortran")
+
+    def test_from_ndarray(self):
+        np = pytest.importorskip("numpy")
+        m = Matrix(np.array([[1.0, 2.0], [3.0, 4.0]]))
+        assert "numpy" == m.backend
+        assert [[1.0, 2.0], [3.0, 4.0]] == m.array
+        assert 2 == m.num_rows
+
+
+class TestNumpyBackend:
+    @pytest.fixture(autouse=True)
+    def numpy(self):
+        pytest.importorskip("numpy")
+
+    def test_array_is_list(self):
+        m = Matrix([[1, 2], [1, 2], [1, 2]], backend="numpy")
+        assert [[1, 2], [1, 2], [1, 2]] == m.array
+        m.array = [[5, 6]]
+        assert [[5, 6]] == m.array
+
+    def test_mul(self):
+        m = Matrix([[1, 2], [1, 2], [1, 2]], backend="numpy")
+        n = Matrix([[1, 2], [3, 4]], backend="numpy")
+        product = m * n
+        assert "numpy" == product.backend
+        assert [[7, 10], [7, 10], [7, 10]] == product.array
+
+    def test_mul_mixed_backends(self):
+        m = Matrix([[1, 2], [3, 4]], backend="python")
+        n = Matrix([[1, 2], [3, 4]], backend="numpy")
+        assert [[7, 10], [15, 22]] == (m * n).array
+        assert [[7, 10], [15, 22]] == (n * m).array
+
+    def test_mul_bad_size(self):
+        m = Matrix([[1, 2], [1, 2], [1, 2]], backend="numpy")
+        with pytest.raises(DimensionError):
+            m * Matrix([[1], [2], [3]], backend="numpy")
+
+    def test_add(self):
+        m = Matrix([[1, 2], [3, 4]], backend="numpy")
+        assert [[2, 4], [6, 8]] == (m + m).array
+
+    def test_scalar_mul(self):
+        m = Matrix([[1, 2], [3, 4]], backend="numpy")
+        m.scalar_multiplication(2)
+        assert [[2, 4], [6, 8]] == m.array
+
+    def test_transpose(self):
+        m = Matrix([[1, 2, 3], [8, 9, 0]], backend="numpy")
+        m.transpose()
+        assert [[1, 8], [2, 9], [3, 0]] == m.array
+        assert (3, 2) == (m.num_rows, m.num_columns)
+
+    def test_row_operations(self):
+        m = Matrix([[1, 2, 3], [8, 9, 0]], backend="numpy")
+        m.swap_rows(0, 1)
+        assert [[8, 9, 0], [1, 2, 3]] == m.array
+        m.multiply_row(1, 0.5)
+        assert [[8, 9, 0], [0.5, 1, 1.5]] == m.array
+        m.add_rows(1, 0, scalar=-2)
+        assert [[7, 7, -3], [0.5, 1, 1.5]] == m.array
+
+    def test_rref(self):
+        m = Matrix([[0, 1, 2], [1, 2, 1], [2, 7, 8]], backend="numpy")
+        m.rref()
+        assert [[1, 0, -3], [0, 1, 2], [0, 0, 0]] == m.array
+
+    def test_rank(self):
+        m = Matrix([[1, 2], [3, 4], [2, 5]], backend="numpy")
+        assert 2 == m.rank()
+
+    def test_matches_python(self):
+        np = pytest.importorskip("numpy")
+        rng = np.random.default_rng(0)
+        a, b = rng.random((40, 30)).tolist(), rng.random((30, 20)).tolist()
+        expected = Matrix(a, backend="python") * Matrix(b, backend="python")
+        actual = Matrix(a, backend="numpy") * Matrix(b, backend="numpy")
+        assert np.allclose(expected.array, actual.array)
+
+
+class TestArrayBackend:
+    def test_flat_storage(self):
+        m = Matrix([[1, 2, 3], [4, 5, 6]], backend="array")
+        assert [1.0, 2.0, 3.0, 4.0, 5.0, 6.0] == list(m._data)
+        assert [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]] == m.array
+        assert not hasattr(m, "__dict__")
+
+    def test_row_operations(self):
+        m = Matrix([[1, 2, 3], [8, 9, 0]], backend="array")
+        m.swap_rows(0, 1)
+        assert [[8, 9, 0], [1, 2, 3]] == m.array
+        m.multiply_row(1, 0.5)
+        assert [[8, 9, 0], [0.5, 1, 1.5]] == m.array
+        m.add_rows(1, 0, scalar=-2)
+        assert [[7, 7, -3], [0.5, 1, 1.5]] == m.array
+        m.scalar_multiplication(2)
+        assert [[14, 14, -6], [1, 2, 3]] == m.array
+
+    def test_transpose(self):
+        m = Matrix([[1, 2, 3], [8, 9, 0]], backend="array")
+        assert [[1, 8], [2, 9], [3, 0]] == m.transposed().array
+        m.transpose()
+        assert [[1, 8], [2, 9], [3, 0]] == m.array
+        assert (3, 2) == (m.num_rows, m.num_columns)
+
+    def test_mul(self):
+        m = Matrix([[1, 2], [3, 4]], backend="array")
+        product = m * Matrix([[1, 2], [3, 4]], backend="python")
+        assert "array" == product.backend
+        assert [[7, 10], [15, 22]] == product.array
+        assert [[2, 4], [6, 8]] == (m + m).array
+
+    def test_rref_and_rank(self):
+        m = Matrix([[1, 2], [3, 4], [2, 5]], backend="array")
+        assert 2 == m.rank()
+        assert [0, 1] == m.rref()
+        assert pytest.approx([1.0, 0.0]) == m.array[0]
+        assert pytest.approx([0.0, 0.0]) == m.array[2]
+
+    def test_buffer(self):
+        m = Matrix([[1, 2, 3], [4, 5, 6]], backend="array")
+        view = m.buffer()
+        assert (2, 3) == view.shape
+        assert 6.0 == view[1, 2]
+        m.multiply_row(1, 2)
+        assert 12.0 == view[1, 2]
+        with pytest.raises(TypeError):
+            Matrix([[1, 2]], backend="python").buffer()
+
+    def test_numpy_shares_storage(self):
+        np = pytest.importorskip("numpy")
+        m = Matrix([[1, 2], [3, 4]], backend="array")
+        a = np.asarray(m)
+        assert (2, 2) == a.shape
+        a[0, 0] = 7
+        assert [[7, 2], [3, 4]] == m.array
+        assert [[1.0, 2.0]] == Matrix(np.array([[1, 2]]), backend="array").array
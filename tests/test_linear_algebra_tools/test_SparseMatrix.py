@@ -0,0 +1,170 @@
+import pytest
+
+from mttools.linear_algebra_tools import SparseMatrix, bicgstab, conjugate_gradient
+from mttools.linear_algebra_tools.matrix import Matrix
+from mttools.linear_algebra_tools.vector import Vector
+from mttools.utils.exceptions import DimensionError, NoConvergenceWarning
+
+A = [[1, 0, 2, 0], [0, 0, 3, 0], [4, 5, 0, 0]]
+B = [[0, 1], [2, 0], [0, 0], [3, 4]]
+
+
+def multiply(a, b):
+    return [[sum(x * y for x, y in zip(row, col)) for col in zip(*b)] for row in a]
+
+
+def laplacian(k):
+    """
+    The 5 point Laplacian of a k by k grid, symmetric positive definite
+    """
+    rows, columns, values = [], [], []
+    for i in range(k):
+        for j in range(k):
+            rows.append(i * k + j)
+            columns.append(i * k + j)
+            values.append(4.0)
+            for di, dj in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                if 0 <= i + di < k and 0 <= j + dj < k:
+                    rows.append(i * k + j)
+                    columns.append((i + di) * k + j + dj)
+                    values.append(-1.0)
+    return rows, columns, values, (k * k, k * k)
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    return request.param
+
+
+class TestInit:
+    def test_csr(self):
+        m = SparseMatrix([1, 2, 3, 4, 5], [0, 2, 2, 0, 1], [0, 2, 3, 5], (3, 4))
+        assert A == m.to_dense()
+        assert 5 == m.nnz
+        assert (3, 4) == m.shape
+
+    def test_bad_indptr(self):
+        with pytest.raises(DimensionError):
+            SparseMatrix([1, 2], [0, 1], [0, 2], (2, 2))
+        with pytest.raises(DimensionError):
+            SparseMatrix([1, 2], [0, 1], [0, 1, 1], (2, 2))
+
+    def test_from_coo_sums_repeats(self, backend):
+        m = SparseMatrix.from_coo(
+            [2, 0, 2, 1, 0, 1], [0, 0, 0, 1, 1, 1], [1, 5, 2, 3, 1, -3], (3, 2), backend
+        )
+        assert [[5, 1], [0, 0], [3, 0]] == m.to_dense()
+        assert 3 == m.nnz
+
+    def test_from_coo_out_of_range(self):
+        with pytest.raises(IndexError):
+            SparseMatrix.from_coo([0, 2], [0, 0], [1, 1], (2, 2))
+
+    def test_from_dense(self, backend):
+        m = SparseMatrix.from_dense(A, backend)
+        assert [1, 2, 3, 4, 5] == list(m.data)
+        assert [0, 2, 2, 0, 1] == list(m.indices)
+        assert [0, 2, 3, 5] == list(m.indptr)
+        assert A == SparseMatrix.from_dense(Matrix(A)).to_dense()
+
+    def test_getitem(self, backend):
+        m = SparseMatrix.from_dense(A, backend)
+        assert all(A[i][j] == m[i, j] for i in range(3) for j in range(4))
+        with pytest.raises(IndexError):
+            m[3, 0]
+
+    def test_default_backend(self):
+        assert "python" == SparseMatrix.from_dense(A).backend
+        np = pytest.importorskip("numpy")
+        assert "numpy" == SparseMatrix.from_dense(np.array(A)).backend
+        floats = [[float(i + j) for j in range(40)] for i in range(40)]
+        assert "python" == SparseMatrix.from_dense(floats).backend
+
+
+class TestTranspose:
+    def test_transpose(self, backend):
+        m = SparseMatrix.from_dense(A, backend)
+        m.transpose()
+        assert [list(column) for column in zip(*A)] == m.to_dense()
+        assert (4, 3) == m.shape
+
+
+class TestMultiply:
+    def test_sparse_sparse(self, backend):
+        product = SparseMatrix.from_dense(A, backend) * SparseMatrix.from_dense(B)
+        assert isinstance(product, SparseMatrix)
+        assert multiply(A, B) == product.to_dense()
+
+    def test_cancelling_products_not_stored(self, backend):
+        a = SparseMatrix.from_dense([[1, 1]], backend)
+        b = SparseMatrix.from_dense([[1], [-1]], backend)
+        assert 0 == (a * b).nnz
+
+    def test_sparse_dense(self, backend):
+        product = SparseMatrix.from_dense(A, backend) * Matrix(B)
+        assert isinstance(product, Matrix)
+        assert multiply(A, B) == product.array
+
+    def test_dense_sparse(self, backend):
+        product = Matrix(A) * SparseMatrix.from_dense(B, backend)
+        assert isinstance(product, Matrix)
+        assert multiply(A, B) == product.array
+
+    def test_dense_view(self, backend):
+        m = SparseMatrix.from_dense(A, backend)
+        bt = Matrix([list(column) for column in zip(*B)], backend)
+        assert multiply(A, B) == (m * bt.T).array
+        rows = Matrix(B + [[7, 7]], backend).view(slice(0, 4))
+        assert multiply(A, B) == (m * rows).array
+        at = Matrix([list(column) for column in zip(*A)], backend)
+        product = at.T * SparseMatrix.from_dense(B, backend)
+        assert multiply(A, B) == product.array
+
+    def test_vector(self, backend):
+        m = SparseMatrix.from_dense(A, backend)
+        assert Vector([7, 9, 9]) == m * Vector([1, 1, 3, 5])
+        assert [7, 9, 9] == m.matvec([1, 1, 3, 5])
+
+    def test_scalar(self, backend):
+        m = SparseMatrix.from_dense(A, backend)
+        assert [[2 * v for v in row] for row in A] == (2 * m).to_dense()
+        assert 0 == (m * 0).nnz
+
+    def test_bad_dimensions(self):
+        m = SparseMatrix.from_dense(A)
+        with pytest.raises(DimensionError):
+            m * m
+        with pytest.raises(DimensionError):
+            m.matvec([1, 2, 3])
+
+
+class TestSolve:
+    @pytest.mark.parametrize("method", ["cg", "bicgstab"])
+    def test_laplacian(self, backend, method):
+        rows, columns, values, shape = laplacian(12)
+        m = SparseMatrix.from_coo(rows, columns, values, shape, backend)
+        x = m.solve([1.0] * shape[0], method)
+        assert pytest.approx([1.0] * shape[0], abs=1e-8) == list(m.matvec(x))
+
+    def test_bicgstab_nonsymmetric(self, backend):
+        m = SparseMatrix.from_dense([[4, 1, 0], [2, 5, 1], [0, 3, 6]], backend)
+        x = bicgstab(m, Vector([5, 8, 9]))
+        assert isinstance(x, Vector)
+        assert pytest.approx([1.0, 1.0, 1.0]) == list(x.coords)
+
+    def test_not_positive_definite(self):
+        m = SparseMatrix.from_dense([[1, 0], [0, -1]])
+        with pytest.raises(NoConvergenceWarning):
+            conjugate_gradient(m, [1, 1])
+
+    def test_no_convergence(self):
+        rows, columns, values, shape = laplacian(12)
+        m = SparseMatrix.from_coo(rows, columns, values, shape)
+        with pytest.raises(NoConvergenceWarning):
+            m.solve([1.0] * shape[0], max_iterations=3)
+
+    def test_bad_method(self):
+        with pytest.raises(ValueError):
+            SparseMatrix.from_dense([[1]]).solve([1], "gmres")
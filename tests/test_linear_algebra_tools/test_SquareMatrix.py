@@ -1,6 +1,10 @@
+import random
+from fractions import Fraction
+
 import pytest
 
-from mttools.linear_algebra_tools.matrix import SquareMatrix
+from mttools.linear_algebra_tools import matrix
+from mttools.linear_algebra_tools.matrix import Matrix, SquareMatrix
 from mttools.utils.exceptions import DimensionError, NoInverseWarning
 
 
@@ -55,6 +59,28 @@ class TestInverse:
             m.inverse()
         assert [[1, 2], [1, 2]] == m.array
 
+    def test_inverse_exact(self):
+        # Hilbert matrices are badly conditioned, with integer inverses
+        hilbert = [[Fraction(1, r + c + 1) for c in range(8)] for r in range(8)]
+        m = SquareMatrix(hilbert)
+        m.inverse()
+        assert all(value.denominator == 1 for row in m.array for value in row)
+        assert m.identity_matrix().array == (m * SquareMatrix(hilbert)).array
+
+    def test_inverse_inexact(self):
+        m = SquareMatrix([[1, 2], [3, 4]])
+        m.inverse(exact=False)
+        assert pytest.approx([-2.0, 1.0]) == m.array[0]
+        assert isinstance(m.array[0][0], float)
+
+    def test_inversed(self):
+        m = SquareMatrix([[1, 2], [3, 4]])
+        inverse = m.inversed()
+        assert isinstance(inverse, SquareMatrix)
+        assert [[-2, 1], [Fraction(3, 2), Fraction(-1, 2)]] == inverse.array
+        assert [[1, 2], [3, 4]] == m.array
+        assert pytest.approx([-2.0, 1.0]) == m.inversed(exact=False).array[0]
+
 
 class TestIdenity:
     def test_rref_to_id(self):
@@ -96,3 +122,100 @@ class TestTrace:
     def test_trace(self):
         m = SquareMatrix([[1, 2], [3, 4]])
         assert 5 == m.trace()
+
+
+def random_array(n, seed):
+    rng = random.Random(seed)
+    return [[rng.randint(-50, 50) for _ in range(n)] for _ in range(n)]
+
+
+class TestStrassen:
+    @pytest.mark.parametrize("n", [1, 2, 7, 16, 21])
+    @pytest.mark.parametrize("crossover", [1, 4, 32])
+    def test_matches_classical(self, n, crossover):
+        a, b = SquareMatrix(random_array(n, 0)), SquareMatrix(random_array(n, 1))
+        expected = Matrix.__mul__(a, b).array
+        product = a.strassen_multiply(b, crossover)
+        assert isinstance(product, SquareMatrix)
+        assert expected == product.array
+
+    def test_fractions(self):
+        a = [[Fraction(1, r + c + 1) for c in range(5)] for r in range(5)]
+        product = SquareMatrix(a).strassen_multiply(SquareMatrix(a), crossover=1)
+        assert Matrix.__mul__(SquareMatrix(a), SquareMatrix(a)).array == product.array
+
+    def test_mul_dispatch(self, monkeypatch):
+        monkeypatch.setattr(matrix, "STRASSEN_CROSSOVER", 2)
+        calls = []
+        strassen = SquareMatrix.strassen_multiply
+        monkeypatch.setattr(
+            SquareMatrix,
+            "strassen_multiply",
+            lambda self, other: calls.append(1) or strassen(self, other),
+        )
+        a, b = SquareMatrix(random_array(5, 0)), SquareMatrix(random_array(5, 1))
+        assert Matrix.__mul__(a, b).array == (a * b).array
+        assert 1 == len(calls)
+        SquareMatrix([[0.5, 1.0], [2.0, 3.0]]) * SquareMatrix([[1, 2], [3, 4]])
+        assert 1 == len(calls)
+
+    def test_bad_arguments(self):
+        m = SquareMatrix([[1, 2], [3, 4]])
+        with pytest.raises(ValueError):
+            m.strassen_multiply(m, crossover=0)
+        with pytest.raises(DimensionError):
+            m.strassen_multiply(SquareMatrix([[1]]))
+
+
+class TestArrayBackend:
+    def test_inverse(self):
+        m = SquareMatrix([[1, 2], [3, 4]], backend="array")
+        m.inverse()
+        assert pytest.approx([-2.0, 1.0]) == m.array[0]
+        assert pytest.approx([1.5, -0.5]) == m.array[1]
+
+    def test_determinate_and_trace(self):
+        m = SquareMatrix([[1, 3, 2], [4, 1, 3], [2, 5, 2]], backend="array")
+        assert 17 == pytest.approx(m.determinate())
+        assert 4 == m.trace()
+
+    def test_solve(self):
+        m = SquareMatrix([[2, 1], [1, 3]], backend="array")
+        assert pytest.approx([1.0, 2.0]) == m.solve([4, 7])
+        assert isinstance(m * m, SquareMatrix)
+
+
+class TestNumpyBackend:
+    @pytest.fixture(autouse=True)
+    def numpy(self):
+        pytest.importorskip("numpy")
+
+    def test_mul_returns_square_matrix(self):
+        m = SquareMatrix([[1, 2], [3, 4]], backend="numpy")
+        assert isinstance(m * m, SquareMatrix)
+        assert [[7, 10], [15, 22]] == (m * m).array
+
+    def test_inverse(self):
+        np = pytest.importorskip("numpy")
+        m = SquareMatrix([[1, 2], [3, 4]], backend="numpy")
+        m.inverse()
+        assert np.allclose([[-2, 1], [3 / 2, -1 / 2]], m.array)
+
+    def test_inverse_no_inverse(self):
+        m = SquareMatrix([[1, 2], [1, 2]], backend="numpy")
+        with pytest.raises(NoInverseWarning):
+            m.inverse()
+        assert [[1, 2], [1, 2]] == m.array
+
+    def test_determinate(self):
+        m = SquareMatrix([[1, 3, 2], [4, 1, 3], [2, 5, 2]], backend="numpy")
+        assert 17 == pytest.approx(m.determinate())
+
+    def test_trace(self):
+        m = SquareMatrix([[1, 2], [3, 4]], backend="numpy")
+        assert 5 == m.trace()
+
+    def test_identity(self):
+        m = SquareMatrix([[1, 2, 3], [3, 4, 5], [5, 8, 7]], backend="numpy")
+        m.rref()
+        assert m.identity_matrix().array == m.array
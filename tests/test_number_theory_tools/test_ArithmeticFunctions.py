@@ -0,0 +1,100 @@
+from array import array
+
+import pytest
+
+from mttools.number_theory_tools import divisor_sum
+from mttools.number_theory_tools.Primes import prime_factors
+from mttools.number_theory_tools.ArithmeticFunctions import (
+    totient_range,
+    mobius_range,
+    sigma_range,
+    totient_segments,
+    mobius_segments,
+    sigma_segments,
+)
+
+N = 2000
+
+
+def totient(n):
+    if n == 0:
+        return 0
+    for p in prime_factors(n):
+        n = n // p * (p - 1)
+    return n
+
+
+def mobius(n):
+    if n == 0:
+        return 0
+    factors = prime_factors(n)
+    if any(e > 1 for e in factors.values()):
+        return 0
+    return (-1) ** len(factors)
+
+
+def sigma(n, k):
+    return divisor_sum(n, k) if n else 0
+
+
+def join_segments(segments):
+    values = []
+    for start, block in segments:
+        assert len(values) == start
+        values.extend(block)
+    return values
+
+
+@pytest.fixture(params=[False, True])
+def use_numpy(request):
+    if request.param:
+        pytest.importorskip("numpy")
+    return request.param
+
+
+class TestTotientRange:
+    def test_values(self, use_numpy):
+        assert [totient(n) for n in range(N)] == list(totient_range(N, use_numpy))
+
+    def test_small(self, use_numpy):
+        assert [] == list(totient_range(0, use_numpy))
+        assert [0] == list(totient_range(1, use_numpy))
+        assert [0, 1, 1, 2, 2, 4] == list(totient_range(6, use_numpy))
+
+    def test_buffer_type(self):
+        assert isinstance(totient_range(10, use_numpy=False), array)
+
+    @pytest.mark.parametrize("segment_size", [1, 7, 256])
+    def test_segments(self, use_numpy, segment_size):
+        assert [totient(n) for n in range(N)] == join_segments(
+            totient_segments(N, segment_size, use_numpy)
+        )
+
+
+class TestMobiusRange:
+    def test_values(self, use_numpy):
+        assert [mobius(n) for n in range(N)] == list(mobius_range(N, use_numpy))
+
+    @pytest.mark.parametrize("segment_size", [1, 7, 256])
+    def test_segments(self, use_numpy, segment_size):
+        assert [mobius(n) for n in range(N)] == join_segments(
+            mobius_segments(N, segment_size, use_numpy)
+        )
+
+
+class TestSigmaRange:
+    @pytest.mark.parametrize("k", [0, 1, 2, 3])
+    def test_values(self, use_numpy, k):
+        assert [sigma(n, k) for n in range(N)] == list(sigma_range(N, k, use_numpy))
+
+    @pytest.mark.parametrize("segment_size", [1, 7, 256])
+    def test_segments(self, use_numpy, segment_size):
+        assert [sigma(n, 2) for n in range(N)] == join_segments(
+            sigma_segments(N, 2, segment_size, use_numpy)
+        )
+
+    def test_negative_k(self):
+        with pytest.raises(ValueError):
+            sigma_range(10, -1)
+        with pytest.raises(ValueError):
+            sigma_segments(10, -1)
@@ -0,0 +1,106 @@
+from hypothesis import given
+import hypothesis.strategies as st
+import pytest
+
+from mttools.number_theory_tools.Modular import ModContext, crt
+
+ODD_MODULUS = 2 ** 127 - 1
+EVEN_MODULUS = 2 ** 100 + 6
+REDUCTIONS = [
+    (ODD_MODULUS, "builtin"),
+    (ODD_MODULUS, "barrett"),
+    (ODD_MODULUS, "montgomery"),
+    (EVEN_MODULUS, "builtin"),
+    (EVEN_MODULUS, "barrett"),
+]
+
+
+class TestModContext:
+    def test_bad_modulus(self):
+        with pytest.raises(ValueError):
+            ModContext(1)
+
+    def test_bad_reduction(self):
+        with pytest.raises(ValueError):
+            ModContext(97, "division")
+        with pytest.raises(ValueError):
+            ModContext(96, "montgomery")
+
+    def test_default_reduction(self):
+        assert "builtin" == ModContext(97).reduction
+        assert "builtin" == ModContext(2 ** 10000 + 1).reduction
+
+    @pytest.mark.parametrize("m,reduction", REDUCTIONS)
+    @given(st.integers(min_value=0), st.integers(min_value=0))
+    def test_mul(self, m, reduction, a, b):
+        context = ModContext(m, reduction)
+        assert a % m * (b % m) % m == context.mul(a % m, b % m)
+
+    @pytest.mark.parametrize("m,reduction", REDUCTIONS)
+    @given(st.integers())
+    def test_reduce(self, m, reduction, x):
+        assert x % m == ModContext(m, reduction).reduce(x)
+
+    @pytest.mark.parametrize("m,reduction", REDUCTIONS)
+    @given(st.integers(min_value=0), st.integers(min_value=0, max_value=2 ** 300))
+    def test_pow(self, m, reduction, base, exp):
+        assert pow(base, exp, m) == ModContext(m, reduction).pow(base, exp)
+
+    def test_negative_exponent(self):
+        assert 4 == ModContext(11).pow(3, -1)
+        assert 5 == ModContext(11, "barrett").pow(3, -2)
+
+    def test_pow_many(self):
+        assert [1, 4, 9, 5] == ModContext(11).pow_many([1, 2, 3, 4], 2)
+
+    def test_montgomery_form(self):
+        context = ModContext(97)
+        a = context.to_montgomery(5)
+        b = context.to_montgomery(7)
+        assert 35 == context.from_montgomery(context.montgomery_mul(a, b))
+
+    def test_montgomery_form_needs_odd_modulus(self):
+        with pytest.raises(ValueError):
+            ModContext(96).to_montgomery(5)
+
+
+class TestFixedBaseTable:
+    @pytest.mark.parametrize("m,reduction", REDUCTIONS)
+    @pytest.mark.parametrize("window", [1, 4, 5])
+    def test_pow(self, m, reduction, window):
+        table = ModContext(m, reduction).fixed_base(3, 256, window)
+        for exp in [0, 1, 2, 255, 2 ** 128 + 1, 2 ** 256 - 1]:
+            assert pow(3, exp, m) == table.pow(exp)
+
+    def test_pow_many(self):
+        table = ModContext(11).fixed_base(2, 8)
+        assert [1, 2, 4, 8, 5] == table.pow_many(range(5))
+
+    def test_exponent_too_large(self):
+        table = ModContext(11).fixed_base(2, 8)
+        with pytest.raises(ValueError):
+            table.pow(256)
+
+
+class TestCRT:
+    def test_coprime(self):
+        assert (23, 105) == crt([2, 3, 2], [3, 5, 7])
+
+    def test_not_coprime(self):
+        assert (9, 12) == crt([1, 3], [4, 6])
+
+    def test_no_solution(self):
+        with pytest.raises(ValueError):
+            crt([1, 2], [4, 6])
+
+    def test_empty(self):
+        assert (0, 1) == crt([], [])
+
+    @given(
+        st.integers(min_value=0, max_value=10 ** 30),
+        st.lists(st.integers(min_value=1, max_value=10 ** 6), min_size=1, max_size=6),
+    )
+    def test_recovers_solution(self, x, moduli):
+        solution, modulus = crt([x % m for m in moduli], moduli)
+        assert all(solution % m == x % m for m in moduli)
+        assert x % modulus == solution
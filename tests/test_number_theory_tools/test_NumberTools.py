@@ -1,7 +1,23 @@
-from mttools.number_theory_tools import perfect_factors, gcd
+import math
 
+from hypothesis import given
+import hypothesis.strategies as st
 import pytest
 
+from mttools.number_theory_tools import (
+    divisor_count,
+    divisor_sum,
+    gcd,
+    gcd_array,
+    gcd_many,
+    iter_perfect_factors,
+    lcm,
+    lcm_many,
+    mod_inverse,
+    perfect_factors,
+    xgcd,
+)
+
 
 class TestPerfectFactors:
     @pytest.mark.parametrize("n,e", [(32, [1, 2, 4, 8, 16, 32]),])
@@ -18,6 +34,58 @@ class TestPerfectFactors:
             e.remove(factor)
         assert not e  # Should be empty
 
+    def test_from_factorization(self):
+        expected = [1, 2, 3, 4, 6, 9, 12, 18, 36]
+        assert expected == perfect_factors(36, use_factorization=True)
+
+    def test_unsorted(self):
+        factors = perfect_factors(36, use_factorization=True, sort=False)
+        assert [1, 2, 3, 4, 6, 9, 12, 18, 36] == sorted(factors)
+
+    def test_highly_composite(self):
+        factors = perfect_factors(963761198400, use_factorization=True)
+        assert 6720 == len(factors)
+        assert all(963761198400 % f == 0 for f in factors)
+
+    @given(st.integers(min_value=2, max_value=10 ** 6))
+    def test_methods_agree(self, n):
+        assert perfect_factors(n) == perfect_factors(n, use_factorization=True)
+
+
+class TestIterPerfectFactors:
+    def test_is_lazy(self):
+        factors = iter_perfect_factors(2 ** 64)
+        assert 1 == next(factors)
+
+    def test_one(self):
+        assert [1] == list(iter_perfect_factors(1))
+
+    def test_non_positive(self):
+        with pytest.raises(ValueError):
+            next(iter_perfect_factors(0))
+
+
+class TestDivisorCount:
+    @pytest.mark.parametrize("n,e", [(1, 1), (7, 2), (36, 9), (963761198400, 6720)])
+    def test_divisor_count(self, n, e):
+        assert e == divisor_count(n)
+
+
+class TestDivisorSum:
+    @pytest.mark.parametrize("n,e", [(1, 1), (7, 8), (12, 28), (36, 91)])
+    def test_divisor_sum(self, n, e):
+        assert e == divisor_sum(n)
+
+    @given(st.integers(min_value=2, max_value=10 ** 5), st.integers(0, 3))
+    def test_matches_factors(self, n, k):
+        assert sum(f ** k for f in perfect_factors(n)) == divisor_sum(n, k)
+
+    def test_bad_input(self):
+        with pytest.raises(ValueError):
+            divisor_sum(0)
+        with pytest.raises(ValueError):
+            divisor_sum(10, -1)
+
 
 class TestGCD:
     @pytest.mark.parametrize(
@@ -36,3 +104,81 @@ class TestGCD:
     )
     def test_gcd(self, a, b, e):
         assert e == gcd(a, b)
+
+    def test_fibonacci(self):
+        # Consecutive Fibonacci numbers are the worst case for Euclid
+        a, b = 0, 1
+        for _ in range(5000):
+            a, b = b, a + b
+        assert 1 == gcd(a, b)
+
+    @given(st.integers(), st.integers())
+    def test_matches_math_gcd(self, a, b):
+        assert math.gcd(a, b) == gcd(a, b)
+
+    def test_lehmer(self):
+        common = 3 ** 5000
+        a = common * (2 ** 20000 + 1)
+        b = common * (5 ** 8000 - 1)
+        assert math.gcd(a, b) == gcd(a, b)
+
+
+class TestXGCD:
+    @given(st.integers(), st.integers())
+    def test_bezout(self, a, b):
+        g, x, y = xgcd(a, b)
+        assert math.gcd(a, b) == g
+        assert g == a * x + b * y
+
+    def test_xgcd(self):
+        assert (2, -9, 47) == xgcd(240, 46)
+
+
+class TestModInverse:
+    @pytest.mark.parametrize("a,m,e", [(3, 11, 4), (-3, 11, 7), (1, 1, 0)])
+    def test_mod_inverse(self, a, m, e):
+        assert e == mod_inverse(a, m)
+
+    @pytest.mark.parametrize("a,m", [(6, 9), (5, 0)])
+    def test_no_inverse(self, a, m):
+        with pytest.raises(ValueError):
+            mod_inverse(a, m)
+
+
+class TestLCM:
+    @pytest.mark.parametrize("a,b,e", [(4, 6, 12), (-4, 6, 12), (0, 5, 0), (7, 7, 7)])
+    def test_lcm(self, a, b, e):
+        assert e == lcm(a, b)
+
+    def test_exact_above_2_53(self):
+        a = 2 ** 61 - 1
+        b = 2 ** 89 - 1
+        assert a * b == lcm(a, b)
+
+
+class TestGCDMany:
+    def test_gcd_many(self):
+        assert 6 == gcd_many([12, 18, -30])
+
+    def test_empty(self):
+        assert 0 == gcd_many([])
+
+    def test_numpy_array(self):
+        np = pytest.importorskip("numpy")
+        assert 6 == gcd_many(np.array([12, 18, -30], dtype=np.int64))
+
+
+class TestLCMMany:
+    def test_lcm_many(self):
+        assert 60 == lcm_many([4, 6, 10])
+
+    def test_empty(self):
+        assert 1 == lcm_many([])
+
+
+class TestGCDArray:
+    def test_gcd_array(self):
+        np = pytest.importorskip("numpy")
+        result = gcd_array([12, 7, 0, -9], [18, 21, 5, 6])
+        assert [6, 7, 5, 3] == result.tolist()
+        assert np.int64 == result.dtype
@@ -0,0 +1,136 @@
+import os
+from bisect import bisect_right
+
+import pytest
+
+from mttools.number_theory_tools import PrimeCache
+from mttools.number_theory_tools.PrimeCache import (
+    PrimeTable,
+    get_cache_dir,
+    is_prime_cached,
+    prime_index,
+    prime_table,
+    primes_upto,
+    set_cache_dir,
+)
+from mttools.number_theory_tools.Primes import sieve_of_eratosthenes
+
+PRIMES = sieve_of_eratosthenes(20000)
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    set_cache_dir(str(tmp_path))
+    yield tmp_path
+    set_cache_dir(None)
+
+
+class TestPrimeTable:
+    @pytest.mark.parametrize("limit", [0, 1, 2, 3, 4, 10, 11, 1025, 20000])
+    def test_count(self, limit):
+        assert bisect_right(PRIMES, limit - 1) == PrimeTable(limit).count
+
+    def test_is_prime(self):
+        table = PrimeTable(20000)
+        primes = set(PRIMES)
+        assert all(table.is_prime(n) == (n in primes) for n in range(20000))
+
+    def test_out_of_range(self):
+        table = PrimeTable(100)
+        with pytest.raises(ValueError):
+            table.is_prime(100)
+        with pytest.raises(ValueError):
+            table.is_prime(-1)
+
+    def test_pi(self):
+        table = PrimeTable(20000)
+        for x in range(-1, 20000, 7):
+            assert bisect_right(PRIMES, x) == table.pi(x)
+
+    def test_prime_index(self):
+        table = PrimeTable(20000)
+        for i, p in enumerate(PRIMES, 1):
+            assert i == table.prime_index(p)
+            assert p == table.nth_prime(i)
+        with pytest.raises(ValueError):
+            table.prime_index(91)
+        with pytest.raises(ValueError):
+            table.nth_prime(len(PRIMES) + 1)
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_primes_upto(self, monkeypatch, use_numpy):
+        if use_numpy:
+            pytest.importorskip("numpy")
+        else:
+            monkeypatch.setattr(PrimeCache, "np", None)
+        table = PrimeTable(20000)
+        assert [] == table.primes_upto(1)
+        assert [2] == table.primes_upto(2)
+        for n in (3, 16, 17, 18, 19999):
+            assert PRIMES[: bisect_right(PRIMES, n)] == table.primes_upto(n)
+
+    @pytest.mark.parametrize("memory_map", [True, False])
+    def test_save_load(self, tmp_path, memory_map):
+        path = str(tmp_path / "primes.bin")
+        PrimeTable(20000).save(path)
+        table = PrimeTable.load(path, memory_map)
+        assert 20000 == table.limit
+        assert len(PRIMES) == table.count
+        assert PRIMES == table.primes_upto(19999)
+        assert 1000 == table.prime_index(7919)
+
+    def test_load_bad_file(self, tmp_path):
+        path = tmp_path / "primes.bin"
+        path.write_bytes(b"not a prime table" * 4)
+        with pytest.raises(ValueError):
+            PrimeTable.load(str(path))
+
+
+class TestCacheDir:
+    def test_set_cache_dir(self, cache_dir):
+        assert str(cache_dir) == get_cache_dir()
+
+    def test_env_var(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("MTTOOLS_CACHE_DIR", str(tmp_path))
+        assert str(tmp_path) == get_cache_dir()
+
+
+class TestCachedLookups:
+    def test_table_saved(self, cache_dir):
+        table = prime_table(1000)
+        assert 1 << 20 == table.limit
+        assert ["primes-1048576.bin"] == os.listdir(cache_dir)
+        assert table is prime_table(5000)
+
+    def test_table_loaded(self, cache_dir):
+        prime_table(1000)
+        PrimeCache._TABLE_CACHE.clear()
+        assert 1 << 20 == prime_table(1000).limit
+        assert ["primes-1048576.bin"] == os.listdir(cache_dir)
+
+    def test_larger_saved_table_reused(self, cache_dir):
+        PrimeTable(4096).save(str(cache_dir / "primes-4096.bin"))
+        assert 4096 == prime_table(1000).limit
+        assert ["primes-4096.bin"] == os.listdir(cache_dir)
+
+    def test_is_prime_cached(self, cache_dir):
+        assert is_prime_cached(1000003)
+        assert not is_prime_cached(1000001)
+        assert not is_prime_cached(0)
+
+    def test_above_max_table_limit(self, cache_dir):
+        assert is_prime_cached(2 ** 61 - 1)
+        assert not is_prime_cached(10 ** 12)
+        assert [] == os.listdir(cache_dir)
+        with pytest.raises(ValueError):
+            primes_upto(PrimeCache.MAX_TABLE_LIMIT)
+        with pytest.raises(ValueError):
+            prime_index(2 ** 61 - 1)
+
+    def test_primes_upto(self, cache_dir):
+        assert [] == primes_upto(1)
+        assert [2, 3, 5, 7, 11, 13, 17, 19] == primes_upto(20)
+
+    def test_prime_index(self, cache_dir):
+        assert 1 == prime_index(2)
+        assert 1000 == prime_index(7919)
@@ -1,12 +1,33 @@
+import os
+import random
+from bisect import bisect_right
+
 import pytest
 
+from mttools.number_theory_tools import Primes
 from mttools.number_theory_tools.Primes import (
+    are_prime,
+    _ecm,
+    _lucy_numpy,
+    _lucy_python,
     division_primality_test,
     fermat_primality_test,
+    filter_primes,
+    is_prime,
+    iter_primes,
     largest_prime_less_than,
+    SPFTable,
     prime_factors,
+    prime_factors_many,
+    primes_between,
+    segmented_sieve,
     sieve_of_eratosthenes,
+    sweep_mersenne,
     lucas_lehmer_primality_test,
+    next_prime,
+    nth_prime,
+    prev_prime,
+    prime_pi,
 )
 
 
@@ -27,6 +48,39 @@ class TestFermatPrimalityTest:
         assert not fermat_primality_test(6530, 3)
 
 
+    def test_large_prime(self):
+        assert fermat_primality_test(2 ** 2203 - 1, 3)
+
+
+class TestIsPrime:
+    def test_matches_sieve(self):
+        primes = set(sieve_of_eratosthenes(100000))
+        assert all(is_prime(n) == (n in primes) for n in range(-10, 100000))
+
+    @pytest.mark.parametrize(
+        "n",
+        [
+            561,  # Carmichael
+            2047,  # Strong pseudoprime to base 2
+            3215031751,  # Strong pseudoprime to bases 2, 3, 5, 7
+            3825123056546413051,  # Strong pseudoprime to bases 2 through 23
+            318665857834031151167461,  # Strong pseudoprime to bases 2 through 37
+            3317044064679887385961981,  # Strong pseudoprime to bases 2 through 41
+            5777,  # Strong Lucas pseudoprime
+            (2 ** 61 - 1) * (2 ** 89 - 1),
+            pow(2 ** 31 - 1, 2),
+        ],
+    )
+    def test_pseudoprimes(self, n):
+        assert not is_prime(n)
+
+    @pytest.mark.parametrize(
+        "n", [2 ** 61 - 1, 2 ** 89 - 1, 2 ** 127 - 1, 2 ** 521 - 1, 10 ** 24 + 7]
+    )
+    def test_large_primes(self, n):
+        assert is_prime(n)
+
+
 class TestDivisionPrimalityTest:
     def test_with_prime(self):
         assert division_primality_test(3)
@@ -38,12 +92,103 @@ class TestDivisionPrimalityTest:
         assert not division_primality_test(-1)
         assert not division_primality_test(6530)
 
+    def test_matches_sieve(self):
+        primes = set(sieve_of_eratosthenes(20000))
+        for n in range(-3, 20000):
+            assert (n in primes) == division_primality_test(n)
+
+    def test_large_prime(self):
+        assert division_primality_test(999999999989)
+        assert not division_primality_test(999999999987)
+
+    def test_past_the_cache(self, monkeypatch):
+        import mttools.number_theory_tools.Primes as primes
+
+        monkeypatch.setattr(primes, "_DIVISION_CACHE_LIMIT", 50)
+        monkeypatch.setattr(primes, "_DIVISION_PRIMES", [])
+        monkeypatch.setattr(primes, "_division_bound", 2)
+        assert division_primality_test(105607)
+        assert not division_primality_test(101 * 103)
+        assert 50 == primes._division_bound
+
+
+class TestArePrime:
+    def test_dense_batch(self):
+        primes = set(sieve_of_eratosthenes(1000))
+        assert [n in primes for n in range(-5, 1000)] == are_prime(range(-5, 1000))
+
+    def test_sparse_batch(self):
+        nums = [999999999989, 10 ** 12, 3, 1]
+        assert [True, False, True, False] == are_prime(nums)
+
+    def test_empty(self):
+        assert [] == are_prime([])
+
+    def test_only_negative(self):
+        assert [False, False, False] == are_prime([-5, -3, -100])
+        assert [False] * 3 == [division_primality_test(n) for n in (-5, -3, -100)]
+
 
 class TestSieveOfEratosthenes:
     def test_valid_upper_bound(self):
         expected = [2, 3, 5, 7, 11, 13, 17, 19]
         assert expected == sieve_of_eratosthenes(20)
 
+    @pytest.mark.parametrize("upper_bound", [0, 1, 2, 3, 4])
+    def test_tiny_upper_bound(self, upper_bound):
+        expected = [p for p in [2, 3] if p < upper_bound]
+        assert expected == sieve_of_eratosthenes(upper_bound)
+
+    def test_count_below_one_million(self):
+        assert 78498 == len(sieve_of_eratosthenes(10 ** 6))
+
+
+class TestSegmentedSieve:
+    @pytest.mark.parametrize("segment_size", [1, 2, 7, 64])
+    def test_matches_single_segment(self, segment_size):
+        expected = sieve_of_eratosthenes(2000)
+        assert expected == list(segmented_sieve(2000, segment_size))
+
+    def test_is_lazy(self):
+        primes = segmented_sieve(10 ** 12)
+        assert [2, 3, 5, 7, 11] == [next(primes) for _ in range(5)]
+
+
+class TestPrimesBetween:
+    def test_small_range(self):
+        assert [101, 103, 107, 109, 113, 127] == list(primes_between(100, 130))
+
+    def test_includes_lower_excludes_upper(self):
+        assert [2, 3, 5] == list(primes_between(2, 7))
+
+    @pytest.mark.parametrize("lo,hi", [(0, 2), (14, 17), (100, 50)])
+    def test_empty_range(self, lo, hi):
+        assert [] == list(primes_between(lo, hi))
+
+    @pytest.mark.parametrize("lo,hi", [(0, 500), (3, 4), (498, 1024), (997, 998)])
+    def test_matches_sieve(self, lo, hi):
+        expected = [p for p in sieve_of_eratosthenes(hi) if p >= lo]
+        assert expected == list(primes_between(lo, hi, segment_size=8))
+
+    def test_large_window(self):
+        primes = list(primes_between(10 ** 12, 10 ** 12 + 1000))
+        assert 1000000000039 == primes[0]
+        assert 1000000000999 >= primes[-1]
+        assert 37 == len(primes)
+
+
+class TestIterPrimes:
+    def test_unbounded(self):
+        primes = iter_primes(segment_size=4)
+        assert sieve_of_eratosthenes(1000) == [next(primes) for _ in range(168)]
+
+    def test_unbounded_with_start(self):
+        primes = iter_primes(10 ** 12)
+        assert 1000000000039 == next(primes)
+
+    def test_bounded(self):
+        assert [11, 13, 17, 19] == list(iter_primes(10, 20))
+
 
 class TestPrimeFactors:
     def test_large_number(self):
@@ -58,6 +203,94 @@ class TestPrimeFactors:
     def test_prime_number(self):
         assert {23: 1} == prime_factors(23)
 
+    @pytest.mark.parametrize("num", [-12, 0, 1])
+    def test_no_prime_factors(self, num):
+        assert {} == prime_factors(num)
+
+    def test_matches_trial_division(self):
+        for num in range(2, 3000):
+            factors = prime_factors(num)
+            product = 1
+            for p, power in factors.items():
+                assert is_prime(p)
+                product *= p ** power
+            assert num == product
+
+    def test_64_bit_semiprime(self):
+        expected = {4294967279: 1, 4294967291: 1}
+        assert expected == prime_factors(4294967279 * 4294967291)
+
+    def test_large_prime_power(self):
+        expected = {3: 1, 2 ** 31 - 1: 3, 2 ** 61 - 1: 1}
+        assert expected == prime_factors(3 * (2 ** 31 - 1) ** 3 * (2 ** 61 - 1))
+
+    def test_ecm_finds_40_bit_factor(self):
+        p = 2 ** 40 - 87
+        q = 2 ** 80 - 65
+        assert p == _ecm(p * q, 2000, 25, random.Random(0))
+
+
+class TestSPFTable:
+    def test_matches_prime_factors(self):
+        table = SPFTable(5000)
+        for n in range(5000):
+            assert prime_factors(n) == table.factorize(n)
+
+    def test_smallest_prime_factor(self):
+        table = SPFTable(100)
+        assert 7 == table.smallest_prime_factor(91)
+        assert 97 == table.smallest_prime_factor(97)
+        with pytest.raises(ValueError):
+            table.smallest_prime_factor(100)
+
+    def test_factorize_out_of_range(self):
+        with pytest.raises(ValueError):
+            SPFTable(100).factorize(100)
+
+    @pytest.mark.parametrize("memory_map", [True, False])
+    def test_save_and_load(self, tmp_path, memory_map):
+        path = str(tmp_path / "spf.bin")
+        SPFTable(1000).save(path)
+        table = SPFTable.load(path, memory_map=memory_map)
+        assert 1000 == table.limit
+        assert {2: 3, 3: 1, 41: 1} == table.factorize(984)
+
+    def test_save_replaces(self, tmp_path):
+        path = str(tmp_path / "spf.bin")
+        SPFTable(100).save(path)
+        old = SPFTable.load(path)
+        SPFTable(1000).save(path)
+        assert ["spf.bin"] == [p.name for p in tmp_path.iterdir()]
+        assert 100 == old.limit
+        assert {2: 3, 3: 1, 41: 1} == SPFTable.load(path).factorize(984)
+
+    def test_load_bad_file(self, tmp_path):
+        path = tmp_path / "not_spf.bin"
+        path.write_bytes(b"0" * 64)
+        with pytest.raises(ValueError):
+            SPFTable.load(str(path))
+
+
+class TestPrimeFactorsMany:
+    def test_matches_prime_factors(self):
+        nums = [0, 1, 2, 12, 97, 1024, 99999]
+        assert [prime_factors(n) for n in nums] == prime_factors_many(nums)
+
+    def test_with_table(self):
+        table = SPFTable(50)
+        assert [{2: 1, 5: 2}, {3: 1, 23: 1}] == prime_factors_many([50, 69], table)
+
+    def test_larger_than_table(self):
+        table = SPFTable(50)
+        assert [{2: 1}, {17: 1, 257: 1}] == prime_factors_many([2, 4369], table)
+
+    def test_table_sized_below_limit(self, monkeypatch):
+        monkeypatch.setattr(Primes, "_SPF_CACHE", [])
+        assert [{10 ** 13 + 37: 1}] == prime_factors_many([10 ** 13 + 37])
+        assert [] == Primes._SPF_CACHE
+        prime_factors_many([100, 10 ** 13 + 37])
+        assert 1 << 16 == Primes._SPF_CACHE[0].limit
+
 
 class TestLargestPrimeLessThan:
     def test_no_primes_less_than(self):
@@ -70,6 +303,72 @@ class TestLargestPrimeLessThan:
         assert 105023 == largest_prime_less_than(105030)
 
 
+class TestNextPrime:
+    def test_matches_sieve(self):
+        primes = sieve_of_eratosthenes(2000)
+        for n in range(-2, 1990):
+            assert min(p for p in primes if p > n) == next_prime(n)
+
+    def test_large_num(self):
+        assert 1000000000039 == next_prime(10 ** 12)
+
+    def test_512_bit(self):
+        p = next_prime(2 ** 511)
+        assert is_prime(p)
+        assert not any(is_prime(n) for n in range(2 ** 511, p))
+
+
+class TestPrimePi:
+    def test_matches_sieve(self):
+        primes = sieve_of_eratosthenes(200000)
+        for x in list(range(-2, 100)) + [65535, 65536, 65537, 99991, 199999]:
+            assert bisect_right(primes, x) == prime_pi(x)
+
+    @pytest.mark.parametrize("x", [4, 5, 48, 49, 50, 1000, 123456, 199999])
+    def test_lucy_python(self, x):
+        primes = sieve_of_eratosthenes(200000)
+        assert bisect_right(primes, x) == _lucy_python(x)
+
+    @pytest.mark.parametrize("x", [4, 5, 48, 49, 50, 1000, 123456, 199999])
+    def test_lucy_numpy(self, x):
+        pytest.importorskip("numpy")
+        primes = sieve_of_eratosthenes(200000)
+        assert bisect_right(primes, x) == _lucy_numpy(x)
+
+    def test_large_num(self):
+        assert 455052511 == prime_pi(10 ** 10)
+
+
+class TestNthPrime:
+    def test_matches_sieve(self):
+        primes = sieve_of_eratosthenes(200000)
+        for n in list(range(1, 500)) + [5000, 12345, len(primes)]:
+            assert primes[n - 1] == nth_prime(n)
+
+    def test_large_n(self):
+        assert 15485863 == nth_prime(10 ** 6)
+        assert 22801763489 == nth_prime(10 ** 9)
+
+    def test_bad_n(self):
+        with pytest.raises(ValueError):
+            nth_prime(0)
+
+
+class TestPrevPrime:
+    @pytest.mark.parametrize("num", [-5, 0, 1, 2])
+    def test_no_primes_less_than(self, num):
+        assert prev_prime(num) is None
+
+    def test_matches_sieve(self):
+        primes = sieve_of_eratosthenes(2000)
+        for n in range(3, 2000):
+            assert max(p for p in primes if p < n) == prev_prime(n)
+
+    def test_512_bit(self):
+        p = prev_prime(2 ** 512)
+        assert 2 ** 512 - 569 == p
+
+
 class TestLucasLehmerPrimalityTest:
     def test_requires_mersenne_number(self):
         with pytest.raises(ValueError):
@@ -80,3 +379,81 @@ class TestLucasLehmerPrimalityTest:
 
     def test_with_composite(self):
         assert not lucas_lehmer_primality_test(2 ** 30 - 1)
+
+    def test_mersenne_exponents(self):
+        exponents = [2, 3, 5, 7, 13, 17, 19, 31, 61, 89, 107, 127, 521, 607]
+        candidates = sieve_of_eratosthenes(700)
+        assert exponents == [
+            p for p in candidates if lucas_lehmer_primality_test(2 ** p - 1)
+        ]
+
+    def test_progress(self):
+        calls = []
+        lucas_lehmer_primality_test(2 ** 13 - 1, progress=lambda *a: calls.append(a))
+        assert [(i, 11) for i in range(1, 12)] == calls
+
+    @staticmethod
+    def interrupt_at(stop):
+        def progress(iteration, total):
+            if iteration == stop:
+                raise KeyboardInterrupt
+
+        return progress
+
+    def test_resume_from_checkpoint(self, tmp_path):
+        path = str(tmp_path / "ll.json")
+        with pytest.raises(KeyboardInterrupt):
+            lucas_lehmer_primality_test(
+                2 ** 607 - 1,
+                self.interrupt_at(300),
+                checkpoint=path,
+                checkpoint_interval=100,
+            )
+        assert os.path.exists(path)
+
+        calls = []
+        assert lucas_lehmer_primality_test(
+            2 ** 607 - 1, lambda *a: calls.append(a), checkpoint=path
+        )
+        assert (301, 605) == calls[0]
+        assert not os.path.exists(path)
+
+    def test_checkpoint_for_other_exponent(self, tmp_path):
+        path = str(tmp_path / "ll.json")
+        with pytest.raises(KeyboardInterrupt):
+            lucas_lehmer_primality_test(
+                2 ** 127 - 1,
+                self.interrupt_at(50),
+                checkpoint=path,
+                checkpoint_interval=10,
+            )
+        with pytest.raises(ValueError):
+            lucas_lehmer_primality_test(2 ** 521 - 1, checkpoint=path)
+
+
+class TestSweepMersenne:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_sweep(self, workers):
+        expected = [2, 3, 5, 7, 13, 17, 19, 31, 61, 89, 107, 127]
+        results = list(sweep_mersenne(0, 128, workers=workers))
+        assert sieve_of_eratosthenes(128) == [p for p, _ in results]
+        assert expected == [p for p, is_mersenne_prime in results if is_mersenne_prime]
+
+    def test_empty_range(self):
+        assert [] == list(sweep_mersenne(24, 29, workers=1))
+
+
+class TestFilterPrimes:
+    @pytest.mark.parametrize("workers,chunksize", [(1, 1024), (2, 7)])
+    def test_matches_sieve(self, workers, chunksize):
+        primes = filter_primes(range(3000), workers=workers, chunksize=chunksize)
+        assert sieve_of_eratosthenes(3000) == list(primes)
+
+    def test_keeps_order(self):
+        candidates = [2 ** 61 - 1, 15, 13, 2 ** 61 + 1, 7]
+        assert [2 ** 61 - 1, 13, 7] == list(filter_primes(candidates, workers=2))
+
+    def test_unbounded_candidates(self):
+        primes = filter_primes(iter_primes(), workers=2, chunksize=16)
+        assert [2, 3, 5, 7, 11] == [next(primes) for _ in range(5)]
+        primes.close()